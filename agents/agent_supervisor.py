@@ -6,28 +6,56 @@ Coordination multi-agent avec state machine et agrégation des résultats.
 Patterns implémentés:
 - Supervisor pattern (Microsoft/LangGraph)
 - State machine pour workflow
-- Parallel execution
+- Parallel execution (asyncio, limites globales et par agent)
 - Result aggregation
-- Checkpoints
+- Checkpoints (journal SQLite append-only, compaction périodique)
+- Annulation qui tue réellement les processus agents
+- Sorties streamées ligne à ligne, agrégation incrémentale, débordement disque
+- Exécution spéculative des secondaires rapides
 """
 
 import argparse
+import asyncio
 import json
+import os
+import signal
+import sqlite3
 import subprocess
 import sys
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum, auto
 from pathlib import Path
 from typing import Any, Callable
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import CancelledError, Future
+
+from result_cache import AgentResultCache
 
 # Configuration
 AGENTS_DIR = Path(__file__).parent
 CHECKPOINTS_DIR = Path.home() / ".aura" / "checkpoints"
 CHECKPOINTS_DIR.mkdir(parents=True, exist_ok=True)
+CHECKPOINT_JOURNAL = CHECKPOINTS_DIR / "journal.db"
+COMPACT_EVERY = 500         # Compaction du journal toutes les N écritures
+
+# Exécution asyncio des agents
+PER_AGENT_CONCURRENCY = 2   # Instances simultanées d'un même agent
+READ_CHUNK_SIZE = 64 * 1024
+KILL_GRACE_SECONDS = 2.0    # Délai entre SIGTERM et SIGKILL à l'annulation
+
+# Sorties streamées: lignes significatives gardées, débordement sur disque
+SPILL_DIR = Path.home() / ".aura" / "supervisor_output"
+SPILL_THRESHOLD = 1024 * 1024      # Caractères en mémoire avant débordement
+INLINE_OUTPUT_LIMIT = 64 * 1024    # Début de sortie conservé en mémoire après débordement
+MAX_LINE_LENGTH = 1024 * 1024      # Une "ligne" plus longue est découpée
+AGGREGATE_LINES = 10               # Lignes significatives par agent dans l'agrégat
+# Spéculation: secondaires rapides lancés avec le principal, jetés s'il échoue
+SPECULATION_STATS_FILE = Path.home() / ".aura" / "speculation_stats.json"
+
+FINDING_MARKERS = ['status:', 'total:', 'warning', 'error', 'critical', 'healthy',
+                   '✅', '❌', '⚠️', '🔴', '🟢', '🟡']
 
 
 class TaskState(Enum):
@@ -51,6 +79,48 @@ class AgentResult:
     error: str = ""
     execution_time: float = 0.0
     return_code: int = 0
+    output_file: str = ""  # Sortie complète sur disque si elle a débordé
+    cached: bool = False   # Servi par le cache de résultats (pas d'exécution)
+
+
+class StreamedOutput:
+    """Sortie d'un agent reçue ligne à ligne, déversée sur disque au-delà d'un seuil."""
+
+    def __init__(self, spill_path: Path):
+        self.spill_path = spill_path
+        self._chunks: list[str] = []
+        self._size = 0
+        self._file = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def append(self, line: str) -> None:
+        """Ajoute une ligne (déborde sur disque si le seuil est dépassé)."""
+        if self._file:
+            self._file.write(line)
+            return
+
+        self._chunks.append(line)
+        self._size += len(line)
+        if self._size > SPILL_THRESHOLD:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.spill_path, "w", encoding="utf-8")
+            head = "".join(self._chunks)
+            self._file.write(head)
+            self._chunks = [head[:INLINE_OUTPUT_LIMIT]]
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+
+    def text(self) -> str:
+        """Sortie en mémoire (début seulement si débordée)."""
+        text = "".join(self._chunks)
+        if self._file:
+            text += f"\n... (tronqué, sortie complète: {self.spill_path})\n"
+        return text
 
 
 @dataclass
@@ -67,18 +137,144 @@ class SupervisedTask:
     updated_at: str = ""
     checkpoints: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    running_agents: list[str] = field(default_factory=list)
+    live_output: dict[str, list[str]] = field(default_factory=dict)  # Lignes significatives
+    findings: list[tuple[str, str]] = field(default_factory=list)    # (agent, ligne)
+
+
+class CheckpointJournal:
+    """
+    Journal append-only des checkpoints (SQLite).
+
+    Chaque changement d'état ajoute une ligne; les index (task_id, seq) et
+    (state, seq) donnent le dernier checkpoint d'une tâche ou les tâches d'un
+    état sans parcourir de répertoire. La compaction ne garde que le dernier
+    checkpoint de chaque tâche.
+    """
+
+    def __init__(self, path: Path = CHECKPOINT_JOURNAL, compact_every: int = COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self._appends = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_checkpoints_task ON checkpoints(task_id, seq);
+            CREATE INDEX IF NOT EXISTS idx_checkpoints_state ON checkpoints(state, seq);
+        """)
+
+    def append(self, data: dict[str, Any]) -> int:
+        """Ajoute un checkpoint; retourne son numéro de séquence."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO checkpoints (task_id, state, updated_at, data) VALUES (?, ?, ?, ?)",
+                (data["id"], data["state"], time.time(), json.dumps(data, ensure_ascii=False))
+            )
+            self._appends += 1
+            seq = cursor.lastrowid
+        if self._appends % self.compact_every == 0:
+            self.compact()
+        return seq
+
+    def latest(self, task_id: str) -> dict[str, Any] | None:
+        """Dernier checkpoint d'une tâche."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM checkpoints WHERE task_id = ? ORDER BY seq DESC LIMIT 1",
+                (task_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def history(self, task_id: str) -> list[dict[str, Any]]:
+        """Tous les checkpoints encore journalisés d'une tâche (ordre chronologique)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM checkpoints WHERE task_id = ? ORDER BY seq", (task_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def tasks(self, state: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        """Dernier checkpoint des tâches récentes, éventuellement filtrées par état courant."""
+        query = """
+            SELECT c.data FROM checkpoints c
+            JOIN (SELECT task_id, MAX(seq) AS seq FROM checkpoints GROUP BY task_id) last
+              ON c.seq = last.seq
+        """
+        params: tuple = ()
+        if state:
+            query += " WHERE c.state = ?"
+            params = (state,)
+        query += " ORDER BY c.seq DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def compact(self, older_than: float | None = None) -> int:
+        """
+        Ne garde que le dernier checkpoint de chaque tâche; supprime aussi les
+        tâches dont le dernier checkpoint est antérieur à older_than (timestamp).
+
+        Returns:
+            Nombre de lignes supprimées
+        """
+        with self._lock:
+            deleted = self._conn.execute("""
+                DELETE FROM checkpoints WHERE seq NOT IN (
+                    SELECT MAX(seq) FROM checkpoints GROUP BY task_id
+                )
+            """).rowcount
+            if older_than is not None:
+                deleted += self._conn.execute(
+                    "DELETE FROM checkpoints WHERE updated_at < ?", (older_than,)
+                ).rowcount
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
 
 class AgentSupervisor:
     """Superviseur d'agents avec state machine."""
 
-    def __init__(self, max_workers: int = 4, timeout: int = 120):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: int = 120,
+        per_agent_limit: int = PER_AGENT_CONCURRENCY
+    ):
         self.max_workers = max_workers
         self.timeout = timeout
+        self.per_agent_limit = per_agent_limit
         self.active_tasks: dict[str, SupervisedTask] = {}
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self._task_counter = 0
 
+        # Boucle asyncio dédiée: les appels synchrones y soumettent leurs coroutines
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="agent-supervisor-loop", daemon=True
+        )
+        self._loop_thread.start()
+        self._global_limit = asyncio.Semaphore(max_workers)
+        self._agent_limits: dict[str, asyncio.Semaphore] = {}
+        self._pending: dict[str, set[Future]] = {}  # task_id -> coroutines en cours
+        self._finding_listeners: dict[str, Callable[[str, str], None]] = {}
+        self._inflight: dict[str, dict[str, Any]] = {}  # clé de cache -> exécution partagée
+        self.journal = CheckpointJournal()
+
+        # Cache des résultats d'agents en lecture seule (TTL du manifest)
+        self.result_cache = AgentResultCache(namespace="supervisor")
+
         # Import du router
         try:
             from intent_router import IntentRouter
@@ -96,7 +292,9 @@ class AgentSupervisor:
     def _generate_task_id(self) -> str:
         """Génère un ID unique."""
         self._task_counter += 1
-        return f"sup_{datetime.now().strftime('%H%M%S')}_{self._task_counter}"
+        # Date incluse: les IDs restent uniques dans le journal d'un jour à l'autre;
+        # pid inclus: deux superviseurs lancés dans la même seconde ne se marchent pas dessus
+        return f"sup_{datetime.now().strftime('%m%d_%H%M%S')}_{os.getpid()}_{self._task_counter}"
 
     def _update_state(self, task: SupervisedTask, new_state: TaskState):
         """Met à jour l'état d'une tâche."""
@@ -105,9 +303,8 @@ class AgentSupervisor:
         task.updated_at = datetime.now().isoformat()
         task.checkpoints.append(f"{old_state.name} -> {new_state.name}")
 
-    def _save_checkpoint(self, task: SupervisedTask) -> str:
-        """Sauvegarde un checkpoint."""
-        checkpoint_file = CHECKPOINTS_DIR / f"{task.id}_{task.state.name}.json"
+    def _save_checkpoint(self, task: SupervisedTask) -> int:
+        """Ajoute un checkpoint au journal; retourne son numéro de séquence."""
         data = {
             "id": task.id,
             "query": task.query,
@@ -120,19 +317,141 @@ class AgentSupervisor:
                     "success": r.success,
                     "output": r.output[:500],
                     "error": r.error,
-                    "execution_time": r.execution_time
+                    "execution_time": r.execution_time,
+                    "output_file": r.output_file
                 }
                 for r in task.results
             ],
+            "aggregated_result": task.aggregated_result[:2000],
             "created_at": task.created_at,
             "updated_at": task.updated_at,
             "checkpoints": task.checkpoints
         }
-        checkpoint_file.write_text(json.dumps(data, indent=2))
-        return str(checkpoint_file)
+        return self.journal.append(data)
+
+    @staticmethod
+    def _task_from_checkpoint(data: dict[str, Any]) -> SupervisedTask:
+        """Reconstruit une tâche depuis un checkpoint."""
+        return SupervisedTask(
+            id=data["id"],
+            query=data["query"],
+            state=TaskState[data["state"]],
+            primary_agent=data["primary_agent"],
+            secondary_agents=data["secondary_agents"],
+            results=[AgentResult(**r) for r in data.get("results", [])],
+            aggregated_result=data.get("aggregated_result", ""),
+            created_at=data["created_at"],
+            updated_at=data.get("updated_at", ""),
+            checkpoints=data["checkpoints"]
+        )
+
+    def _submit(self, coro, task_id: str | None = None) -> Future:
+        """Soumet une coroutine à la boucle du superviseur (rattachée à une tâche)."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        if task_id:
+            pending = self._pending.setdefault(task_id, set())
+            pending.add(future)
+            future.add_done_callback(pending.discard)
+        return future
 
-    def _execute_agent(self, agent: str, args: list[str] = None) -> AgentResult:
+    def _execute_agent(
+        self,
+        agent: str,
+        args: list[str] = None,
+        task: SupervisedTask | None = None
+    ) -> AgentResult:
         """Exécute un agent et retourne le résultat."""
+        return self._submit(
+            self._execute_agent_async(agent, args, task), task.id if task else None
+        ).result()
+
+    async def _execute_agent_async(
+        self,
+        agent: str,
+        args: list[str] = None,
+        task: SupervisedTask | None = None
+    ) -> AgentResult:
+        """
+        Exécute un agent, en passant par le cache si son manifest déclare un TTL.
+
+        Un résultat encore valide est servi sans exécution. Des appels identiques
+        simultanés (même agent, mêmes arguments) partagent un seul processus; il
+        n'est tué que si tous les appelants sont annulés.
+        """
+        ttl = self.result_cache.ttl_for(agent, args)
+        if ttl <= 0:
+            return await self._run_agent_process(agent, args, task)
+
+        cached = self.result_cache.get(agent, args)
+        if cached is not None:
+            result = AgentResult(**{**cached, "cached": True})
+            self._replay_output(task, result)
+            return result
+
+        key = self.result_cache.key(agent, args)
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = self._inflight[key] = {"waiters": 0, "future": None}
+            shared["future"] = asyncio.ensure_future(
+                self._run_shared(key, agent, args, task, ttl)
+            )
+            owner = True
+        else:
+            self.result_cache.stats["coalesced"] += 1
+            owner = False
+
+        shared["waiters"] += 1
+        try:
+            result = await asyncio.shield(shared["future"])
+        except asyncio.CancelledError:
+            shared["waiters"] -= 1
+            if shared["waiters"] == 0:
+                shared["future"].cancel()
+            raise
+        shared["waiters"] -= 1
+
+        if not owner:
+            # Les lignes ont été diffusées à la tâche propriétaire: rejouer ici
+            self._replay_output(task, result)
+        return result
+
+    async def _run_shared(
+        self,
+        key: str,
+        agent: str,
+        args: list[str] | None,
+        task: SupervisedTask | None,
+        ttl: float
+    ) -> AgentResult:
+        """Exécution partagée par les appels fusionnés; mémorise un succès."""
+        try:
+            result = await self._run_agent_process(agent, args, task)
+            if result.success:
+                self.result_cache.put(agent, args, asdict(result), ttl)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _replay_output(self, task: SupervisedTask | None, result: AgentResult) -> None:
+        """Alimente l'agrégation d'une tâche avec une sortie non streamée."""
+        if task:
+            for line in result.output.splitlines():
+                self._on_agent_line(task, result.agent, line)
+
+    async def _run_agent_process(
+        self,
+        agent: str,
+        args: list[str] = None,
+        task: SupervisedTask | None = None
+    ) -> AgentResult:
+        """
+        Exécute un agent dans un sous-processus asyncio.
+
+        stdout/stderr sont lus ligne à ligne; chaque ligne de stdout alimente
+        l'agrégation incrémentale de la tâche. L'exécution respecte la limite
+        globale (max_workers) et la limite par agent. Une annulation (ou un
+        timeout) tue le groupe de processus de l'agent.
+        """
         agent_path = AGENTS_DIR / f"{agent}.py"
         if not agent_path.exists():
             return AgentResult(
@@ -142,66 +461,289 @@ class AgentSupervisor:
                 error=f"Agent non trouvé: {agent}"
             )
 
-        start_time = time.time()
-        try:
-            result = subprocess.run(
-                [sys.executable, str(agent_path)] + (args or []),
-                capture_output=True,
-                text=True,
-                timeout=self.timeout
-            )
-            execution_time = time.time() - start_time
+        agent_limit = self._agent_limits.setdefault(
+            agent, asyncio.Semaphore(self.per_agent_limit)
+        )
+        # Créneau de l'agent d'abord: un agent saturé n'immobilise pas de place globale
+        async with agent_limit, self._global_limit:
+            start_time = time.time()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    sys.executable, str(agent_path), *(args or []),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=True  # Groupe propre: tuer aussi les enfants de l'agent
+                )
+            except Exception as e:
+                return AgentResult(
+                    agent=agent,
+                    success=False,
+                    output="",
+                    error=str(e),
+                    execution_time=time.time() - start_time
+                )
 
-            return AgentResult(
-                agent=agent,
-                success=result.returncode == 0,
-                output=result.stdout,
-                error=result.stderr,
-                execution_time=execution_time,
-                return_code=result.returncode
-            )
+            spill_base = SPILL_DIR / f"{task.id if task else 'direct'}_{agent}_{time.time_ns()}"
+            stdout = StreamedOutput(spill_base.with_suffix(".out"))
+            stderr = StreamedOutput(spill_base.with_suffix(".err"))
+            on_line = (lambda line: self._on_agent_line(task, agent, line)) if task else None
+            if task:
+                task.running_agents.append(agent)
+                task.live_output.setdefault(agent, [])
+
+            try:
+                await asyncio.wait_for(
+                    self._communicate(proc, stdout, stderr, on_line),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                await self._kill_process(proc)
+                return AgentResult(
+                    agent=agent,
+                    success=False,
+                    output=stdout.text(),
+                    error=f"Timeout après {self.timeout}s",
+                    execution_time=self.timeout,
+                    output_file=str(stdout.spill_path) if stdout.spilled else ""
+                )
+            except asyncio.CancelledError:
+                await self._kill_process(proc)
+                raise
+            finally:
+                stdout.close()
+                stderr.close()
+                if task and agent in task.running_agents:
+                    task.running_agents.remove(agent)
 
-        except subprocess.TimeoutExpired:
-            return AgentResult(
-                agent=agent,
-                success=False,
-                output="",
-                error=f"Timeout après {self.timeout}s",
-                execution_time=self.timeout
-            )
-        except Exception as e:
             return AgentResult(
                 agent=agent,
-                success=False,
-                output="",
-                error=str(e),
-                execution_time=time.time() - start_time
+                success=proc.returncode == 0,
+                output=stdout.text(),
+                error=stderr.text(),
+                execution_time=time.time() - start_time,
+                return_code=proc.returncode,
+                output_file=str(stdout.spill_path) if stdout.spilled else ""
             )
 
-    def _execute_parallel(self, agents: list[str], args_map: dict[str, list[str]] = None) -> list[AgentResult]:
+    async def _communicate(
+        self,
+        proc: asyncio.subprocess.Process,
+        stdout: StreamedOutput,
+        stderr: StreamedOutput,
+        on_line: Callable[[str], None] | None = None
+    ) -> None:
+        """Lit stdout/stderr en parallèle jusqu'à la fin du processus."""
+        await asyncio.gather(
+            self._read_lines(proc.stdout, stdout, on_line),
+            self._read_lines(proc.stderr, stderr),
+            proc.wait()
+        )
+
+    @staticmethod
+    async def _read_lines(
+        stream: asyncio.StreamReader,
+        sink: StreamedOutput,
+        on_line: Callable[[str], None] | None = None
+    ) -> None:
+        """Lit un flux ligne à ligne jusqu'à EOF (lignes géantes découpées)."""
+        pending = b""
+        while True:
+            chunk = await stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            if len(pending) > MAX_LINE_LENGTH:
+                lines.append(pending)
+                pending = b""
+            for raw in lines:
+                line = raw.decode("utf-8", errors="replace") + "\n"
+                sink.append(line)
+                if on_line:
+                    on_line(line)
+        if pending:
+            line = pending.decode("utf-8", errors="replace")
+            sink.append(line)
+            if on_line:
+                on_line(line)
+
+    def _on_agent_line(self, task: SupervisedTask, agent: str, line: str) -> None:
+        """Agrégation incrémentale: lignes significatives et constats au fil de l'eau."""
+        text = line.strip()
+        if not text:
+            return
+
+        live = task.live_output.setdefault(agent, [])
+        if len(live) < AGGREGATE_LINES:
+            live.append(text)
+
+        lowered = text.lower()
+        if any(marker in lowered for marker in FINDING_MARKERS):
+            task.findings.append((agent, text))
+            listener = self._finding_listeners.get(task.id)
+            if listener:
+                try:
+                    listener(agent, text)
+                except Exception:
+                    pass  # Un listener défaillant ne doit pas casser la lecture
+
+    @staticmethod
+    async def _kill_process(proc: asyncio.subprocess.Process) -> None:
+        """SIGTERM au groupe de l'agent, puis SIGKILL après un délai de grâce."""
+        if proc.returncode is not None:
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(proc.wait(), KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+    def _execute_parallel(
+        self,
+        agents: list[str],
+        args_map: dict[str, list[str]] = None,
+        task: SupervisedTask | None = None
+    ) -> list[AgentResult]:
         """Exécute plusieurs agents en parallèle."""
+        return self._submit(
+            self._execute_parallel_async(agents, args_map, task), task.id if task else None
+        ).result()
+
+    async def _execute_parallel_async(
+        self,
+        agents: list[str],
+        args_map: dict[str, list[str]] = None,
+        task: SupervisedTask | None = None
+    ) -> list[AgentResult]:
+        """Lance les agents ensemble (limites de concurrence appliquées)."""
         args_map = args_map or {}
+        outcomes = await asyncio.gather(
+            *(self._execute_agent_async(agent, args_map.get(agent, []), task) for agent in agents),
+            return_exceptions=True
+        )
+
         results = []
+        for agent, outcome in zip(agents, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                outcome = AgentResult(
+                    agent=agent,
+                    success=False,
+                    output="",
+                    error=str(outcome)
+                )
+            results.append(outcome)
+        return results
 
+    def _speculative_agents(self, secondaries: list[str]) -> list[str]:
+        """Secondaires assez rapides (typical_duration) pour être spéculés."""
+        if not self.router:
+            return []
+        speculated = []
+        for agent in secondaries:
+            cap = self.router.get_agent_info(agent)
+            if cap and cap.typical_duration == "quick":
+                speculated.append(agent)
+        return speculated
+
+    async def _execute_speculative_async(self, task: SupervisedTask, speculated: list[str]) -> None:
+        """
+        Exécute le principal avec les secondaires spéculés déjà lancés.
+
+        Si le principal échoue, les spéculés sont annulés (ou leurs résultats
+        jetés) et le travail perdu est comptabilisé. Sinon les secondaires sont
+        repris dans l'ordre, les non spéculés exécutés après le principal.
+        """
+        start = time.time()
+        launched = {agent: time.time() for agent in speculated}
         futures = {
-            self.executor.submit(self._execute_agent, agent, args_map.get(agent, [])): agent
-            for agent in agents
+            agent: asyncio.ensure_future(self._execute_agent_async(agent, None, task))
+            for agent in speculated
         }
 
-        for future in as_completed(futures, timeout=self.timeout * 2):
-            agent = futures[future]
+        try:
+            primary = await self._execute_agent_async(task.primary_agent, None, task)
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            await asyncio.gather(*futures.values(), return_exceptions=True)
+            raise
+        task.results.append(primary)
+
+        if not primary.success:
+            wasted_seconds = 0.0
+            for agent, future in futures.items():
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    wasted_seconds += future.result().execution_time
+                else:
+                    future.cancel()
+                    wasted_seconds += time.time() - launched[agent]
+            await asyncio.gather(*futures.values(), return_exceptions=True)
+            task.metadata["speculation_wasted_s"] = round(wasted_seconds, 3)
+            self._record_speculation(len(speculated), wasted_seconds=wasted_seconds)
+            return
+
+        for agent in task.secondary_agents:
             try:
-                result = future.result()
-                results.append(result)
+                if agent in futures:
+                    result = await futures[agent]
+                else:
+                    result = await self._execute_agent_async(agent, None, task)
+            except asyncio.CancelledError:
+                for future in futures.values():
+                    future.cancel()
+                raise
             except Exception as e:
-                results.append(AgentResult(
-                    agent=agent,
-                    success=False,
-                    output="",
-                    error=str(e)
-                ))
+                result = AgentResult(agent=agent, success=False, output="", error=str(e))
+            task.results.append(result)
 
-        return results
+        # Gain estimé: durée séquentielle équivalente moins durée réelle
+        sequential = sum(r.execution_time for r in task.results)
+        saved = max(0.0, sequential - (time.time() - start))
+        task.metadata["speculation_saved_s"] = round(saved, 3)
+        self._record_speculation(len(speculated), saved_seconds=saved)
+
+    def _record_speculation(
+        self,
+        speculated: int,
+        wasted_seconds: float | None = None,
+        saved_seconds: float = 0.0
+    ) -> None:
+        """Met à jour les statistiques de spéculation (wasted_seconds=None: pas de perte)."""
+        stats = self.get_speculation_stats()
+        stats["runs"] += 1
+        stats["speculated_agents"] += speculated
+        stats["saved_seconds"] = round(stats["saved_seconds"] + saved_seconds, 3)
+        if wasted_seconds is not None:
+            stats["wasted_runs"] += 1
+            stats["wasted_agents"] += speculated
+            stats["wasted_seconds"] = round(stats["wasted_seconds"] + wasted_seconds, 3)
+        stats["waste_rate"] = round(stats["wasted_runs"] / stats["runs"], 3)
+        try:
+            SPECULATION_STATS_FILE.write_text(json.dumps(stats, indent=2))
+        except OSError:
+            pass
+
+    def get_speculation_stats(self) -> dict[str, Any]:
+        """Statistiques cumulées: spéculations lancées, perdues, temps gagné/perdu."""
+        stats = {
+            "runs": 0, "wasted_runs": 0, "speculated_agents": 0, "wasted_agents": 0,
+            "wasted_seconds": 0.0, "saved_seconds": 0.0, "waste_rate": 0.0
+        }
+        if SPECULATION_STATS_FILE.exists():
+            try:
+                stats.update(json.loads(SPECULATION_STATS_FILE.read_text()))
+            except Exception:
+                pass
+        return stats
 
     def _aggregate_results(self, task: SupervisedTask) -> str:
         """Agrège les résultats de plusieurs agents."""
@@ -221,7 +763,17 @@ class AgentSupervisor:
             aggregation.append(f"[{r.agent}] ({r.execution_time:.2f}s)")
             if r.output:
                 # Garder les premières lignes significatives
-                lines = [l for l in r.output.strip().split('\n') if l.strip()][:10]
+                lines = [l for l in r.output.strip().split('\n') if l.strip()][:AGGREGATE_LINES]
+                aggregation.append('\n'.join(lines))
+            if r.output_file:
+                aggregation.append(f"(sortie complète: {r.output_file})")
+            aggregation.append("")
+
+        # Agents encore en cours: premières lignes reçues
+        for agent in list(task.running_agents):
+            aggregation.append(f"[{agent}] (en cours)")
+            lines = list(task.live_output.get(agent, []))
+            if lines:
                 aggregation.append('\n'.join(lines))
             aggregation.append("")
 
@@ -238,7 +790,9 @@ class AgentSupervisor:
         query: str,
         agents: list[str] = None,
         parallel: bool = False,
-        background: bool = False
+        background: bool = False,
+        on_finding: Callable[[str, str], None] | None = None,
+        speculative: bool = False
     ) -> SupervisedTask:
         """
         Supervise l'exécution d'une requête.
@@ -248,6 +802,10 @@ class AgentSupervisor:
             agents: Liste d'agents à exécuter (auto-route si None)
             parallel: Exécuter en parallèle
             background: Exécuter en arrière-plan
+            on_finding: Appelé (agent, ligne) pour chaque constat dès qu'un agent
+                l'émet, avant la fin de son exécution
+            speculative: En séquentiel, lancer les secondaires rapides en même
+                temps que le principal (résultats jetés s'il échoue)
 
         Returns:
             SupervisedTask avec les résultats
@@ -257,10 +815,13 @@ class AgentSupervisor:
             query=query
         )
         self.active_tasks[task.id] = task
+        if on_finding:
+            self._finding_listeners[task.id] = on_finding
 
         # Phase 1: Routing
         self._update_state(task, TaskState.ROUTING)
 
+        decision = None
         if agents:
             task.primary_agent = agents[0]
             task.secondary_agents = agents[1:]
@@ -304,63 +865,135 @@ class AgentSupervisor:
 
         elif parallel:
             # Exécution parallèle
-            task.results = self._execute_parallel(all_agents)
-            self._update_state(task, TaskState.AGGREGATING)
-            task.aggregated_result = self._aggregate_results(task)
-            self._update_state(task, TaskState.COMPLETED)
+            try:
+                task.results = self._execute_parallel(all_agents, task=task)
+            except CancelledError:
+                pass
+            if task.state != TaskState.CANCELLED:
+                self._update_state(task, TaskState.AGGREGATING)
+                task.aggregated_result = self._aggregate_results(task)
+                self._update_state(task, TaskState.COMPLETED)
 
         else:
-            # Exécution séquentielle
-            for agent in all_agents:
-                result = self._execute_agent(agent)
-                task.results.append(result)
+            # Exécution séquentielle (secondaires rapides en spéculation si demandé)
+            speculated = self._speculative_agents(task.secondary_agents) if speculative else []
+            try:
+                if speculated:
+                    task.metadata["speculated"] = speculated
+                    self._submit(
+                        self._execute_speculative_async(task, speculated), task.id
+                    ).result()
+                else:
+                    for agent in all_agents:
+                        if task.state == TaskState.CANCELLED:
+                            break  # Annulée entre deux agents: ne pas lancer le suivant
+                        result = self._execute_agent(agent, task=task)
+                        task.results.append(result)
+
+                        # Arrêter si l'agent principal échoue
+                        if agent == task.primary_agent and not result.success:
+                            break
+            except CancelledError:
+                pass
 
-                # Arrêter si l'agent principal échoue
-                if agent == task.primary_agent and not result.success:
-                    self._update_state(task, TaskState.FAILED)
-                    task.aggregated_result = f"Échec de l'agent principal: {result.error}"
-                    break
+            primary = task.results[0] if task.results else None
+            if task.state != TaskState.CANCELLED and primary is not None and not primary.success:
+                self._update_state(task, TaskState.FAILED)
+                task.aggregated_result = f"Échec de l'agent principal: {primary.error}"
 
-            if task.state != TaskState.FAILED:
+            if task.state not in (TaskState.FAILED, TaskState.CANCELLED):
                 self._update_state(task, TaskState.AGGREGATING)
                 task.aggregated_result = self._aggregate_results(task)
                 self._update_state(task, TaskState.COMPLETED)
 
+        if task.state == TaskState.CANCELLED:
+            task.aggregated_result = "Tâche annulée"
+        self._finding_listeners.pop(task.id, None)
+
+        # Apprentissage du fast-path de routage
+        if decision is not None:
+            primary = next((r for r in task.results if r.agent == task.primary_agent), None)
+            if primary is not None:
+                self.router.record_outcome(query, decision, primary.success)
+
         self._save_checkpoint(task)
         return task
 
     def get_task(self, task_id: str) -> SupervisedTask | None:
-        """Récupère une tâche par son ID."""
-        return self.active_tasks.get(task_id)
+        """Récupère une tâche par son ID (mémoire, sinon dernier checkpoint)."""
+        task = self.active_tasks.get(task_id)
+        if task is None:
+            data = self.journal.latest(task_id)
+            task = self._task_from_checkpoint(data) if data else None
+        return task
+
+    def get_partial_result(self, task_id: str) -> str:
+        """Agrégat courant d'une tâche, agents en cours compris."""
+        task = self.active_tasks.get(task_id)
+        if not task:
+            return ""
+        if task.state == TaskState.COMPLETED:
+            return task.aggregated_result
+        return self._aggregate_results(task)
 
     def cancel_task(self, task_id: str) -> bool:
-        """Annule une tâche."""
+        """
+        Annule une tâche et tue ses processus agents.
+
+        Les agents en cours (ou en attente d'un créneau) sont annulés dans la
+        boucle asyncio, ce qui tue leur groupe de processus; les agents lancés
+        en arrière-plan sont tués via le TaskRunner.
+        """
         task = self.active_tasks.get(task_id)
-        if task and task.state not in [TaskState.COMPLETED, TaskState.FAILED]:
+        if task and task.state not in [TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELLED]:
             self._update_state(task, TaskState.CANCELLED)
+            for future in list(self._pending.get(task_id, ())):
+                future.cancel()
+
+            if self.task_runner:
+                for key, bg_task_id in task.metadata.items():
+                    if key.startswith("bg_task_") and bg_task_id:
+                        self.task_runner.kill_task(bg_task_id)
             return True
         return False
 
-    def list_tasks(self, state: TaskState = None) -> list[SupervisedTask]:
-        """Liste les tâches."""
-        tasks = list(self.active_tasks.values())
+    def shutdown(self) -> None:
+        """Annule les exécutions en cours et arrête la boucle du superviseur."""
+        for task_id in list(self._pending):
+            self.cancel_task(task_id)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=KILL_GRACE_SECONDS + 1)
+
+    def list_tasks(self, state: TaskState = None, limit: int = 100) -> list[SupervisedTask]:
+        """Liste les tâches (en mémoire et journalisées)."""
+        tasks = {
+            data["id"]: self._task_from_checkpoint(data)
+            for data in self.journal.tasks(state=state.name if state else None, limit=limit)
+        }
+        tasks.update(self.active_tasks)
+        tasks = list(tasks.values())
         if state:
             tasks = [t for t in tasks if t.state == state]
-        return sorted(tasks, key=lambda t: t.created_at, reverse=True)
+        return sorted(tasks, key=lambda t: t.created_at, reverse=True)[:limit]
+
+    def resume_from_checkpoint(self, checkpoint: str) -> SupervisedTask | None:
+        """
+        Reprend une tâche depuis son dernier checkpoint.
 
-    def resume_from_checkpoint(self, checkpoint_file: str) -> SupervisedTask | None:
-        """Reprend une tâche depuis un checkpoint."""
+        Args:
+            checkpoint: ID de tâche (journal) ou chemin d'un ancien checkpoint JSON
+        """
         try:
-            data = json.loads(Path(checkpoint_file).read_text())
-            task = SupervisedTask(
-                id=data["id"],
-                query=data["query"],
-                state=TaskState[data["state"]],
-                primary_agent=data["primary_agent"],
-                secondary_agents=data["secondary_agents"],
-                created_at=data["created_at"],
-                checkpoints=data["checkpoints"]
-            )
+            path = Path(checkpoint)
+            if checkpoint.endswith(".json") and path.exists():
+                data = json.loads(path.read_text())
+            else:
+                data = self.journal.latest(checkpoint)
+                if data is None:
+                    print(f"Aucun checkpoint pour: {checkpoint}")
+                    return None
+
+            task = self._task_from_checkpoint(data)
             self.active_tasks[task.id] = task
 
             # Reprendre selon l'état
@@ -373,15 +1006,23 @@ class AgentSupervisor:
             return None
 
     def cleanup_checkpoints(self, days: int = 7) -> int:
-        """Nettoie les vieux checkpoints."""
+        """
+        Compacte le journal (dernier checkpoint par tâche, tâches de plus de
+        `days` jours supprimées) et nettoie les sorties débordées.
+
+        Returns:
+            Nombre de checkpoints et fichiers supprimés
+        """
         from datetime import timedelta
 
-        cutoff = datetime.now() - timedelta(days=days)
-        count = 0
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        count = self.journal.compact(older_than=cutoff)
 
-        for f in CHECKPOINTS_DIR.glob("*.json"):
+        # Sorties débordées et anciens checkpoints JSON (avant le journal)
+        spill_files = SPILL_DIR.glob("*") if SPILL_DIR.exists() else []
+        for f in [*CHECKPOINTS_DIR.glob("*.json"), *spill_files]:
             try:
-                if f.stat().st_mtime < cutoff.timestamp():
+                if f.stat().st_mtime < cutoff:
                     f.unlink()
                     count += 1
             except Exception:
@@ -417,7 +1058,7 @@ Exemples:
   %(prog)s run "État complet" --parallel
   %(prog)s list
   %(prog)s status sup_123456
-  %(prog)s resume /path/to/checkpoint.json
+  %(prog)s resume sup_0101_123456_4242_1
         """
     )
 
@@ -430,6 +1071,12 @@ Exemples:
     run_p.add_argument("--parallel", "-p", action="store_true", help="Exécution parallèle")
     run_p.add_argument("--background", "-b", action="store_true", help="Exécution en arrière-plan")
     run_p.add_argument("--json", action="store_true", help="Sortie JSON")
+    run_p.add_argument("--stream", action="store_true",
+                       help="Afficher les constats des agents dès qu'ils arrivent")
+    run_p.add_argument("--speak", action="store_true",
+                       help="Annoncer vocalement le premier constat sans attendre la fin")
+    run_p.add_argument("--speculative", action="store_true",
+                       help="Lancer les secondaires rapides en même temps que le principal")
 
     # list
     list_p = subparsers.add_parser("list", help="Lister les tâches")
@@ -441,7 +1088,10 @@ Exemples:
 
     # resume
     resume_p = subparsers.add_parser("resume", help="Reprendre depuis checkpoint")
-    resume_p.add_argument("checkpoint_file")
+    resume_p.add_argument("checkpoint", help="ID de tâche (ou ancien fichier checkpoint JSON)")
+
+    # speculation
+    subparsers.add_parser("speculation", help="Statistiques de l'exécution spéculative")
 
     # cleanup
     clean_p = subparsers.add_parser("cleanup", help="Nettoyer les vieux checkpoints")
@@ -456,11 +1106,26 @@ Exemples:
     supervisor = AgentSupervisor()
 
     if args.command == "run":
+        announced = []
+
+        def on_finding(agent: str, line: str):
+            if args.stream:
+                print(f"  » [{agent}] {line}", flush=True)
+            if args.speak and not announced:
+                announced.append(line)
+                subprocess.Popen(
+                    [sys.executable, str(AGENTS_DIR / "voice_speak.py"), f"{agent}: {line[:150]}"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+
         task = supervisor.supervise(
             query=args.query,
             agents=args.agents,
             parallel=args.parallel,
-            background=args.background
+            background=args.background,
+            on_finding=on_finding if (args.stream or args.speak) else None,
+            speculative=args.speculative
         )
 
         if args.json:
@@ -484,7 +1149,7 @@ Exemples:
         if not tasks:
             print("Aucune tâche.")
         else:
-            print(f"{'ID':<20} {'État':<15} {'Agent':<20} {'Créé'}}")
+            print(f"{'ID':<20} {'État':<15} {'Agent':<20} {'Créé'}")
             print("-" * 75)
             for t in tasks[:20]:
                 print(f"{t.id:<20} {t.state.name:<15} {t.primary_agent:<20} {t.created_at[:19]}")
@@ -511,13 +1176,16 @@ Exemples:
             print(f"Tâche non trouvée: {args.task_id}")
 
     elif args.command == "resume":
-        task = supervisor.resume_from_checkpoint(args.checkpoint_file)
+        task = supervisor.resume_from_checkpoint(args.checkpoint)
         if task:
             print(f"Tâche reprise: {task.id}")
             print(f"État: {task.state.name}")
         else:
             print("Impossible de reprendre la tâche")
 
+    elif args.command == "speculation":
+        print(json.dumps(supervisor.get_speculation_stats(), indent=2))
+
     elif args.command == "cleanup":
         count = supervisor.cleanup_checkpoints(days=args.days)
         print(f"Nettoyé: {count} checkpoint(s)")
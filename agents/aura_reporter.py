@@ -10,7 +10,6 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
 
 # Chemins
 REPORTS_DIR = Path.home() / "Desktop" / "rapports_aura"
@@ -4,15 +4,25 @@ Aura Error Handler v1.0
 Gestion des erreurs avec retry, fallback et circuit breaker.
 
 Patterns implémentés:
-- Retry avec exponential backoff
-- Circuit breaker (fail fast après N erreurs)
+- Retry avec exponential backoff (synchrone, ou asyncio sans bloquer)
+- Budget de temps total partagé entre retries et fallbacks
+- Requêtes "hedged": fallback lancé si le principal dépasse son p95
+- Circuit breaker (fail fast après N erreurs), état en mémoire avec
+  persistance différée, ou partagé entre processus via SQLite
 - Fallback agents
-- Error logging et notification
+- Error logging et notification (un fichier par jour + index: plage
+  horaire, compteurs par agent et par heure, offsets)
 """
 
 import argparse
+import asyncio
+import atexit
+import fcntl
 import functools
 import json
+import os
+import signal
+import sqlite3
 import subprocess
 import sys
 import time
@@ -20,14 +30,25 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum, auto
 from pathlib import Path
-from typing import Any, Callable, Dict, TypeVar
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, TypeVar
 import threading
 
+from result_cache import AgentResultCache
+
 # Configuration
 AGENTS_DIR = Path(__file__).parent
 ERROR_LOG_DIR = Path.home() / ".aura" / "error_logs"
 ERROR_LOG_DIR.mkdir(parents=True, exist_ok=True)
 CIRCUIT_STATE_FILE = Path.home() / ".aura" / "circuit_states.json"
+CIRCUIT_DB_FILE = Path.home() / ".aura" / "circuit_states.db"
+CIRCUIT_BACKEND = "memory"      # memory (JSON différé) ou sqlite (partagé entre processus)
+CIRCUIT_FLUSH_DELAY = 2.0       # Secondes de regroupement des écritures JSON
+LATENCY_FILE = Path.home() / ".aura" / "agent_latency.json"
+LATENCY_SAMPLES = 50            # Durées récentes conservées par agent
+HEDGE_MIN_SAMPLES = 5           # Pas de hedging sans historique suffisant
+DEFAULT_BUDGET = 60.0           # Budget total (s) d'execute_with_fallback_async
+KILL_GRACE_SECONDS = 2.0
 
 # Types
 T = TypeVar('T')
@@ -81,6 +102,11 @@ class CircuitBreakerState:
     last_failure_time: str | None = None
     half_open_calls: int = 0
 
+    def snapshot(self) -> tuple:
+        """Valeurs comparables (détecter une transaction sans effet)."""
+        return (self.state, self.failure_count, self.success_count,
+                self.last_failure_time, self.half_open_calls)
+
 
 # Fallback mappings
 FALLBACK_AGENTS: dict[str, list[str]] = {
@@ -93,6 +119,254 @@ FALLBACK_AGENTS: dict[str, list[str]] = {
 }
 
 
+def _index_path(log_file: Path) -> Path:
+    """Index d'un fichier d'erreurs journalier."""
+    return log_file.with_name(log_file.stem + ".idx.json")
+
+
+def _index_add(index: dict[str, Any], agent: str, timestamp: str, offset: int) -> None:
+    """Compte une erreur dans l'index de son fichier."""
+    hour = timestamp[11:13]
+    index["count"] += 1
+    index["first"] = min(index["first"] or timestamp, timestamp)
+    index["last"] = max(index["last"] or timestamp, timestamp)
+    index["agents"][agent] = index["agents"].get(agent, 0) + 1
+    hourly = index["hours"].setdefault(hour, {})
+    hourly[agent] = hourly.get(agent, 0) + 1
+    index["offsets"].setdefault(hour, offset)  # Premier enregistrement de l'heure
+
+
+def build_error_index(log_file: Path) -> dict[str, Any]:
+    """Construit l'index d'un fichier d'erreurs (un seul parcours)."""
+    index = {"first": None, "last": None, "count": 0, "agents": {}, "hours": {}, "offsets": {}, "size": 0}
+    offset = 0
+    with open(log_file, "rb") as f:
+        for line in f:
+            try:
+                data = json.loads(line)
+                _index_add(index, data["agent"], data["timestamp"], offset)
+            except (ValueError, KeyError):
+                pass
+            offset += len(line)
+    index["size"] = offset
+    return index
+
+
+def load_error_index(log_file: Path) -> dict[str, Any]:
+    """Index d'un fichier, reconstruit s'il manque ou ne couvre pas tout le fichier."""
+    try:
+        index = json.loads(_index_path(log_file).read_text())
+        if index.get("size") == log_file.stat().st_size:
+            return index
+    except (OSError, ValueError):
+        pass
+    index = build_error_index(log_file)
+    _write_index(log_file, index)
+    return index
+
+
+def _write_index(log_file: Path, index: dict[str, Any]) -> None:
+    tmp = _index_path(log_file).with_suffix(".tmp")
+    tmp.write_text(json.dumps(index))
+    os.replace(tmp, _index_path(log_file))
+
+
+class CircuitStateStore:
+    """
+    États des circuits en mémoire, persistés en JSON de façon différée.
+
+    Les modifications marquent l'agent "sale"; une seule écriture regroupe tout
+    ce qui change pendant CIRCUIT_FLUSH_DELAY secondes (et une dernière à la
+    sortie du processus). Chaque processus a sa propre vue, relue au démarrage;
+    à l'écriture, seuls ses agents modifiés remplacent ceux du fichier (relu
+    sous verrou), les changements des autres processus sont conservés.
+    """
+
+    def __init__(self, path: Path = CIRCUIT_STATE_FILE, flush_delay: float = CIRCUIT_FLUSH_DELAY):
+        self.path = path
+        self.flush_delay = flush_delay
+        self._states: dict[str, CircuitBreakerState] = {}
+        self._lock = threading.RLock()
+        self._dirty: set[str] = set()
+        self._timer: threading.Timer | None = None
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            for agent, state_data in data.items():
+                self._states[agent] = CircuitBreakerState(
+                    agent=agent,
+                    state=CircuitState[state_data.get("state", "CLOSED")],
+                    failure_count=state_data.get("failure_count", 0),
+                    success_count=state_data.get("success_count", 0),
+                    last_failure_time=state_data.get("last_failure_time")
+                )
+        except Exception:
+            pass
+
+    def peek(self, agent: str) -> CircuitBreakerState | None:
+        """État courant sans verrou (lecture du chemin rapide)."""
+        return self._states.get(agent)
+
+    @contextmanager
+    def transaction(self, agent: str) -> Iterator[CircuitBreakerState]:
+        """Modification atomique de l'état d'un agent."""
+        with self._lock:
+            state = self._states.get(agent)
+            if state is None:
+                state = self._states[agent] = CircuitBreakerState(agent=agent)
+            before = state.snapshot()
+            try:
+                yield state
+            finally:
+                if state.snapshot() != before:
+                    self._mark_dirty(agent)
+
+    def all(self) -> dict[str, CircuitBreakerState]:
+        with self._lock:
+            return dict(self._states)
+
+    def reset(self, agent: str) -> bool:
+        with self._lock:
+            if agent not in self._states:
+                return False
+            self._states[agent] = CircuitBreakerState(agent=agent)
+            self._mark_dirty(agent)
+        self.flush()
+        return True
+
+    def _mark_dirty(self, agent: str) -> None:
+        self._dirty.add(agent)
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Écrit l'état s'il a changé depuis la dernière écriture."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            changes = {
+                agent: {
+                    "state": state.state.name,
+                    "failure_count": state.failure_count,
+                    "success_count": state.success_count,
+                    "last_failure_time": state.last_failure_time
+                }
+                for agent, state in self._states.items() if agent in self._dirty
+            }
+            self._dirty = set()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as lock:
+            # Verrou partagé avec les autres processus (et les autres flush de celui-ci)
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    data = json.loads(self.path.read_text())
+                except (OSError, ValueError):
+                    data = {}
+                data.update(changes)
+                tmp = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(data, indent=2))
+                os.replace(tmp, self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class SqliteCircuitStore:
+    """
+    États des circuits partagés entre processus (SQLite, WAL).
+
+    Tous les processus agents voient le même état: un circuit ouvert par l'un
+    fait échouer vite les autres, et le quota d'appels half-open est global.
+    Les lectures ne prennent pas de verrou d'écriture; les transitions passent
+    par BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, path: Path = CIRCUIT_DB_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None, timeout=5.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS circuits (
+                agent TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                failure_count INTEGER NOT NULL,
+                success_count INTEGER NOT NULL,
+                last_failure_time TEXT,
+                half_open_calls INTEGER NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def _from_row(row: tuple) -> CircuitBreakerState:
+        return CircuitBreakerState(
+            agent=row[0],
+            state=CircuitState[row[1]],
+            failure_count=row[2],
+            success_count=row[3],
+            last_failure_time=row[4],
+            half_open_calls=row[5]
+        )
+
+    def peek(self, agent: str) -> CircuitBreakerState | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM circuits WHERE agent = ?", (agent,)).fetchone()
+        return self._from_row(row) if row else None
+
+    @contextmanager
+    def transaction(self, agent: str) -> Iterator[CircuitBreakerState]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT * FROM circuits WHERE agent = ?", (agent,)).fetchone()
+                state = self._from_row(row) if row else CircuitBreakerState(agent=agent)
+                before = state.snapshot() if row else None
+                yield state
+                if state.snapshot() != before:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO circuits VALUES (?, ?, ?, ?, ?, ?)",
+                        (agent, state.state.name, state.failure_count, state.success_count,
+                         state.last_failure_time, state.half_open_calls)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def all(self) -> dict[str, CircuitBreakerState]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM circuits ORDER BY agent").fetchall()
+        return {row[0]: self._from_row(row) for row in rows}
+
+    def reset(self, agent: str) -> bool:
+        if self.peek(agent) is None:
+            return False
+        with self.transaction(agent) as state:
+            state.state = CircuitState.CLOSED
+            state.failure_count = 0
+            state.success_count = 0
+            state.last_failure_time = None
+            state.half_open_calls = 0
+        return True
+
+    def flush(self) -> None:
+        pass  # Chaque transaction est déjà persistée
+
+
 class RetryError(Exception):
     """Erreur après épuisement des retries."""
     pass
@@ -103,57 +377,73 @@ class CircuitOpenError(Exception):
     pass
 
 
-class ErrorHandler:
-    """Gestionnaire d'erreurs centralisé."""
+class DeadlineExceededError(RetryError):
+    """Budget de temps épuisé avant un succès."""
+    pass
 
-    def __init__(self):
-        self.circuit_states: dict[str, CircuitBreakerState] = {}
-        self.error_history: list[ErrorRecord] = []
+
+class LatencyTracker:
+    """Durées récentes des exécutions réussies, par agent (pour le p95 du hedging)."""
+
+    def __init__(self, path: Path = LATENCY_FILE):
+        self.path = path
+        self._samples: dict[str, list[float]] = {}
         self._lock = threading.Lock()
-        self._load_circuit_states()
+        try:
+            self._samples = json.loads(path.read_text())
+        except Exception:
+            pass
 
-    def _load_circuit_states(self):
-        """Charge les états des circuits."""
-        if CIRCUIT_STATE_FILE.exists():
-            try:
-                data = json.loads(CIRCUIT_STATE_FILE.read_text())
-                for agent, state_data in data.items():
-                    self.circuit_states[agent] = CircuitBreakerState(
-                        agent=agent,
-                        state=CircuitState[state_data.get("state", "CLOSED")],
-                        failure_count=state_data.get("failure_count", 0),
-                        success_count=state_data.get("success_count", 0),
-                        last_failure_time=state_data.get("last_failure_time")
-                    )
-            except Exception:
-                pass
+    def record(self, agent: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(agent, [])
+            samples.append(round(seconds, 3))
+            del samples[:-LATENCY_SAMPLES]
+            data = json.dumps(self._samples)
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(data)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def p95(self, agent: str) -> float | None:
+        """p95 des durées récentes, None si l'historique est trop court."""
+        with self._lock:
+            samples = sorted(self._samples.get(agent, []))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
 
-    def _save_circuit_states(self):
-        """Sauvegarde les états des circuits."""
-        data = {}
-        for agent, state in self.circuit_states.items():
-            data[agent] = {
-                "state": state.state.name,
-                "failure_count": state.failure_count,
-                "success_count": state.success_count,
-                "last_failure_time": state.last_failure_time
-            }
-        CIRCUIT_STATE_FILE.write_text(json.dumps(data, indent=2))
 
-    def _get_circuit_state(self, agent: str) -> CircuitBreakerState:
-        """Récupère ou crée l'état du circuit pour un agent."""
-        if agent not in self.circuit_states:
-            self.circuit_states[agent] = CircuitBreakerState(agent=agent)
-        return self.circuit_states[agent]
+class ErrorHandler:
+    """Gestionnaire d'erreurs centralisé."""
+
+    def __init__(self, circuit_backend: str = CIRCUIT_BACKEND):
+        self.error_history: list[ErrorRecord] = []
+        self.result_cache = AgentResultCache(namespace="error_handler")
+        self.latency = LatencyTracker()
+        if circuit_backend == "sqlite":
+            self.circuit_store = SqliteCircuitStore()
+        else:
+            self.circuit_store = CircuitStateStore()
+
+    @property
+    def circuit_states(self) -> dict[str, CircuitBreakerState]:
+        """Instantané des états de tous les circuits."""
+        return self.circuit_store.all()
 
     def _check_circuit(self, agent: str, config: CircuitBreakerConfig) -> bool:
         """
         Vérifie si l'appel est autorisé selon le circuit breaker.
         Retourne True si l'appel est autorisé.
         """
-        with self._lock:
-            state = self._get_circuit_state(agent)
+        # Chemin rapide: circuit fermé, aucune écriture
+        current = self.circuit_store.peek(agent)
+        if current is None or current.state == CircuitState.CLOSED:
+            return True
 
+        with self.circuit_store.transaction(agent) as state:
             if state.state == CircuitState.CLOSED:
                 return True
 
@@ -164,7 +454,6 @@ class ErrorHandler:
                     if datetime.now() - last_failure > timedelta(seconds=config.timeout):
                         state.state = CircuitState.HALF_OPEN
                         state.half_open_calls = 0
-                        self._save_circuit_states()
                         return True
                 return False
 
@@ -176,9 +465,12 @@ class ErrorHandler:
 
     def _record_success(self, agent: str, config: CircuitBreakerConfig):
         """Enregistre un succès."""
-        with self._lock:
-            state = self._get_circuit_state(agent)
+        # Chemin rapide: circuit fermé sans échec en cours, rien ne change
+        current = self.circuit_store.peek(agent)
+        if current is None or (current.state == CircuitState.CLOSED and current.failure_count == 0):
+            return
 
+        with self.circuit_store.transaction(agent) as state:
             if state.state == CircuitState.HALF_OPEN:
                 state.success_count += 1
                 if state.success_count >= config.success_threshold:
@@ -188,12 +480,9 @@ class ErrorHandler:
             else:
                 state.failure_count = max(0, state.failure_count - 1)
 
-            self._save_circuit_states()
-
     def _record_failure(self, agent: str, error: str, config: CircuitBreakerConfig):
         """Enregistre un échec."""
-        with self._lock:
-            state = self._get_circuit_state(agent)
+        with self.circuit_store.transaction(agent) as state:
             state.failure_count += 1
             state.last_failure_time = datetime.now().isoformat()
 
@@ -202,31 +491,46 @@ class ErrorHandler:
                 state.success_count = 0
             elif state.failure_count >= config.failure_threshold:
                 state.state = CircuitState.OPEN
+            circuit_state = state.state.name
 
-            self._save_circuit_states()
-
-            # Logger l'erreur
-            self._log_error(ErrorRecord(
-                agent=agent,
-                error_type="execution_failure",
-                message=error,
-                context={"circuit_state": state.state.name}
-            ))
+        # Logger l'erreur (hors transaction)
+        self._log_error(ErrorRecord(
+            agent=agent,
+            error_type="execution_failure",
+            message=error,
+            context={"circuit_state": circuit_state}
+        ))
 
     def _log_error(self, error: ErrorRecord):
-        """Log une erreur."""
+        """Log une erreur (fichier du jour + mise à jour de son index)."""
         self.error_history.append(error)
 
-        # Écrire dans le fichier de log
-        log_file = ERROR_LOG_DIR / f"errors_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
-        with open(log_file, "a") as f:
-            f.write(json.dumps({
-                "agent": error.agent,
-                "error_type": error.error_type,
-                "message": error.message,
-                "timestamp": error.timestamp,
-                "context": error.context
-            }) + "\n")
+        # Écrire dans le fichier de log du jour de l'erreur
+        log_file = ERROR_LOG_DIR / f"errors_{error.timestamp[:10]}.jsonl"
+        line = (json.dumps({
+            "agent": error.agent,
+            "error_type": error.error_type,
+            "message": error.message,
+            "timestamp": error.timestamp,
+            "context": error.context
+        }) + "\n").encode()
+
+        with open(log_file, "ab") as f:
+            # Verrou partagé avec les autres processus: ligne et index restent cohérents
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                offset = f.seek(0, os.SEEK_END)
+                index = load_error_index(log_file) if offset else None
+                f.write(line)
+                f.flush()
+                if index is None:
+                    index = build_error_index(log_file)
+                else:
+                    _index_add(index, error.agent, error.timestamp, offset)
+                    index["size"] = offset + len(line)
+                _write_index(log_file, index)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
 
     def _calculate_delay(self, attempt: int, config: RetryConfig) -> float:
         """Calcule le délai avant le prochain retry."""
@@ -245,7 +549,8 @@ class ErrorHandler:
         self,
         func: Callable[..., T],
         config: RetryConfig = None,
-        on_retry: Callable[[int, Exception], None] = None
+        on_retry: Callable[[int, Exception], None] = None,
+        budget: float | None = None
     ) -> T:
         """
         Exécute une fonction avec retry et exponential backoff.
@@ -254,14 +559,17 @@ class ErrorHandler:
             func: Fonction à exécuter
             config: Configuration de retry
             on_retry: Callback appelé à chaque retry
+            budget: Temps total (s) au-delà duquel on ne retente plus
 
         Returns:
             Résultat de la fonction
 
         Raises:
             RetryError: Après épuisement des retries
+            DeadlineExceededError: Si le prochain retry dépasserait le budget
         """
         config = config or RetryConfig()
+        deadline = time.monotonic() + budget if budget is not None else None
         last_exception = None
 
         for attempt in range(config.max_attempts):
@@ -272,6 +580,10 @@ class ErrorHandler:
 
                 if attempt < config.max_attempts - 1:
                     delay = self._calculate_delay(attempt, config)
+                    if deadline is not None and time.monotonic() + delay >= deadline:
+                        raise DeadlineExceededError(
+                            f"Budget épuisé après {attempt + 1} tentative(s): {e}"
+                        )
 
                     if on_retry:
                         on_retry(attempt + 1, e)
@@ -282,6 +594,62 @@ class ErrorHandler:
             f"Échec après {config.max_attempts} tentatives: {last_exception}"
         )
 
+    async def retry_with_backoff_async(
+        self,
+        func: Callable[[], Awaitable[T]],
+        config: RetryConfig = None,
+        on_retry: Callable[[int, Exception], None] = None,
+        deadline: float | None = None
+    ) -> T:
+        """
+        Équivalent asyncio de retry_with_backoff: les attentes entre essais ne
+        bloquent pas la boucle, et chaque essai est borné par l'échéance.
+
+        Args:
+            func: Fabrique de coroutine (appelée à chaque essai)
+            config: Configuration de retry
+            on_retry: Callback appelé à chaque retry
+            deadline: Échéance absolue (time.monotonic()) partagée avec l'appelant
+
+        Raises:
+            RetryError: Après épuisement des retries
+            DeadlineExceededError: Échéance atteinte
+        """
+        config = config or RetryConfig()
+        last_exception = None
+
+        for attempt in range(config.max_attempts):
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceededError(f"Budget épuisé avant la tentative {attempt + 1}")
+
+            try:
+                return await asyncio.wait_for(func(), remaining)
+            except asyncio.TimeoutError as e:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise DeadlineExceededError(
+                        f"Budget épuisé pendant la tentative {attempt + 1}"
+                    ) from e
+                last_exception = e
+            except Exception as e:
+                last_exception = e
+
+            if attempt < config.max_attempts - 1:
+                delay = self._calculate_delay(attempt, config)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise DeadlineExceededError(
+                        f"Budget épuisé après {attempt + 1} tentative(s): {last_exception}"
+                    )
+
+                if on_retry:
+                    on_retry(attempt + 1, last_exception)
+
+                await asyncio.sleep(delay)
+
+        raise RetryError(
+            f"Échec après {config.max_attempts} tentatives: {last_exception}"
+        )
+
     def execute_with_circuit_breaker(
         self,
         agent: str,
@@ -331,15 +699,18 @@ class ErrorHandler:
                 raise Exception(result.stderr or f"Return code: {result.returncode}")
             return result
 
-        try:
-            result = self.retry_with_backoff(
-                execute,
-                config=retry_config,
-                on_retry=lambda a, e: print(f"Retry {a} pour {agent}: {e}")
-            )
+        def protected() -> dict[str, Any]:
+            try:
+                result = self.retry_with_backoff(
+                    execute,
+                    config=retry_config,
+                    on_retry=lambda a, e: print(f"Retry {a} pour {agent}: {e}")
+                )
+            except (RetryError, subprocess.TimeoutExpired) as e:
+                self._record_failure(agent, str(e), config)
+                return {"success": False, "agent": agent, "error": str(e)}
 
             self._record_success(agent, config)
-
             return {
                 "success": True,
                 "agent": agent,
@@ -347,31 +718,34 @@ class ErrorHandler:
                 "return_code": result.returncode
             }
 
-        except (RetryError, subprocess.TimeoutExpired) as e:
-            self._record_failure(agent, str(e), config)
+        # Cache TTL + fusion des appels identiques simultanés
+        outcome = self.result_cache.get_or_compute(agent, args, protected)
+        if outcome["success"]:
+            return outcome
 
-            # Essayer fallback
-            fallbacks = FALLBACK_AGENTS.get(agent, [])
-            for fallback in fallbacks:
-                try:
-                    return self.execute_with_circuit_breaker(
-                        fallback, args, config, retry_config
-                    )
-                except Exception:
-                    continue
+        # Essayer fallback
+        fallbacks = FALLBACK_AGENTS.get(agent, [])
+        for fallback in fallbacks:
+            try:
+                return self.execute_with_circuit_breaker(
+                    fallback, args, config, retry_config
+                )
+            except Exception:
+                continue
 
-            return {
-                "success": False,
-                "agent": agent,
-                "error": str(e),
-                "fallbacks_tried": fallbacks
-            }
+        return {
+            "success": False,
+            "agent": agent,
+            "error": outcome["error"],
+            "fallbacks_tried": fallbacks
+        }
 
     def execute_with_fallback(
         self,
         agent: str,
         args: list[str] = None,
-        fallbacks: list[str] = None
+        fallbacks: list[str] = None,
+        budget: float | None = None
     ) -> dict[str, Any]:
         """
         Exécute un agent avec fallback automatique.
@@ -380,33 +754,52 @@ class ErrorHandler:
             agent: Agent principal
             args: Arguments
             fallbacks: Liste de fallbacks (ou auto)
+            budget: Temps total (s) partagé entre l'agent et ses fallbacks
 
         Returns:
             Résultat de l'exécution
         """
         fallbacks = fallbacks or FALLBACK_AGENTS.get(agent, [])
         agents_to_try = [agent] + fallbacks
+        deadline = time.monotonic() + budget if budget is not None else None
 
         for current_agent in agents_to_try:
             agent_path = AGENTS_DIR / f"{current_agent}.py"
             if not agent_path.exists():
                 continue
 
-            try:
+            timeout = 60
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    return {
+                        "success": False,
+                        "agent": agent,
+                        "error": f"Budget de {budget}s épuisé",
+                        "tried": agents_to_try
+                    }
+
+            def run(path: Path = agent_path, name: str = current_agent, timeout: float = timeout) -> dict[str, Any]:
+                start = time.monotonic()
                 result = subprocess.run(
-                    [sys.executable, str(agent_path)] + (args or []),
+                    [sys.executable, str(path)] + (args or []),
                     capture_output=True,
                     text=True,
-                    timeout=60
+                    timeout=timeout
                 )
-
                 if result.returncode == 0:
-                    return {
-                        "success": True,
-                        "agent": current_agent,
-                        "output": result.stdout,
-                        "was_fallback": current_agent != agent
-                    }
+                    self.latency.record(name, time.monotonic() - start)
+                return {
+                    "success": result.returncode == 0,
+                    "agent": name,
+                    "output": result.stdout
+                }
+
+            try:
+                outcome = self.result_cache.get_or_compute(current_agent, args, run)
+
+                if outcome["success"]:
+                    return {**outcome, "was_fallback": current_agent != agent}
 
             except Exception as e:
                 self._log_error(ErrorRecord(
@@ -423,6 +816,174 @@ class ErrorHandler:
             "tried": agents_to_try
         }
 
+    async def _run_agent_async(
+        self,
+        agent: str,
+        args: list[str] | None = None,
+        timeout: float | None = None
+    ) -> dict[str, Any]:
+        """Exécute un agent en sous-processus asyncio (tué avec son groupe si annulé)."""
+        start = time.monotonic()
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, str(AGENTS_DIR / f"{agent}.py"), *(args or []),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # Terminer le groupe même si l'annulation se répète (wait_for + hedging)
+            kill = asyncio.ensure_future(self._kill_process(proc))
+            while not kill.done():
+                try:
+                    await asyncio.shield(kill)
+                except asyncio.CancelledError:
+                    continue
+            raise
+
+        duration = time.monotonic() - start
+        if proc.returncode == 0:
+            self.latency.record(agent, duration)
+        return {
+            "success": proc.returncode == 0,
+            "agent": agent,
+            "output": stdout.decode("utf-8", errors="replace"),
+            "error": stderr.decode("utf-8", errors="replace"),
+            "return_code": proc.returncode,
+            "duration": round(duration, 3)
+        }
+
+    @staticmethod
+    async def _kill_process(proc: asyncio.subprocess.Process) -> None:
+        """SIGTERM au groupe du processus, puis SIGKILL après un délai de grâce."""
+        if proc.returncode is not None:
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            await asyncio.wait_for(proc.wait(), KILL_GRACE_SECONDS)
+        except ProcessLookupError:
+            return
+        except asyncio.TimeoutError:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+    async def execute_with_fallback_async(
+        self,
+        agent: str,
+        args: list[str] = None,
+        fallbacks: list[str] = None,
+        budget: float = DEFAULT_BUDGET,
+        retry_config: RetryConfig = None,
+        hedge: bool = True
+    ) -> dict[str, Any]:
+        """
+        Exécute un agent avec retries, fallbacks et hedging, sous un budget total.
+
+        Les retries (backoff asyncio) et les fallbacks consomment le même budget.
+        Si hedge est actif et que l'agent en cours dépasse son p95 de latence
+        (appris des exécutions passées), le fallback suivant est lancé en
+        parallèle: la première réponse réussie gagne, l'autre est tuée.
+
+        Args:
+            agent: Agent principal
+            args: Arguments
+            fallbacks: Liste de fallbacks (ou auto)
+            budget: Temps total en secondes
+            retry_config: Retries par agent
+            hedge: Lancer un fallback en parallèle au-delà du p95
+
+        Returns:
+            Résultat (was_fallback, hedged, tried)
+        """
+        fallbacks = fallbacks if fallbacks is not None else FALLBACK_AGENTS.get(agent, [])
+        queue = [a for a in [agent] + fallbacks if (AGENTS_DIR / f"{a}.py").exists()]
+        tried: list[str] = []
+        if not queue:
+            return {"success": False, "agent": agent, "error": f"Agent non trouvé: {agent}", "tried": tried}
+
+        cached = self.result_cache.get(agent, args)
+        if cached is not None:
+            return {**cached, "cached": True, "was_fallback": False, "hedged": False}
+
+        retry_config = retry_config or RetryConfig()
+        deadline = time.monotonic() + budget
+        running: dict[asyncio.Task, tuple[str, float]] = {}  # tâche -> (agent, lancement)
+        errors: dict[str, str] = {}
+        hedged = False
+
+        async def attempt(name: str) -> dict[str, Any]:
+            async def once() -> dict[str, Any]:
+                result = await self._run_agent_async(name, args)
+                if not result["success"]:
+                    raise Exception(result["error"].strip()[-300:] or f"Return code: {result['return_code']}")
+                return result
+            return await self.retry_with_backoff_async(once, retry_config, deadline=deadline)
+
+        def launch() -> None:
+            name = queue.pop(0)
+            tried.append(name)
+            running[asyncio.ensure_future(attempt(name))] = (name, time.monotonic())
+
+        launch()
+        try:
+            while running:
+                wake_at = deadline
+                if hedge and queue and len(running) == 1:
+                    name, started = next(iter(running.values()))
+                    p95 = self.latency.p95(name)
+                    if p95 is not None:
+                        wake_at = min(wake_at, started + p95)
+
+                done, _ = await asyncio.wait(
+                    running, timeout=max(0.0, wake_at - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    if time.monotonic() >= deadline:
+                        # Les essais atteignent la même échéance: les laisser tuer leurs processus
+                        await asyncio.wait(running, timeout=KILL_GRACE_SECONDS + 1)
+                        break
+                    launch()  # Le principal dépasse son p95: requête hedgée
+                    hedged = True
+                    continue
+
+                for task in done:
+                    name, _ = running.pop(task)
+                    if task.exception() is None:
+                        result = task.result()
+                        self.result_cache.put(name, args, {
+                            k: result[k] for k in ("success", "agent", "output")
+                        })
+                        return {**result, "was_fallback": name != agent, "hedged": hedged, "tried": tried}
+                    errors[name] = str(task.exception())
+                    self._log_error(ErrorRecord(
+                        agent=name,
+                        error_type="execution_error",
+                        message=errors[name]
+                    ))
+
+                if not running and queue and time.monotonic() < deadline:
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        exhausted = time.monotonic() >= deadline
+        return {
+            "success": False,
+            "agent": agent,
+            "error": f"Budget de {budget}s épuisé" if exhausted else "Tous les agents ont échoué",
+            "tried": tried,
+            "errors": errors,
+            "hedged": hedged
+        }
+
     def get_circuit_status(self) -> dict[str, Any]:
         """Retourne le statut de tous les circuits."""
         return {
@@ -436,32 +997,88 @@ class ErrorHandler:
 
     def reset_circuit(self, agent: str) -> bool:
         """Reset un circuit breaker."""
-        if agent in self.circuit_states:
-            self.circuit_states[agent] = CircuitBreakerState(agent=agent)
-            self._save_circuit_states()
-            return True
-        return False
+        return self.circuit_store.reset(agent)
+
+    def _log_files_since(self, cutoff: datetime) -> list[Path]:
+        """Fichiers journaliers couvrant la période (sans lister le répertoire)."""
+        day = cutoff.date()
+        today = datetime.now().date()
+        files = []
+        while day <= today:
+            log_file = ERROR_LOG_DIR / f"errors_{day.isoformat()}.jsonl"
+            if log_file.exists():
+                files.append(log_file)
+            day += timedelta(days=1)
+        return files
 
     def get_recent_errors(self, hours: int = 24, agent: str = None) -> list[ErrorRecord]:
-        """Récupère les erreurs récentes."""
+        """
+        Récupère les erreurs récentes.
+
+        Seuls les fichiers des jours concernés sont ouverts; leur index permet
+        d'écarter ceux sans erreur de l'agent et de sauter aux heures utiles.
+        """
         cutoff = datetime.now() - timedelta(hours=hours)
+        cutoff_str = cutoff.isoformat()
         errors = []
 
-        # Lire les fichiers de log
-        for log_file in ERROR_LOG_DIR.glob("errors_*.jsonl"):
+        for log_file in self._log_files_since(cutoff):
             try:
-                for line in log_file.read_text().strip().split('\n'):
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    if datetime.fromisoformat(data["timestamp"]) > cutoff:
-                        if agent is None or data["agent"] == agent:
-                            errors.append(ErrorRecord(**data))
+                index = load_error_index(log_file)
+                if not index["count"] or index["last"] <= cutoff_str:
+                    continue
+                if agent is not None and agent not in index["agents"]:
+                    continue
+
+                # Plus petit offset des heures >= heure du cutoff (même jour seulement):
+                # les lignes ne sont pas forcément écrites dans l'ordre des heures
+                start = 0
+                if log_file.stem == f"errors_{cutoff.date().isoformat()}":
+                    start = min(
+                        (offset for hour, offset in index["offsets"].items() if hour >= cutoff_str[11:13]),
+                        default=index["size"]
+                    )
+
+                with open(log_file, "rb") as f:
+                    f.seek(start)
+                    for line in f:
+                        data = json.loads(line)
+                        if data["timestamp"] > cutoff_str:
+                            if agent is None or data["agent"] == agent:
+                                errors.append(ErrorRecord(**data))
             except Exception:
                 continue
 
         return sorted(errors, key=lambda e: e.timestamp, reverse=True)
 
+    def get_error_counts(self, hours: int = 24, agent: str = None) -> dict[str, dict[str, int]]:
+        """
+        Erreurs par agent et par heure, depuis les compteurs des index (aucune
+        ligne de log relue).
+
+        Returns:
+            {agent: {"YYYY-MM-DDTHH": nombre}}, heures incluses dans la période
+        """
+        cutoff = datetime.now() - timedelta(hours=hours)
+        cutoff_hour = cutoff.strftime("%Y-%m-%dT%H")
+        counts: dict[str, dict[str, int]] = {}
+
+        for log_file in self._log_files_since(cutoff):
+            try:
+                index = load_error_index(log_file)
+            except Exception:
+                continue
+            day = log_file.stem.removeprefix("errors_")
+            for hour, per_agent in index["hours"].items():
+                bucket = f"{day}T{hour}"
+                if bucket < cutoff_hour:
+                    continue
+                for name, count in per_agent.items():
+                    if agent is None or name == agent:
+                        counts.setdefault(name, {})[bucket] = count
+
+        return {name: dict(sorted(buckets.items())) for name, buckets in sorted(counts.items())}
+
 
 # Décorateur pour retry
 def with_retry(config: RetryConfig = None):
@@ -480,6 +1097,40 @@ def with_retry(config: RetryConfig = None):
     return decorator
 
 
+def benchmark_circuit(iterations: int = 10000) -> dict[str, dict[str, float]]:
+    """
+    Coût par appel (µs) de _check_circuit / _record_success / _record_failure
+    pour chaque backend, sur des fichiers temporaires.
+    """
+    import tempfile
+
+    config = CircuitBreakerConfig(failure_threshold=iterations + 1)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("memory", "sqlite"):
+            handler = ErrorHandler.__new__(ErrorHandler)
+            handler.error_history = []
+            if backend == "sqlite":
+                handler.circuit_store = SqliteCircuitStore(Path(tmp) / "circuits.db")
+            else:
+                handler.circuit_store = CircuitStateStore(Path(tmp) / "circuits.json")
+            handler._log_error = lambda error: None
+
+            timings = {}
+            for name, call in (
+                ("check_closed", lambda: handler._check_circuit("bench", config)),
+                ("record_failure", lambda: handler._record_failure("bench", "x", config)),
+                ("record_success", lambda: handler._record_success("bench", config)),
+            ):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    call()
+                timings[name] = round((time.perf_counter() - start) / iterations * 1e6, 2)
+            handler.circuit_store.flush()
+            results[backend] = timings
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Aura Error Handler - Gestion des erreurs",
@@ -487,12 +1138,19 @@ def main():
         epilog="""
 Exemples:
   %(prog)s execute sys_health --retry 3
+  %(prog)s execute network_monitor status --hedge --budget 20
   %(prog)s status
   %(prog)s errors --hours 24
+  %(prog)s stats --hours 48
   %(prog)s reset sys_health
+  %(prog)s --circuit-backend sqlite status
+  %(prog)s bench
         """
     )
 
+    parser.add_argument("--circuit-backend", choices=["memory", "sqlite"], default=CIRCUIT_BACKEND,
+                        help="État des circuits: mémoire (JSON différé) ou SQLite partagé")
+
     subparsers = parser.add_subparsers(dest="command")
 
     # execute
@@ -501,6 +1159,9 @@ Exemples:
     exec_p.add_argument("args", nargs="*", help="Arguments")
     exec_p.add_argument("--retry", type=int, default=3, help="Nombre de retries")
     exec_p.add_argument("--no-circuit", action="store_true", help="Désactiver circuit breaker")
+    exec_p.add_argument("--budget", type=float, help="Temps total (s) pour retries et fallbacks")
+    exec_p.add_argument("--hedge", action="store_true",
+                        help="Asyncio: lancer le fallback si l'agent dépasse son p95")
 
     # status
     subparsers.add_parser("status", help="Statut des circuit breakers")
@@ -510,23 +1171,43 @@ Exemples:
     err_p.add_argument("--hours", type=int, default=24)
     err_p.add_argument("--agent")
 
+    # stats
+    stats_p = subparsers.add_parser("stats", help="Erreurs par agent et par heure (compteurs)")
+    stats_p.add_argument("--hours", type=int, default=24)
+    stats_p.add_argument("--agent")
+
     # reset
     reset_p = subparsers.add_parser("reset", help="Reset un circuit breaker")
     reset_p.add_argument("agent")
 
+    # bench
+    bench_p = subparsers.add_parser("bench", help="Coût par appel du circuit breaker")
+    bench_p.add_argument("--iterations", type=int, default=10000)
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    handler = ErrorHandler()
+    if args.command == "bench":
+        for backend, timings in benchmark_circuit(args.iterations).items():
+            print(f"{backend:<8} " + "  ".join(f"{name}: {us:.2f} µs" for name, us in timings.items()))
+        return
+
+    handler = ErrorHandler(circuit_backend=args.circuit_backend)
 
     if args.command == "execute":
         retry_config = RetryConfig(max_attempts=args.retry)
 
-        if args.no_circuit:
-            result = handler.execute_with_fallback(args.agent, args.args)
+        if args.hedge:
+            result = asyncio.run(handler.execute_with_fallback_async(
+                args.agent, args.args,
+                budget=args.budget or DEFAULT_BUDGET,
+                retry_config=retry_config
+            ))
+        elif args.no_circuit:
+            result = handler.execute_with_fallback(args.agent, args.args, budget=args.budget)
         else:
             try:
                 result = handler.execute_with_circuit_breaker(
@@ -557,6 +1238,17 @@ Exemples:
             for e in errors[:20]:
                 print(f"[{e.timestamp[:19]}] {e.agent}: {e.message[:60]}")
 
+    elif args.command == "stats":
+        counts = handler.get_error_counts(hours=args.hours, agent=args.agent)
+        if not counts:
+            print("Aucune erreur récente.")
+        else:
+            print(f"Erreurs par heure (dernières {args.hours}h):\n")
+            for name, buckets in counts.items():
+                total = sum(buckets.values())
+                hourly = ", ".join(f"{bucket[11:13]}h: {n}" for bucket, n in buckets.items())
+                print(f"{name:<25} {total:>5}  ({hourly})")
+
     elif args.command == "reset":
         if handler.reset_circuit(args.agent):
             print(f"Circuit breaker reset pour: {args.agent}")
@@ -8,13 +8,15 @@ Supporte les regles personnalisees avec patterns glob et actions automatiques.
 import argparse
 import json
 import os
+import random
+import re
 import signal
 import subprocess
 import sys
 import time
 import uuid
 from datetime import datetime
-from fnmatch import fnmatch
+from fnmatch import fnmatch, translate
 from pathlib import Path
 
 try:
@@ -133,6 +135,165 @@ def remove_rule(rule_id: str) -> bool:
         return True
     return False
 
+# --- Rule Matching ---
+def _path_parts(path: str) -> tuple:
+    """Split a path like Path(path).parts does, without building a Path."""
+    parts = tuple(p for p in path.split("/") if p and p != ".")
+    return ("/",) + parts if path.startswith("/") else parts
+
+class RuleIndex:
+    """
+    Rules compiled into a path-prefix trie.
+
+    Each trie node is a directory component; a node holding rules keeps, per
+    event type, one regex made of the rules' globs as named alternatives in
+    rule order. Matching walks the file's path components once and tries one
+    regex per watched ancestor, so the cost depends on path depth, not on
+    the number of rules. Results are identical to checking every enabled rule
+    in order with relative_to + fnmatch.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = [rule for rule in rules if rule.get("enabled", True)]
+        self._root = {}  # component -> child node; None -> {event: [(order, pattern)]}
+        for order, rule in enumerate(self.rules):
+            node = self._root
+            for part in _path_parts(rule["path"]):
+                node = node.setdefault(part, {})
+            node.setdefault(None, {}).setdefault(rule["event"], []).append(
+                (order, rule.get("pattern", "*.*"))
+            )
+        self._compile(self._root)
+
+    def _compile(self, node: dict) -> None:
+        """Compile each node's globs: one combined regex plus one regex per rule."""
+        for key, child in node.items():
+            if key is None:
+                node[None] = {
+                    event: (
+                        re.compile("|".join(f"(?P<r{order}>{translate(pattern)})" for order, pattern in entries)),
+                        [(order, re.compile(translate(pattern))) for order, pattern in entries]
+                    )
+                    for event, entries in child.items()
+                }
+            else:
+                self._compile(child)
+
+    def _orders(self, file_path: str, event_type: str, first_only: bool):
+        """Indexes of the matching rules, one watched ancestor at a time."""
+        parts = _path_parts(file_path)
+        name = parts[-1] if parts and parts[-1] != "/" else ""
+        node = self._root
+        for depth in range(len(parts) + 1):
+            compiled = node.get(None, {}).get(event_type)
+            if compiled is not None:
+                combined, single = compiled
+                if first_only:
+                    # Alternatives are tried in rule order: the group that matched is the first rule
+                    found = combined.match(name)
+                    if found:
+                        yield int(found.lastgroup[1:])
+                else:
+                    yield from (order for order, regex in single if regex.match(name))
+            if depth == len(parts):
+                break
+            node = node.get(parts[depth])
+            if node is None:
+                break
+
+    def match(self, file_path: str, event_type: str) -> dict | None:
+        """First enabled rule (in rule order) matching the file and event."""
+        orders = list(self._orders(file_path, event_type, first_only=True))
+        return self.rules[min(orders)] if orders else None
+
+    def matches(self, file_path: str, event_type: str) -> list:
+        """All enabled rules matching the file and event, in rule order."""
+        return [self.rules[order] for order in sorted(self._orders(file_path, event_type, first_only=False))]
+
+def match_rule_linear(rules: list, file_path: str, event_type: str) -> dict | None:
+    """Reference matcher: check every rule in order (used by the benchmark)."""
+    file_path = Path(file_path)
+
+    for rule in rules:
+        if not rule.get("enabled", True):
+            continue
+
+        # Check event type
+        if rule["event"] != event_type:
+            continue
+
+        # Check if file is in watched directory
+        try:
+            file_path.relative_to(Path(rule["path"]))
+        except ValueError:
+            continue
+
+        # Check pattern match
+        if fnmatch(file_path.name, rule.get("pattern", "*.*")):
+            return rule
+
+    return None
+
+def benchmark_matching(n_events: int = 100_000, n_rules: int = 500, linear_sample: int = 5_000,
+                       seed: int = 42) -> dict:
+    """
+    Replay synthetic events against synthetic rules with the RuleIndex, and
+    the first `linear_sample` of them with the linear matcher (too slow for
+    all events); check both agree and report per-event cost.
+    """
+    rng = random.Random(seed)
+    events_types = ["create", "modify", "delete"]
+    extensions = ["py", "md", "txt", "png", "jpg", "json", "log", "csv"]
+    dirs = [f"/home/bench/d{i}" for i in range(n_rules // 5 or 1)]
+    dirs += [f"{d}/sub{j}" for d in dirs[:len(dirs) // 2] for j in range(2)]
+
+    rules = [
+        {
+            "id": f"bench-{i}",
+            "path": rng.choice(dirs),
+            "pattern": rng.choice(["*.*", "*", "report_*.csv", "*.[jp][pn]g"] + [f"*.{ext}" for ext in extensions]),
+            "event": rng.choice(events_types),
+            "action": "true",
+            "enabled": rng.random() > 0.05
+        }
+        for i in range(n_rules)
+    ]
+    events = [
+        (
+            f"{rng.choice(dirs + ['/tmp/other', '/home/bench'])}/{rng.choice(['file', 'report_1', 'img'])}{i % 97}.{rng.choice(extensions)}",
+            rng.choice(events_types)
+        )
+        for i in range(n_events)
+    ]
+
+    start = time.perf_counter()
+    index = RuleIndex(rules)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    indexed = [index.match(path, event) for path, event in events]
+    indexed_s = time.perf_counter() - start
+
+    sample = events[:linear_sample]
+    start = time.perf_counter()
+    linear = [match_rule_linear(rules, path, event) for path, event in sample]
+    linear_s = time.perf_counter() - start
+
+    index_us = indexed_s / n_events * 1e6 if n_events else 0.0
+    linear_us = linear_s / len(sample) * 1e6 if sample else 0.0
+    return {
+        "events": n_events,
+        "rules": n_rules,
+        "matched": sum(1 for rule in indexed if rule is not None),
+        "linear_sample": len(sample),
+        "mismatches": sum(1 for a, b in zip(indexed, linear) if a is not b),
+        "index_build_ms": round(build_ms, 2),
+        "index_total_s": round(indexed_s, 3),
+        "index_us_per_event": round(index_us, 2),
+        "linear_us_per_event": round(linear_us, 2),
+        "speedup": round(linear_us / index_us, 1) if index_us and sample else None
+    }
+
 # --- Event Handler ---
 class AuraEventHandler(FileSystemEventHandler):
     """Custom event handler for AURA rules."""
@@ -140,6 +301,7 @@ class AuraEventHandler(FileSystemEventHandler):
     def __init__(self, rules: list):
         super().__init__()
         self.rules = rules
+        self.index = RuleIndex(rules)
         self.cooldown = {}  # Prevent duplicate triggers
         self.cooldown_seconds = 2
 
@@ -157,31 +319,7 @@ class AuraEventHandler(FileSystemEventHandler):
 
     def _match_rule(self, file_path: str, event_type: str) -> dict | None:
         """Find matching rule for file and event type."""
-        file_path = Path(file_path)
-
-        for rule in self.rules:
-            if not rule.get("enabled", True):
-                continue
-
-            rule_path = Path(rule["path"])
-            rule_event = rule["event"]
-            pattern = rule.get("pattern", "*.*")
-
-            # Check event type
-            if rule_event != event_type:
-                continue
-
-            # Check if file is in watched directory
-            try:
-                file_path.relative_to(rule_path)
-            except ValueError:
-                continue
-
-            # Check pattern match
-            if fnmatch(file_path.name, pattern):
-                return rule
-
-        return None
+        return self.index.match(file_path, event_type)
 
     def _execute_action(self, rule: dict, file_path: str) -> None:
         """Execute the action for a matched rule."""
@@ -387,23 +525,13 @@ def test_path(path: str) -> None:
     print(f"Testing path: {path}")
     print("-" * 40)
 
+    index = RuleIndex(rules)
     matched = False
     for event_type in ["create", "modify", "delete"]:
-        for rule in rules:
-            if not rule.get("enabled", True):
-                continue
-
-            rule_path = Path(rule["path"])
-            pattern = rule.get("pattern", "*.*")
-
-            try:
-                path.relative_to(rule_path)
-                if fnmatch(path.name, pattern) and rule["event"] == event_type:
-                    print(f"MATCH: Rule '{rule['id']}' ({event_type})")
-                    print(f"  Action: {rule['action'].replace('{file}', str(path))}")
-                    matched = True
-            except ValueError:
-                continue
+        for rule in index.matches(str(path), event_type):
+            print(f"MATCH: Rule '{rule['id']}' ({event_type})")
+            print(f"  Action: {rule['action'].replace('{file}', str(path))}")
+            matched = True
 
     if not matched:
         print("No matching rules found.")
@@ -445,6 +573,13 @@ def main():
     test_parser = subparsers.add_parser("test", help="Test a path against rules")
     test_parser.add_argument("--path", required=True, help="Path to test")
 
+    # Benchmark command
+    bench_parser = subparsers.add_parser("bench", help="Benchmark rule matching on synthetic events")
+    bench_parser.add_argument("--events", type=int, default=100_000, help="Number of events (default: 100000)")
+    bench_parser.add_argument("--rules", type=int, default=500, help="Number of rules (default: 500)")
+    bench_parser.add_argument("--linear-sample", type=int, default=5_000,
+                              help="Events also replayed with the linear matcher (default: 5000)")
+
     args = parser.parse_args()
 
     if args.command == "start":
@@ -465,6 +600,8 @@ def main():
         list_rules()
     elif args.command == "test":
         test_path(args.path)
+    elif args.command == "bench":
+        print(json.dumps(benchmark_matching(args.events, args.rules, args.linear_sample), indent=2))
     else:
         parser.print_help()
 
@@ -11,19 +11,49 @@ Basé sur:
 """
 
 import argparse
+import atexit
+import copy
+import fcntl
+import hashlib
+import importlib.util
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass, field
+import unicodedata
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any
 from datetime import datetime
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # Configuration
 AGENTS_DIR = Path(__file__).parent
 CONFIG_DIR = Path.home() / ".aura"
 ROUTING_CONFIG = CONFIG_DIR / "routing_config.json"
 
+# Embeddings des capacités (matrice persistée, invalidée par hash de la table)
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_CACHE = CONFIG_DIR / "cache" / "router_embeddings.npz"
+
+# Cache des décisions et fast-path appris des tâches supervisées réussies
+DECISION_CACHE_SIZE = 256
+FASTPATH_FILE = CONFIG_DIR / "cache" / "routing_fastpath.json"
+FASTPATH_MIN_SUCCESSES = 2  # Succès avant de court-circuiter le scoring
+FASTPATH_MAX_ENTRIES = 1000
+# Compteurs du cache cumulés entre processus (ajoutés à la sortie de chacun)
+CACHE_STATS_FILE = CONFIG_DIR / "cache" / "routing_stats.json"
+
+# Corpus annoté pour mesurer précision et débit du routage
+BENCHMARK_CORPUS = AGENTS_DIR / "routing_benchmark.json"
+
 # Seuils
 CONFIDENCE_THRESHOLD = 0.6  # Minimum pour router
 HIGH_CONFIDENCE = 0.85      # Routage direct sans vérification
@@ -229,14 +259,163 @@ ROUTING_TABLE: dict[str, AgentCapability] = {
 }
 
 
+def normalize_query(query: str) -> str:
+    """Forme canonique d'une requête pour le cache (casse, ponctuation, espaces)."""
+    query = unicodedata.normalize("NFC", query).lower()
+    query = re.sub(r"[^\w\s'-]", " ", query)
+    return " ".join(query.split())
+
+
+class KeywordMatcher:
+    """
+    Matcher keywords/regex compilé une fois pour toute la table de routage.
+
+    Les keywords sont reconnus par un automate Aho-Corasick (un seul passage sur
+    la requête, correspondances chevauchantes incluses, comme `kw in query`);
+    les patterns de chaque agent sont réunis en une alternation précompilée qui
+    sert de filtre avant le comptage pattern par pattern (inutile pour un
+    pattern unique). Les scores sont identiques à la boucle naïve.
+    """
+
+    def __init__(self, routing_table: dict[str, AgentCapability]):
+        self.agents = list(routing_table)
+        # keyword -> [(index agent, occurrences dans sa liste)]
+        owners: dict[str, dict[int, int]] = {}
+        self.always = [0] * len(self.agents)  # keywords vides: toujours présents
+        self.patterns: list[tuple[re.Pattern | None, list[re.Pattern]]] = []
+
+        for idx, name in enumerate(self.agents):
+            cap = routing_table[name]
+            for kw in cap.keywords:
+                kw = kw.lower()
+                if kw:
+                    counts = owners.setdefault(kw, {})
+                    counts[idx] = counts.get(idx, 0) + 1
+                else:
+                    self.always[idx] += 1
+
+            compiled = [re.compile(p) for p in cap.patterns]
+            combined = None
+            if len(compiled) > 1:
+                try:
+                    combined = re.compile("|".join(f"(?:{p})" for p in cap.patterns))
+                except re.error:
+                    combined = None  # Groupes nommés en double, etc.: pas de filtre
+            self.patterns.append((combined, compiled))
+
+        self.keywords = list(owners)
+        self.owners = [list(owners[kw].items()) for kw in self.keywords]
+        self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        """Construit l'automate (transitions complètes sur l'alphabet des keywords)."""
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+
+        for kw_id, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(kw_id)
+
+        # Liens d'échec en largeur, transitions complétées en DFA
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        delta: list[dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            row = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                row[ch] = nxt
+                queue.append(nxt)
+            delta[state] = row
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def keyword_hits(self, query_lower: str) -> set[int]:
+        """Identifiants des keywords présents dans la requête."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        hits: set[int] = set()
+        for ch in query_lower:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+        return hits
+
+    def match(self, query: str) -> list[tuple[str, float]]:
+        """Scores keywords/patterns par agent, triés par score décroissant."""
+        query_lower = query.lower()
+        matches = list(self.always)
+        for kw_id in self.keyword_hits(query_lower):
+            for idx, count in self.owners[kw_id]:
+                matches[idx] += count
+
+        scores = []
+        for idx, name in enumerate(self.agents):
+            kw_matches = matches[idx]
+            score = 0.0
+            # Additions successives: mêmes flottants que la boucle naïve
+            for _ in range(kw_matches):
+                score += 0.15
+
+            combined, compiled = self.patterns[idx]
+            if compiled and (combined is None or combined.search(query_lower)):
+                for pattern in compiled:
+                    if pattern.search(query_lower):
+                        score += 0.3
+                        kw_matches += 1
+
+            if kw_matches > 2:
+                score *= 1.2
+
+            if score > 0:
+                scores.append((name, min(score, 1.0)))
+
+        return sorted(scores, key=lambda x: x[1], reverse=True)
+
+
+# Routeurs dont les compteurs sont persistés à la sortie (références faibles:
+# un seul hook atexit pour le processus, les routeurs jetés restent collectables)
+_STATS_ROUTERS: "weakref.WeakSet[IntentRouter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _save_all_cache_stats() -> None:
+    """Persiste les compteurs de tous les routeurs encore vivants."""
+    for router in list(_STATS_ROUTERS):
+        router.save_cache_stats()
+
+
 class IntentRouter:
     """Routeur d'intentions basé sur embeddings et keywords."""
 
-    def __init__(self, use_embeddings: bool = True):
+    def __init__(self, use_embeddings: bool = True, persist_stats: bool = True):
         self.use_embeddings = use_embeddings
-        self.routing_table = ROUTING_TABLE.copy()
+        # Copie profonde: la config custom étend keywords/patterns sans muter ROUTING_TABLE
+        self.routing_table = copy.deepcopy(ROUTING_TABLE)
         self.embedder = None
+        self._cap_names: list[str] = []
+        self._cap_matrix = None  # (agents x dim), lignes L2-normalisées
+        self._matcher: KeywordMatcher | None = None  # Compilé au premier match
+        self._decision_cache: OrderedDict[str, RoutingDecision] = OrderedDict()
+        self.cache_stats = {"lookups": 0, "cache_hits": 0, "fastpath_hits": 0, "batch_duplicates": 0}
+        if persist_stats:
+            _STATS_ROUTERS.add(self)
         self._load_custom_config()
+        self.fastpath = self._load_fastpath()
 
         if use_embeddings:
             self._init_embedder()
@@ -259,21 +438,107 @@ class IntentRouter:
                 pass
 
     def _init_embedder(self):
-        """Initialise le modèle d'embeddings."""
-        try:
-            from sentence_transformers import SentenceTransformer
-            self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
+        """
+        Charge la matrice des embeddings de capacités.
+
+        Lue depuis le cache disque si le hash de la table correspond; sinon
+        calculée en un seul appel au modèle puis persistée. Le modèle lui-même
+        n'est chargé qu'au premier encodage de requête.
+        """
+        if not NUMPY_AVAILABLE or importlib.util.find_spec("sentence_transformers") is None:
+            self.use_embeddings = False
+            return
 
-            # Pré-calculer les embeddings des descriptions
-            for cap in self.routing_table.values():
-                text = f"{cap.description} {' '.join(cap.keywords)}"
-                cap.embedding = self.embedder.encode(text).tolist()
+        key = self._table_hash()
+        if self._load_cached_matrix(key):
+            return
+
+        try:
+            self._build_matrix()
         except ImportError:
             self.use_embeddings = False
             self.embedder = None
+            return
+        self._save_cached_matrix(key)
+
+    def _get_embedder(self):
+        """Retourne le modèle d'embeddings (chargé à la demande)."""
+        if self.embedder is None:
+            from sentence_transformers import SentenceTransformer
+            self.embedder = SentenceTransformer(EMBEDDING_MODEL)
+        return self.embedder
+
+    @staticmethod
+    def _capability_text(cap: AgentCapability) -> str:
+        """Texte encodé pour une capacité."""
+        return f"{cap.description} {' '.join(cap.keywords)}"
+
+    def _table_hash(self) -> str:
+        """Hash du modèle, des textes de capacités et de la config custom."""
+        digest = hashlib.sha256(EMBEDDING_MODEL.encode())
+        for name, cap in self.routing_table.items():
+            digest.update(f"\0{name}\0{self._capability_text(cap)}".encode())
+        if ROUTING_CONFIG.exists():
+            digest.update(ROUTING_CONFIG.read_bytes())
+        return digest.hexdigest()
+
+    def _set_matrix(self, names: list[str], matrix) -> None:
+        """Installe la matrice et renseigne `embedding` sur chaque capacité."""
+        self._cap_names = list(names)
+        self._cap_matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        for name, row in zip(self._cap_names, self._cap_matrix):
+            self.routing_table[name].embedding = row.tolist()
+
+    def _build_matrix(self) -> None:
+        """Encode toutes les capacités en un seul batch."""
+        names = list(self.routing_table)
+        texts = [self._capability_text(self.routing_table[name]) for name in names]
+        matrix = self._get_embedder().encode(
+            texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True
+        )
+        self._set_matrix(names, matrix)
+
+    def _load_cached_matrix(self, key: str) -> bool:
+        """Charge la matrice persistée si elle correspond au hash courant."""
+        if not EMBEDDING_CACHE.exists():
+            return False
+        try:
+            with np.load(EMBEDDING_CACHE, allow_pickle=False) as data:
+                if str(data["key"]) != key:
+                    return False
+                names = data["names"].tolist()
+                matrix = data["matrix"]
+        except Exception:
+            return False
+        if sorted(names) != sorted(self.routing_table):
+            return False
+        self._set_matrix(names, matrix)
+        return True
+
+    def _save_cached_matrix(self, key: str) -> None:
+        """Persiste la matrice (écriture atomique)."""
+        try:
+            EMBEDDING_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = EMBEDDING_CACHE.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    key=np.array(key),
+                    names=np.array(self._cap_names),
+                    matrix=self._cap_matrix
+                )
+            os.replace(tmp, EMBEDDING_CACHE)
+        except OSError:
+            pass
 
     def _keyword_match(self, query: str) -> list[tuple[str, float]]:
-        """Match basé sur les keywords."""
+        """Match basé sur les keywords (matcher compilé)."""
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(self.routing_table)
+        return self._matcher.match(query)
+
+    def _keyword_match_python(self, query: str) -> list[tuple[str, float]]:
+        """Match keywords naïf (référence pour le benchmark)."""
         query_lower = query.lower()
         scores = []
 
@@ -303,24 +568,19 @@ class IntentRouter:
         return sorted(scores, key=lambda x: x[1], reverse=True)
 
     def _embedding_match(self, query: str) -> list[tuple[str, float]]:
-        """Match basé sur les embeddings."""
-        if not self.embedder:
+        """Match basé sur les embeddings (un produit matrice-vecteur)."""
+        if self._cap_matrix is None:
             return []
 
-        query_emb = self.embedder.encode(query)
-        scores = []
-
-        for name, cap in self.routing_table.items():
-            if cap.embedding:
-                # Cosine similarity
-                import numpy as np
-                cap_emb = np.array(cap.embedding)
-                similarity = np.dot(query_emb, cap_emb) / (
-                    np.linalg.norm(query_emb) * np.linalg.norm(cap_emb)
-                )
-                scores.append((name, float(similarity)))
+        query_emb = self._get_embedder().encode(query, normalize_embeddings=True)
+        return self._rank_similarities(
+            self._cap_matrix @ np.asarray(query_emb, dtype=np.float32)
+        )
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    def _rank_similarities(self, similarities) -> list[tuple[str, float]]:
+        """Trie les similarités d'une requête contre la matrice des capacités."""
+        order = np.argsort(-similarities, kind="stable")
+        return [(self._cap_names[i], float(similarities[i])) for i in order]
 
     def _combine_scores(
         self,
@@ -349,17 +609,108 @@ class IntentRouter:
         """
         Route une requête vers le(s) agent(s) approprié(s).
 
+        Consulte d'abord le cache LRU des décisions puis le fast-path appris,
+        avant tout scoring keywords/embeddings.
+
         Args:
             query: La requête utilisateur
 
         Returns:
             RoutingDecision avec l'agent principal et les agents secondaires
         """
+        key = normalize_query(query)
+        self.cache_stats["lookups"] += 1
+
+        cached = self._decision_cache.get(key)
+        if cached is not None:
+            self._decision_cache.move_to_end(key)
+            self.cache_stats["cache_hits"] += 1
+            return replace(cached)
+
+        decision = self._fastpath_decision(key)
+        if decision is not None:
+            self.cache_stats["fastpath_hits"] += 1
+        else:
+            decision = self._score(query)
+
+        self._decision_cache[key] = decision
+        if len(self._decision_cache) > DECISION_CACHE_SIZE:
+            self._decision_cache.popitem(last=False)
+        return replace(decision)
+
+    def route_batch(self, queries: list[str]) -> list[RoutingDecision]:
+        """
+        Route plusieurs requêtes à la fois.
+
+        Les requêtes absentes du cache et du fast-path sont encodées en un seul
+        appel au modèle et scorées ensemble contre la matrice des capacités.
+
+        Args:
+            queries: Requêtes utilisateur
+
+        Returns:
+            Une RoutingDecision par requête, dans l'ordre
+        """
+        decisions: list[RoutingDecision | None] = [None] * len(queries)
+        pending: dict[str, list[int]] = {}  # requête normalisée -> positions
+
+        for i, query in enumerate(queries):
+            key = normalize_query(query)
+            self.cache_stats["lookups"] += 1
+
+            cached = self._decision_cache.get(key)
+            if cached is not None:
+                self._decision_cache.move_to_end(key)
+                self.cache_stats["cache_hits"] += 1
+                decisions[i] = replace(cached)
+                continue
+
+            fast = self._fastpath_decision(key)
+            if fast is not None:
+                self.cache_stats["fastpath_hits"] += 1
+                decisions[i] = fast
+                continue
+
+            if key in pending:
+                self.cache_stats["batch_duplicates"] += 1  # Doublon dans le batch: un seul scoring
+            pending.setdefault(key, []).append(i)
+
+        if pending:
+            batch = [queries[positions[0]] for positions in pending.values()]
+            similarities = None
+            if self.use_embeddings and self._cap_matrix is not None:
+                query_embs = self._get_embedder().encode(
+                    batch, batch_size=64, normalize_embeddings=True, convert_to_numpy=True
+                )
+                similarities = np.asarray(query_embs, dtype=np.float32) @ self._cap_matrix.T
+
+            for row, (key, positions) in enumerate(pending.items()):
+                emb_scores = (
+                    self._rank_similarities(similarities[row])
+                    if similarities is not None else None
+                )
+                decision = self._score(batch[row], emb_scores)
+                self._decision_cache[key] = decision
+                for i in positions:
+                    decisions[i] = replace(decision)
+
+            while len(self._decision_cache) > DECISION_CACHE_SIZE:
+                self._decision_cache.popitem(last=False)
+
+        return decisions
+
+    def _score(
+        self,
+        query: str,
+        emb_scores: list[tuple[str, float]] | None = None
+    ) -> RoutingDecision:
+        """Scoring complet keywords + embeddings (déjà calculés en batch si fournis)."""
         # Scores keywords
         kw_scores = self._keyword_match(query)
 
         # Scores embeddings
-        emb_scores = self._embedding_match(query) if self.use_embeddings else []
+        if emb_scores is None:
+            emb_scores = self._embedding_match(query) if self.use_embeddings else []
 
         # Combiner
         if emb_scores:
@@ -367,6 +718,10 @@ class IntentRouter:
         else:
             combined = kw_scores
 
+        return self._decide(combined)
+
+    def _decide(self, combined: list[tuple[str, float]], reasoning: str = "") -> RoutingDecision:
+        """Construit la décision depuis des scores triés."""
         if not combined:
             return RoutingDecision(
                 primary_agent="",
@@ -400,12 +755,150 @@ class IntentRouter:
             primary_agent=primary_name,
             confidence=primary_score,
             secondary_agents=secondary,
-            reasoning=f"Match principal: {primary_name} ({primary_score:.2f})",
+            reasoning=reasoning or f"Match principal: {primary_name} ({primary_score:.2f})",
             run_parallel=run_parallel,
             run_background=run_bg,
             requires_confirmation=requires_confirm
         )
 
+    def _agents_fingerprint(self) -> str:
+        """Empreinte de l'ensemble des agents (un ajout invalide le fast-path)."""
+        return hashlib.sha256("\0".join(sorted(self.routing_table)).encode()).hexdigest()[:16]
+
+    def _load_fastpath(self) -> dict[str, dict]:
+        """Charge la table du fast-path appris."""
+        if FASTPATH_FILE.exists():
+            try:
+                return json.loads(FASTPATH_FILE.read_text()).get("entries", {})
+            except Exception:
+                pass
+        return {}
+
+    def _save_fastpath(self) -> None:
+        """Persiste le fast-path (écriture atomique, entrées les plus anciennes évincées)."""
+        if len(self.fastpath) > FASTPATH_MAX_ENTRIES:
+            oldest = sorted(self.fastpath, key=lambda k: self.fastpath[k]["last_success"])
+            for key in oldest[:len(self.fastpath) - FASTPATH_MAX_ENTRIES]:
+                del self.fastpath[key]
+        try:
+            FASTPATH_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = FASTPATH_FILE.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"entries": self.fastpath}, indent=2))
+            os.replace(tmp, FASTPATH_FILE)
+        except OSError:
+            pass
+
+    def _fastpath_decision(self, key: str) -> RoutingDecision | None:
+        """Décision apprise pour une requête normalisée, si confirmée."""
+        entry = self.fastpath.get(key)
+        if (
+            not entry
+            or entry["successes"] < FASTPATH_MIN_SUCCESSES
+            or entry["agents_fingerprint"] != self._agents_fingerprint()
+            or entry["agent"] not in self.routing_table
+        ):
+            return None
+
+        combined = [(entry["agent"], entry["confidence"])] + [
+            (name, score) for name, score in entry["secondary"]
+            if name in self.routing_table
+        ]
+        return self._decide(
+            combined,
+            reasoning=f"Fast-path appris: {entry['agent']} ({entry['successes']} succès)"
+        )
+
+    def record_outcome(
+        self,
+        query: str,
+        decision: RoutingDecision,
+        success: bool
+    ) -> None:
+        """
+        Apprend du résultat d'une tâche supervisée routée par ce routeur.
+
+        Un succès renforce l'entrée du fast-path (ou la crée); un échec de
+        l'agent principal la supprime.
+
+        Args:
+            query: Requête routée
+            decision: Décision utilisée pour la tâche
+            success: Succès de l'agent principal
+        """
+        key = normalize_query(query)
+        self._decision_cache.pop(key, None)
+
+        if not decision.primary_agent:
+            return
+
+        entry = self.fastpath.get(key)
+        if not success:
+            if entry and entry["agent"] == decision.primary_agent:
+                del self.fastpath[key]
+                self._save_fastpath()
+            return
+
+        fingerprint = self._agents_fingerprint()
+        if not entry or entry["agent"] != decision.primary_agent \
+                or entry["agents_fingerprint"] != fingerprint:
+            entry = {"agent": decision.primary_agent, "successes": 0}
+        entry.update({
+            "successes": entry["successes"] + 1,
+            "confidence": decision.confidence,
+            "secondary": [list(s) for s in decision.secondary_agents],
+            "agents_fingerprint": fingerprint,
+            "last_success": datetime.now().isoformat()
+        })
+        self.fastpath[key] = entry
+        self._save_fastpath()
+
+    @staticmethod
+    def _load_cache_stats() -> dict[str, int]:
+        """Compteurs cumulés des processus précédents."""
+        try:
+            return json.loads(CACHE_STATS_FILE.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache_stats(self) -> None:
+        """Ajoute les compteurs de ce processus au cumul persisté, puis les remet à zéro."""
+        if not self.cache_stats["lookups"]:
+            return
+        try:
+            CACHE_STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(CACHE_STATS_FILE.with_suffix(".lock"), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # Autres routeurs sortant en même temps
+                try:
+                    totals = self._load_cache_stats()
+                    for name, count in self.cache_stats.items():
+                        totals[name] = totals.get(name, 0) + count
+                    tmp = CACHE_STATS_FILE.with_suffix(f".{os.getpid()}.tmp")
+                    tmp.write_text(json.dumps(totals, indent=2))
+                    os.replace(tmp, CACHE_STATS_FILE)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        except OSError:
+            return
+        self.cache_stats = dict.fromkeys(self.cache_stats, 0)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Statistiques du cache de décisions et du fast-path (cumul persisté + processus courant)."""
+        persisted = self._load_cache_stats()
+        counters = {name: persisted.get(name, 0) + count for name, count in self.cache_stats.items()}
+        lookups = counters["lookups"]
+        hits = counters["cache_hits"] + counters["fastpath_hits"]
+        return {
+            **counters,
+            "misses": lookups - hits - counters["batch_duplicates"],  # Requêtes scorées
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "cache_size": len(self._decision_cache),
+            "fastpath_entries": len(self.fastpath),
+            "fastpath_confirmed": sum(
+                1 for e in self.fastpath.values()
+                if e["successes"] >= FASTPATH_MIN_SUCCESSES
+            )
+        }
+
     def get_agent_info(self, agent_name: str) -> AgentCapability | None:
         """Récupère les infos d'un agent."""
         return self.routing_table.get(agent_name)
@@ -430,16 +923,44 @@ class IntentRouter:
     def add_agent(self, agent: AgentCapability):
         """Ajoute un agent au routeur."""
         self.routing_table[agent.name] = agent
+        self._matcher = None
+        self._decision_cache.clear()
+
+        # Ajouter (ou remplacer) sa ligne dans la matrice si disponible
+        if self._cap_matrix is None:
+            return
+        if agent.embedding is None:
+            row = self._get_embedder().encode(
+                self._capability_text(agent), normalize_embeddings=True
+            )
+        else:
+            row = np.asarray(agent.embedding, dtype=np.float32)
+            row = row / (np.linalg.norm(row) or 1.0)
+
+        names = list(self._cap_names)
+        matrix = self._cap_matrix
+        if agent.name in names:
+            matrix = matrix.copy()
+            matrix[names.index(agent.name)] = row
+        else:
+            names.append(agent.name)
+            matrix = np.vstack([matrix, row[None, :]])
+        self._set_matrix(names, matrix)
+
+
+_ROUTERS: dict[bool, IntentRouter] = {}
+
 
-        # Recalculer embedding si disponible
-        if self.embedder and agent.embedding is None:
-            text = f"{agent.description} {' '.join(agent.keywords)}"
-            agent.embedding = self.embedder.encode(text).tolist()
+def get_router(use_embeddings: bool = True) -> IntentRouter:
+    """Routeur partagé du processus (garde son cache de décisions)."""
+    if use_embeddings not in _ROUTERS:
+        _ROUTERS[use_embeddings] = IntentRouter(use_embeddings=use_embeddings)
+    return _ROUTERS[use_embeddings]
 
 
 def route_query(query: str, use_embeddings: bool = True) -> dict[str, Any]:
     """Fonction helper pour routage rapide."""
-    router = IntentRouter(use_embeddings=use_embeddings)
+    router = get_router(use_embeddings)
     decision = router.route(query)
 
     return {
@@ -456,6 +977,136 @@ def route_query(query: str, use_embeddings: bool = True) -> dict[str, Any]:
     }
 
 
+def benchmark_keyword_match(num_queries: int = 5000, seed: int = 42) -> dict:
+    """
+    Compare le matcher compilé à la boucle naïve sur des requêtes réalistes.
+
+    Les requêtes mélangent des phrases FR/EN usuelles, des keywords de la table
+    et des formulations couvertes par les patterns.
+
+    Returns:
+        Temps par requête (µs) des deux chemins et accord des scores
+    """
+    import random
+    import time
+
+    rng = random.Random(seed)
+    router = IntentRouter(use_embeddings=False, persist_stats=False)
+    keywords = [kw for cap in router.routing_table.values() for kw in cap.keywords]
+    templates = [
+        "peux-tu vérifier {kw} stp", "montre-moi {kw} et {kw2}",
+        "check the {kw} please", "what is my {kw} right now",
+        "nettoie le cache puis {kw}", "comment va le système ?",
+        "qui consomme autant de {kw}", "fais un audit sécurité complet",
+        "lance en arrière-plan {kw}", "rappelle-toi que je préfère {kw}",
+        "range mes téléchargements", "quoi de neuf dans la tech",
+        "ouvre la fenêtre du terminal", "est-ce que {kw} fonctionne",
+        "bonjour, ça va ?", "write a short summary of today",
+    ]
+    queries = [
+        rng.choice(templates).format(kw=rng.choice(keywords), kw2=rng.choice(keywords))
+        for _ in range(num_queries)
+    ]
+
+    router._keyword_match(queries[0])  # Compilation hors mesure
+
+    start = time.perf_counter()
+    python_results = [router._keyword_match_python(q) for q in queries]
+    python_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_results = [router._keyword_match(q) for q in queries]
+    compiled_s = time.perf_counter() - start
+
+    return {
+        "queries": num_queries,
+        "agents": len(router.routing_table),
+        "keywords": len(keywords),
+        "python_us_per_query": round(python_s / num_queries * 1e6, 2),
+        "compiled_us_per_query": round(compiled_s / num_queries * 1e6, 2),
+        "speedup": round(python_s / compiled_s, 1) if compiled_s else None,
+        "identical": python_results == compiled_results
+    }
+
+
+def benchmark_routing(
+    corpus_path: Path = BENCHMARK_CORPUS,
+    use_embeddings: bool = True
+) -> dict:
+    """
+    Mesure précision et débit du routage sur le corpus annoté.
+
+    Le cache de décisions et le fast-path sont neutralisés: seule la
+    configuration de scoring (keywords, embeddings, config custom) est mesurée.
+
+    Args:
+        corpus_path: Corpus JSON {"queries": [{"query", "lang", "expected"}]}
+        use_embeddings: Activer le matching par embeddings
+
+    Returns:
+        Précision (globale, top-3, par langue) et requêtes/s en série et en batch
+    """
+    import time
+
+    corpus = json.loads(Path(corpus_path).read_text())["queries"]
+    queries = [item["query"] for item in corpus]
+
+    def fresh_router() -> IntentRouter:
+        router = IntentRouter(use_embeddings=use_embeddings, persist_stats=False)
+        router.fastpath = {}
+        router.route(queries[0])  # Chargement du modèle et compilation hors mesure
+        router._decision_cache.clear()
+        return router
+
+    router = fresh_router()
+    start = time.perf_counter()
+    sequential = [router.route(q) for q in queries]
+    sequential_s = time.perf_counter() - start
+
+    router = fresh_router()
+    start = time.perf_counter()
+    batched = router.route_batch(queries)
+    batch_s = time.perf_counter() - start
+
+    by_lang: dict[str, list[int]] = {}
+    correct = top3 = 0
+    errors = []
+    for item, decision in zip(corpus, batched):
+        hit = decision.primary_agent == item["expected"]
+        candidates = [decision.primary_agent] + [a for a, _ in decision.secondary_agents[:2]]
+        correct += hit
+        top3 += item["expected"] in candidates
+        stats = by_lang.setdefault(item.get("lang", "?"), [0, 0])
+        stats[0] += hit
+        stats[1] += 1
+        if not hit:
+            errors.append({
+                "query": item["query"],
+                "expected": item["expected"],
+                "got": decision.primary_agent
+            })
+
+    total = len(corpus)
+    return {
+        "config": {
+            "embeddings": router.use_embeddings,
+            "model": EMBEDDING_MODEL if router.use_embeddings else None,
+            "custom_config": ROUTING_CONFIG.exists(),
+            "agents": len(router.routing_table)
+        },
+        "queries": total,
+        "accuracy": round(correct / total, 3) if total else 0.0,
+        "top3_accuracy": round(top3 / total, 3) if total else 0.0,
+        "accuracy_by_lang": {
+            lang: round(ok / n, 3) for lang, (ok, n) in sorted(by_lang.items())
+        },
+        "same_decisions": [d.primary_agent for d in sequential] == [d.primary_agent for d in batched],
+        "sequential_qps": round(total / sequential_s, 1) if sequential_s else None,
+        "batch_qps": round(total / batch_s, 1) if batch_s else None,
+        "errors": errors
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Aura Intent Router - Classification et routage des intentions",
@@ -466,6 +1117,8 @@ Exemples:
   %(prog)s route "Fais un audit de sécurité complet" --no-embeddings
   %(prog)s list
   %(prog)s info sys_health
+  %(prog)s bench --queries 5000
+  %(prog)s eval --no-embeddings
         """
     )
 
@@ -485,13 +1138,42 @@ Exemples:
     info_p = subparsers.add_parser("info", help="Infos sur un agent")
     info_p.add_argument("agent", help="Nom de l'agent")
 
+    # stats
+    subparsers.add_parser("stats", help="Statistiques du cache et du fast-path")
+
+    # bench
+    bench_p = subparsers.add_parser("bench", help="Benchmark du matching keywords")
+    bench_p.add_argument("--queries", type=int, default=5000)
+
+    # eval
+    eval_p = subparsers.add_parser("eval", help="Précision et débit sur le corpus annoté")
+    eval_p.add_argument("--corpus", default=str(BENCHMARK_CORPUS))
+    eval_p.add_argument("--no-embeddings", action="store_true",
+                        help="Désactiver le matching par embeddings")
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    router = IntentRouter(use_embeddings=not getattr(args, 'no_embeddings', False))
+    if args.command == "bench":
+        print(json.dumps(benchmark_keyword_match(args.queries), indent=2))
+        return
+
+    if args.command == "eval":
+        print(json.dumps(
+            benchmark_routing(Path(args.corpus), use_embeddings=not args.no_embeddings),
+            indent=2, ensure_ascii=False
+        ))
+        return
+
+    if args.command == "stats":
+        # Compteurs persistés: pas besoin du modèle d'embeddings
+        print(json.dumps(IntentRouter(use_embeddings=False, persist_stats=False).get_cache_stats(), indent=2))
+        return
+
+    router = get_router(use_embeddings=not getattr(args, 'no_embeddings', False))
 
     if args.command == "route":
         decision = router.route(args.query)
@@ -0,0 +1,217 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+AURA Episode Clustering v1.0 - Regroupement d'épisodes par embeddings
+Pattern: Mini-batch k-means sphérique sur les embeddings déjà stockés
+Team: core (memory)
+
+Utilisé par la consolidation pour former les candidats skills: les épisodes
+paraphrasés ("nettoie le cache" / "vider le cache") tombent dans le même cluster
+là où l'heuristique par mots les séparait. Aucun ré-encodage: les vecteurs
+viennent de la collection ChromaDB des épisodes.
+
+Sources:
+- Sculley, "Web-Scale K-Means Clustering" (WWW 2010)
+"""
+
+import json
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class ClusteringResult:
+    """Résultat d'un clustering d'embeddings."""
+    labels: np.ndarray      # Cluster par point (-1 = hors cluster, similarité trop faible)
+    centroids: np.ndarray   # Centroïdes L2-normalisés (k x dim)
+    medoids: dict[int, int]  # cluster -> index du point le plus proche du centroïde
+    elapsed_ms: float
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalise chaque ligne (les lignes nulles restent nulles)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mini_batch_kmeans(
+    vectors: np.ndarray,
+    k: int,
+    batch_size: int = 1024,
+    max_iter: int = 100,
+    seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mini-batch k-means sphérique (similarité cosinus).
+
+    Args:
+        vectors: Vecteurs L2-normalisés (n x dim)
+        k: Nombre de clusters
+        batch_size: Taille des mini-batchs
+        max_iter: Nombre d'itérations
+        seed: Graine (résultat déterministe à entrée égale)
+
+    Returns:
+        (labels, centroids)
+    """
+    n = len(vectors)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+
+    centroids = vectors[rng.choice(n, size=k, replace=False)].copy()
+    counts = np.zeros(k, dtype=np.float64)
+
+    for _ in range(max_iter):
+        idx = rng.choice(n, size=min(batch_size, n), replace=False)
+        batch = vectors[idx]
+        labels = np.argmax(batch @ centroids.T, axis=1)
+
+        batch_counts = np.bincount(labels, minlength=k).astype(np.float64)
+        one_hot = np.zeros((len(idx), k), dtype=np.float32)
+        one_hot[np.arange(len(idx)), labels] = 1.0
+        sums = one_hot.T @ batch
+
+        # Taux d'apprentissage par centre: 1 / nombre de points vus
+        touched = batch_counts > 0
+        counts[touched] += batch_counts[touched]
+        eta = (batch_counts[touched] / counts[touched])[:, None]
+        means = sums[touched] / batch_counts[touched][:, None]
+        centroids[touched] = (1 - eta) * centroids[touched] + eta * means
+        centroids = normalize_rows(centroids)
+
+    return assign(vectors, centroids), centroids
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 4096) -> np.ndarray:
+    """Affecte chaque vecteur à son centroïde le plus proche (par blocs)."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        labels[start:start + chunk] = np.argmax(
+            vectors[start:start + chunk] @ centroids.T, axis=1
+        )
+    return labels
+
+
+def cluster_embeddings(
+    embeddings: np.ndarray,
+    target_size: int = 8,
+    min_similarity: float = 0.75,
+    seed: int = 0
+) -> ClusteringResult:
+    """
+    Regroupe des embeddings en candidats skills.
+
+    k est choisi pour viser `target_size` points par cluster; les points dont la
+    similarité à leur centroïde est inférieure à `min_similarity` sont marqués -1.
+
+    Args:
+        embeddings: Embeddings bruts (n x dim)
+        target_size: Taille moyenne visée par cluster
+        min_similarity: Cohésion minimale pour rester dans un cluster
+        seed: Graine du k-means
+
+    Returns:
+        ClusteringResult
+    """
+    start = time.perf_counter()
+    vectors = normalize_rows(embeddings)
+    if len(vectors) == 0:
+        return ClusteringResult(
+            labels=np.empty(0, dtype=np.int64),
+            centroids=np.empty((0, vectors.shape[1] if vectors.ndim == 2 else 0)),
+            medoids={},
+            elapsed_ms=0.0
+        )
+
+    k = max(1, math.ceil(len(vectors) / max(target_size, 1)))
+    labels, centroids = mini_batch_kmeans(vectors, k, seed=seed)
+
+    similarity = np.einsum("ij,ij->i", vectors, centroids[labels])
+    labels = np.where(similarity >= min_similarity, labels, -1)
+
+    medoids: dict[int, int] = {}
+    for cluster in np.unique(labels):
+        if cluster < 0:
+            continue
+        members = np.flatnonzero(labels == cluster)
+        medoids[int(cluster)] = int(members[np.argmax(similarity[members])])
+
+    return ClusteringResult(
+        labels=labels,
+        centroids=centroids,
+        medoids=medoids,
+        elapsed_ms=(time.perf_counter() - start) * 1000
+    )
+
+
+def benchmark_clustering(
+    num_episodes: int = 10_000,
+    dim: int = 384,
+    num_patterns: int = 500,
+    noise: float = 0.35,
+    seed: int = 42
+) -> dict:
+    """
+    Mesure le temps de clustering sur des embeddings synthétiques.
+
+    Chaque épisode est un "pattern" (direction aléatoire) bruité, ce qui imite
+    des paraphrases d'une même action.
+
+    Returns:
+        Temps total, temps par 10k épisodes et pureté des clusters
+    """
+    rng = np.random.default_rng(seed)
+    patterns = normalize_rows(rng.standard_normal((num_patterns, dim)))
+    truth = rng.integers(0, num_patterns, size=num_episodes)
+    jitter = rng.standard_normal((num_episodes, dim)) / math.sqrt(dim)
+    embeddings = patterns[truth] + noise * jitter
+
+    result = cluster_embeddings(
+        embeddings,
+        target_size=max(1, num_episodes // num_patterns),
+        min_similarity=0.5
+    )
+
+    # Pureté: part de points dont le cluster est majoritairement de leur pattern
+    clustered = result.labels >= 0
+    pure = 0
+    for cluster in np.unique(result.labels[clustered]):
+        members = truth[result.labels == cluster]
+        pure += np.bincount(members).max()
+
+    return {
+        "episodes": num_episodes,
+        "dim": dim,
+        "clusters": len(result.medoids),
+        "clustered_ratio": round(float(clustered.mean()), 3),
+        "purity": round(pure / max(int(clustered.sum()), 1), 3),
+        "elapsed_ms": round(result.elapsed_ms, 2),
+        "ms_per_10k": round(result.elapsed_ms * 10_000 / num_episodes, 2)
+    }
+
+
+# CLI
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AURA Episode Clustering")
+    subparsers = parser.add_subparsers(dest="command")
+
+    bench_p = subparsers.add_parser("bench", help="Benchmark du clustering")
+    bench_p.add_argument("--episodes", type=int, default=10_000)
+    bench_p.add_argument("--dim", type=int, default=384)
+    bench_p.add_argument("--patterns", type=int, default=500)
+
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(
+            benchmark_clustering(args.episodes, args.dim, args.patterns),
+            indent=2
+        ))
+    else:
+        parser.print_help()
@@ -4,6 +4,7 @@ Aura Episodic Memory - Mémoire épisodique avec contexte complet et scoring ava
 Capture et rappelle les interactions passées avec leur contexte intégral.
 """
 
+import heapq
 import json
 import sys
 from datetime import datetime
@@ -300,6 +301,70 @@ class EpisodicMemory:
         episodes.sort(key=lambda e: e.emotional_valence, reverse=True)
         return episodes[:limit]
 
+    def get_episodes_after(
+        self,
+        after: tuple[str, str] | None = None,
+        min_valence: float = 0.3,
+        limit: int = 100
+    ) -> list[Episode]:
+        """
+        Récupère les épisodes réussis postérieurs à un watermark.
+        Utilisé par la consolidation incrémentale.
+
+        Args:
+            after: Watermark (timestamp, episode_id) exclusif (None = depuis le début)
+            min_valence: Valence minimale
+            limit: Nombre maximum d'épisodes
+
+        Returns:
+            Épisodes non archivés triés par (timestamp, id) croissant
+        """
+        keys = []
+        for ep_id, data in self._metadata_cache.items():
+            key = (data.get("timestamp", ""), ep_id)
+            if after is not None and key <= after:
+                continue
+            if data.get("emotional_valence", 0.0) < min_valence:
+                continue
+            if data.get("metadata", {}).get("status") == MemoryStatus.ARCHIVED.name:
+                continue
+            keys.append(key)
+
+        return [
+            Episode.from_dict(self._metadata_cache[ep_id])
+            for _, ep_id in heapq.nsmallest(limit, keys)
+        ]
+
+    def get_episodes(self, episode_ids: list[str]) -> list[Episode]:
+        """Récupère plusieurs épisodes sans toucher aux stats d'accès."""
+        return [
+            Episode.from_dict(self._metadata_cache[ep_id])
+            for ep_id in episode_ids
+            if ep_id in self._metadata_cache
+        ]
+
+    def get_embeddings(self, episode_ids: list[str]) -> dict[str, list[float]]:
+        """Récupère les embeddings stockés (sans ré-encodage)."""
+        if not episode_ids:
+            return {}
+        data = self.collection.get(ids=episode_ids, include=["embeddings"])
+        embeddings = data.get("embeddings")
+        if embeddings is None:
+            return {}
+        return {
+            ep_id: embedding
+            for ep_id, embedding in zip(data["ids"], embeddings)
+            if embedding is not None
+        }
+
+    def get_consolidated_keys(self) -> list[tuple[str, str]]:
+        """Retourne (timestamp, id) des épisodes consolidés non archivés."""
+        return sorted(
+            (data.get("timestamp", ""), ep_id)
+            for ep_id, data in self._metadata_cache.items()
+            if data.get("metadata", {}).get("status") == MemoryStatus.CONSOLIDATED.name
+        )
+
     def archive_episode(self, episode_id: str) -> bool:
         """Archive un épisode (ne le supprime pas, mais le marque comme archivé)."""
         if episode_id in self._metadata_cache:
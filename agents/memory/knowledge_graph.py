@@ -5,7 +5,6 @@ Stocke les triplets (sujet, relation, objet) avec liens vers la mémoire épisod
 """
 
 import json
-import re
 import sys
 from collections import defaultdict
 from datetime import datetime
@@ -21,6 +20,7 @@ from memory_types import (
     KnowledgeTriple, MemoryMetadata, MemoryScore,
     MEMORY_CONFIG, calculate_recency_score
 )
+from text_patterns import EXTRACTED_CONFIDENCE, find_triples
 
 
 class KnowledgeGraph:
@@ -218,40 +218,11 @@ class KnowledgeGraph:
         """
         created_ids = []
 
-        # Patterns d'extraction simples
-        patterns = [
-            # "X est un Y"
-            (r"(\w+(?:\s+\w+)?)\s+est\s+un[e]?\s+(\w+(?:\s+\w+)?)", "is_a"),
-            # "X utilise Y"
-            (r"(\w+(?:\s+\w+)?)\s+utilise\s+(\w+(?:\s+\w+)?)", "uses"),
-            # "X dépend de Y"
-            (r"(\w+(?:\s+\w+)?)\s+dépend\s+de\s+(\w+(?:\s+\w+)?)", "depends_on"),
-            # "X préfère Y"
-            (r"l'?utilisateur\s+préfère\s+(\w+(?:\s+\w+)?)", "prefers", "utilisateur"),
-            # "X a Y"
-            (r"(\w+(?:\s+\w+)?)\s+a\s+(\w+(?:\s+\w+)?)", "has"),
-            # "X peut Y"
-            (r"(\w+(?:\s+\w+)?)\s+peut\s+(\w+(?:\s+\w+)?)", "can"),
-        ]
-
-        for pattern_tuple in patterns:
-            if len(pattern_tuple) == 3:
-                pattern, predicate, default_subject = pattern_tuple
-                for match in re.finditer(pattern, text, re.IGNORECASE):
-                    obj = match.group(1)
-                    triple_id = self.add_triple(
-                        default_subject, predicate, obj, 0.7, source_episode
-                    )
-                    created_ids.append(triple_id)
-            else:
-                pattern, predicate = pattern_tuple
-                for match in re.finditer(pattern, text, re.IGNORECASE):
-                    subject = match.group(1)
-                    obj = match.group(2)
-                    triple_id = self.add_triple(
-                        subject, predicate, obj, 0.7, source_episode
-                    )
-                    created_ids.append(triple_id)
+        for subject, predicate, obj in find_triples(text):
+            triple_id = self.add_triple(
+                subject, predicate, obj, EXTRACTED_CONFIDENCE, source_episode
+            )
+            created_ids.append(triple_id)
 
         return created_ids
 
@@ -39,6 +39,9 @@ class MemoryAPI:
         self._knowledge: KnowledgeGraph | None = None
         self._consolidator: MemoryConsolidator | None = None
 
+        # Modèles d'embedding déjà chargés, conservés par refresh()
+        self._models: dict[str, Any] = {}
+
         # Fichiers mémoire simples (style Anthropic)
         self.files_dir = self.base_path / "files"
         self.files_dir.mkdir(exist_ok=True)
@@ -49,18 +52,21 @@ class MemoryAPI:
     def episodic(self) -> EpisodicMemory:
         if self._episodic is None:
             self._episodic = EpisodicMemory(self.base_path / "episodic")
+            self._episodic._model = self._models.get("episodic")
         return self._episodic
 
     @property
     def procedural(self) -> ProceduralMemory:
         if self._procedural is None:
             self._procedural = ProceduralMemory(self.base_path / "procedural")
+            self._procedural._model = self._models.get("procedural")
         return self._procedural
 
     @property
     def knowledge(self) -> KnowledgeGraph:
         if self._knowledge is None:
             self._knowledge = KnowledgeGraph(self.base_path / "knowledge")
+            self._knowledge._model = self._models.get("knowledge")
         return self._knowledge
 
     @property
@@ -71,6 +77,24 @@ class MemoryAPI:
             )
         return self._consolidator
 
+    def refresh(self) -> None:
+        """
+        Oublie l'état chargé (caches JSON, graphe, index): les composants sont
+        relus depuis le disque au prochain accès, pour voir les écritures des
+        autres processus. Les modèles d'embedding déjà chargés sont conservés.
+        """
+        for name, component in (
+            ("episodic", self._episodic),
+            ("procedural", self._procedural),
+            ("knowledge", self._knowledge)
+        ):
+            if component is not None and component._model is not None:
+                self._models[name] = component._model
+        self._episodic = None
+        self._procedural = None
+        self._knowledge = None
+        self._consolidator = None
+
     # === API de fichiers mémoire (style Anthropic) ===
 
     def create_file(
@@ -421,10 +445,11 @@ class MemoryAPI:
 
     def consolidate(
         self,
-        dry_run: bool = False
+        dry_run: bool = False,
+        workers: int | None = None
     ) -> dict[str, Any]:
         """Lance une consolidation de la mémoire."""
-        result = self.consolidator.consolidate(dry_run=dry_run)
+        result = self.consolidator.consolidate(dry_run=dry_run, workers=workers)
 
         return {
             "status": "completed",
@@ -436,6 +461,11 @@ class MemoryAPI:
             "episodes_archived": result.episodes_archived
         }
 
+    def apply_retention(self, days: int = 30) -> dict[str, Any]:
+        """Archive les épisodes consolidés plus anciens que `days` jours."""
+        archived = self.consolidator.archive_old(days_old=days)
+        return {"status": "completed", "days": days, "episodes_archived": archived}
+
     def analyze_patterns(self) -> dict[str, Any]:
         """Analyse les patterns pour la consolidation."""
         return self.consolidator.analyze_patterns()
@@ -570,6 +600,7 @@ if __name__ == "__main__":
     # consolidate
     cons_p = subparsers.add_parser("consolidate", help="Consolider la mémoire")
     cons_p.add_argument("--dry-run", action="store_true")
+    cons_p.add_argument("--workers", type=int, default=None)
 
     # stats
     subparsers.add_parser("stats", help="Statistiques")
@@ -608,7 +639,7 @@ if __name__ == "__main__":
             files_p.print_help()
 
     elif args.command == "consolidate":
-        result = api.consolidate(dry_run=args.dry_run)
+        result = api.consolidate(dry_run=args.dry_run, workers=args.workers)
         print(json.dumps(result, indent=2))
 
     elif args.command == "stats":
@@ -3,11 +3,24 @@
 Aura Memory Consolidator - Agent de consolidation mémoire.
 Analyse les épisodes, extrait des patterns, génère des skills, et enrichit le graphe.
 Inspiré de Nemori et du pattern de consolidation Episodic → Semantic/Procedural.
+
+La consolidation est incrémentale: un watermark (timestamp, id) du dernier épisode
+traité est persisté avec un checkpoint, de sorte que seuls les nouveaux épisodes
+sont lus et qu'une exécution interrompue reprend là où elle s'était arrêtée.
+
+Le calcul textuel (composants des skills, triplets à extraire) peut être réparti
+sur un pool de processus; les écritures restent sérielles et appliquées dans
+l'ordre des épisodes, le résultat est donc identique au mode série.
 """
 
 import json
+import math
+import os
 import sys
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -20,6 +33,37 @@ from memory_types import (
 from episodic_memory import EpisodicMemory
 from procedural_memory import ProceduralMemory
 from knowledge_graph import KnowledgeGraph
+from text_patterns import plan_episode_knowledge, plan_skill
+
+try:
+    import numpy as np
+    from episode_clustering import cluster_embeddings, normalize_rows
+    CLUSTERING_AVAILABLE = True
+except ImportError:
+    CLUSTERING_AVAILABLE = False
+
+# En dessous, le calcul textuel reste en série: ~1 ms par épisode, et l'envoi au
+# pool (sérialisation + aller-retour) coûte plus qu'il ne rapporte sur de petits lots
+PARALLEL_MIN_PAYLOADS = 64
+
+# Pool de processus partagé par les consolidations du processus (démarrage ~20 ms)
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor | None:
+    """Pool de `workers` processus, réutilisé d'une consolidation à l'autre (None en série)."""
+    global _pool, _pool_workers
+    if workers <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
 
 
 class MemoryConsolidator:
@@ -43,24 +87,69 @@ class MemoryConsolidator:
         self.logs_dir = Path.home() / ".aura" / "memory" / "consolidation_logs"
         self.logs_dir.mkdir(parents=True, exist_ok=True)
 
+        # Watermark + checkpoint, propres au stockage épisodique consolidé
+        self.state_file = self.episodic.storage_path / "consolidation_state.json"
+
+    # Nombre d'épisodes entre deux checkpoints pendant l'extraction de connaissances
+    CHECKPOINT_EVERY = 25
+
+    def _load_state(self) -> dict[str, Any]:
+        """Charge le watermark et le checkpoint de consolidation."""
+        if self.state_file.exists():
+            try:
+                return json.loads(self.state_file.read_text())
+            except Exception:
+                pass
+        return {
+            "watermark": None,          # Dernier épisode entièrement traité
+            "skills_watermark": None,   # Dernier épisode passé par la phase skills
+            "pending_groups": {},       # pattern_key -> épisodes en attente d'occurrences
+            "archive_queue": None       # (timestamp, id) consolidés, triés, à archiver
+        }
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        """Persiste l'état de façon atomique (checkpoint)."""
+        tmp_file = self.state_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(state, indent=2))
+        tmp_file.replace(self.state_file)
+
+    @staticmethod
+    def _episode_key(episode: Episode) -> tuple[str, str]:
+        """Clé d'ordre total des épisodes (timestamp, id)."""
+        return (episode.timestamp, episode.id)
+
+    def reset_watermark(self) -> None:
+        """Oublie le watermark: la prochaine consolidation relit tous les épisodes."""
+        if self.state_file.exists():
+            self.state_file.unlink()
+
     def consolidate(
         self,
         min_episodes: int = None,
         min_valence: float = 0.3,
-        dry_run: bool = False
+        dry_run: bool = False,
+        batch_size: int = 100,
+        workers: int | None = None
     ) -> ConsolidationResult:
         """
-        Lance une consolidation complète.
+        Lance une consolidation incrémentale.
+
+        Seuls les épisodes postérieurs au watermark sont traités, par lots de
+        `batch_size`. L'état est checkpointé après chaque phase, une exécution
+        interrompue reprend donc au dernier checkpoint.
 
         Args:
-            min_episodes: Nombre minimum d'épisodes pour consolider (défaut: config)
+            min_episodes: Nombre minimum de nouveaux épisodes pour consolider (défaut: config)
             min_valence: Valence minimum pour considérer un épisode réussi
-            dry_run: Simuler sans appliquer les changements
+            dry_run: Simuler sans appliquer les changements (l'état n'est pas modifié)
+            batch_size: Nombre d'épisodes lus par lot
+            workers: Processus pour le calcul textuel (défaut: config, 1 = série)
 
         Returns:
             Résultat de la consolidation
         """
         min_episodes = min_episodes or MEMORY_CONFIG["consolidation_threshold"]
+        workers = max(1, workers or MEMORY_CONFIG["consolidation_workers"])
 
         result = ConsolidationResult(
             episodes_processed=0,
@@ -69,36 +158,113 @@ class MemoryConsolidator:
             triples_extracted=0,
             episodes_archived=0
         )
+        timings: dict[str, float] = defaultdict(float)
 
-        # 1. Récupérer les épisodes réussis non consolidés
-        successful_episodes = self.episodic.get_successful_episodes(
-            min_valence=min_valence,
-            limit=100
+        state = self._load_state()
+        watermark = tuple(state["watermark"]) if state["watermark"] else None
+        skills_watermark = state.get("skills_watermark")
+        resuming = bool(skills_watermark) and (
+            watermark is None or tuple(skills_watermark) > watermark
         )
 
-        if len(successful_episodes) < min_episodes:
-            result.details["message"] = f"Pas assez d'épisodes ({len(successful_episodes)} < {min_episodes})"
+        # 1. Récupérer les épisodes réussis postérieurs au watermark
+        start = time.perf_counter()
+        batch = self.episodic.get_episodes_after(watermark, min_valence, batch_size)
+        timings["fetch"] += time.perf_counter() - start
+
+        if not resuming and len(batch) < min_episodes:
+            result.details["message"] = (
+                f"Pas assez de nouveaux épisodes ({len(batch)} < {min_episodes})"
+            )
             return result
 
-        result.episodes_processed = len(successful_episodes)
+        result.details["resumed"] = resuming
+        result.details["pattern_groups"] = 0
+        result.details["workers"] = workers
+
+        while batch:
+            self._consolidate_batch(batch, state, result, timings, dry_run, workers)
+            if len(batch) < batch_size:
+                break
+
+            start = time.perf_counter()
+            batch = self.episodic.get_episodes_after(
+                tuple(state["watermark"]), min_valence, batch_size
+            )
+            timings["fetch"] += time.perf_counter() - start
+
+        # 5. Archiver les vieux épisodes consolidés
+        if not dry_run:
+            start = time.perf_counter()
+            result.episodes_archived = self._archive_old_consolidated(state)
+            timings["archive"] += time.perf_counter() - start
+            self._save_state(state)
+
+        result.details["watermark"] = state["watermark"]
+        result.details["timings_ms"] = {
+            phase: round(seconds * 1000, 2) for phase, seconds in timings.items()
+        }
+
+        # Log du résultat
+        self._log_consolidation(result)
 
-        # 2. Grouper par patterns similaires
-        pattern_groups = self._group_by_pattern(successful_episodes)
-        result.details["pattern_groups"] = len(pattern_groups)
+        return result
 
-        # 3. Pour chaque groupe avec assez d'occurrences, créer ou mettre à jour un skill
+    def _consolidate_batch(
+        self,
+        batch: list[Episode],
+        state: dict[str, Any],
+        result: ConsolidationResult,
+        timings: dict[str, float],
+        dry_run: bool,
+        workers: int = 1
+    ) -> None:
+        """Consolide un lot d'épisodes en skills puis en connaissances."""
+        # 2-3. Grouper les nouveaux épisodes et créer/mettre à jour les skills
+        start = time.perf_counter()
+        skills_watermark = state.get("skills_watermark")
+        skills_watermark = tuple(skills_watermark) if skills_watermark else None
+        new_episodes = [
+            ep for ep in batch
+            if skills_watermark is None or self._episode_key(ep) > skills_watermark
+        ]
+
+        pattern_groups = self._group_by_pattern(new_episodes)
+        result.details["pattern_groups"] += len(pattern_groups)
+
+        pending_groups = state["pending_groups"]
+        ready_groups: list[tuple[str, list[Episode]]] = []
         for pattern_key, episodes in pattern_groups.items():
+            # Les épisodes des lots précédents en attente d'occurrences rejoignent le groupe
+            new_ids = {ep.id for ep in episodes}
+            previous = [
+                ep for ep in self.episodic.get_episodes(pending_groups.get(pattern_key, []))
+                if ep.metadata.status == MemoryStatus.ACTIVE.name and ep.id not in new_ids
+            ]
+            episodes = previous + episodes
+
             if len(episodes) < MEMORY_CONFIG["min_skill_occurrences"]:
+                pending_groups[pattern_key] = [ep.id for ep in episodes]
                 continue
+            ready_groups.append((pattern_key, episodes))
+
+        # Calcul textuel réparti, application sérielle dans l'ordre des groupes
+        plans = self._map(
+            plan_skill,
+            [([ep.action for ep in eps], [ep.context for ep in eps]) for _, eps in ready_groups],
+            workers
+        )
 
+        for (pattern_key, episodes), plan in zip(ready_groups, plans):
             skill_result = self._consolidate_pattern_to_skill(
-                pattern_key, episodes, dry_run
+                pattern_key, episodes, dry_run, plan
             )
 
             if skill_result["created"]:
                 result.skills_created += 1
             elif skill_result["updated"]:
                 result.skills_updated += 1
+            pending_groups.pop(pattern_key, None)
 
             # Marquer les épisodes comme consolidés
             if not dry_run and skill_result.get("skill_id"):
@@ -106,35 +272,135 @@ class MemoryConsolidator:
                     [ep.id for ep in episodes],
                     skill_result["skill_id"]
                 )
+                self._enqueue_for_archive(state, episodes)
 
-        # 4. Extraire des triplets de connaissances depuis les épisodes
-        for episode in successful_episodes:
-            triples_created = self._extract_knowledge_from_episode(episode, dry_run)
-            result.triples_extracted += triples_created
-
-        # 5. Archiver les vieux épisodes consolidés
+        state["skills_watermark"] = list(self._episode_key(batch[-1]))
         if not dry_run:
-            archived = self._archive_old_consolidated()
-            result.episodes_archived = archived
+            self._save_state(state)
+        timings["skills"] += time.perf_counter() - start
 
-        # Log du résultat
-        self._log_consolidation(result)
+        # 4. Extraire des triplets de connaissances (idempotent: add_triple déduplique)
+        start = time.perf_counter()
+        if dry_run:
+            knowledge_plans = [[] for _ in batch]
+        else:
+            knowledge_plans = self._map(
+                plan_episode_knowledge,
+                [self._knowledge_payload(ep) for ep in batch],
+                workers
+            )
 
-        return result
+        for i, (episode, plan) in enumerate(zip(batch, knowledge_plans), 1):
+            triples_created = self._extract_knowledge_from_episode(episode, dry_run, plan)
+            result.triples_extracted += triples_created
+            state["watermark"] = list(self._episode_key(episode))
+            if not dry_run and i % self.CHECKPOINT_EVERY == 0:
+                self._save_state(state)
+
+        if not dry_run:
+            self._save_state(state)
+        result.episodes_processed += len(batch)
+        timings["knowledge"] += time.perf_counter() - start
+
+    @staticmethod
+    def _map(func: Any, payloads: list, workers: int) -> list:
+        """Applique une fonction pure, en série ou sur le pool partagé (ordre préservé)."""
+        pool = _get_pool(workers) if len(payloads) >= PARALLEL_MIN_PAYLOADS else None
+        if pool is None:
+            return [func(payload) for payload in payloads]
+        chunksize = max(1, len(payloads) // (4 * (os.cpu_count() or 1)))
+        return list(pool.map(func, payloads, chunksize=chunksize))
+
+    def _enqueue_for_archive(self, state: dict[str, Any], episodes: list[Episode]) -> None:
+        """Ajoute des épisodes consolidés à la file d'archivage triée."""
+        if state["archive_queue"] is None:
+            # Première exécution: amorcer depuis les épisodes déjà consolidés
+            state["archive_queue"] = [list(k) for k in self.episodic.get_consolidated_keys()]
+        state["archive_queue"].extend(list(self._episode_key(ep)) for ep in episodes)
+        state["archive_queue"].sort()
 
     def _group_by_pattern(self, episodes: list[Episode]) -> dict[str, list[Episode]]:
         """
         Groupe les épisodes par patterns d'action similaires.
-        Utilise une heuristique simple basée sur les premiers mots de l'action.
+        Clustering sur les embeddings stockés si disponible, sinon heuristique par mots.
         """
+        if (
+            CLUSTERING_AVAILABLE
+            and MEMORY_CONFIG["cluster_episodes"]
+            and len(episodes) >= MEMORY_CONFIG["min_skill_occurrences"]
+        ):
+            return self._group_by_embedding(episodes)
+
         groups = defaultdict(list)
+        for episode in episodes:
+            groups[self._pattern_key(episode)].append(episode)
+
+        return dict(groups)
+
+    @staticmethod
+    def _pattern_key(episode: Episode) -> str:
+        """Pattern simplifié: les premiers mots de l'action."""
+        action_words = episode.action.lower().split()[:3]
+        return "_".join(action_words) if action_words else "unknown"
+
+    def _group_by_embedding(self, episodes: list[Episode]) -> dict[str, list[Episode]]:
+        """
+        Groupe les épisodes par clustering de leurs embeddings.
 
+        Chaque cluster prend le pattern_key majoritaire de ses membres (noms de
+        skills stables). Les épisodes sans embedding ou hors cluster retombent
+        sur l'heuristique par mots. Un groupe qui réunit plusieurs sources est
+        trié par similarité au médoïde de son plus grand cluster: ce médoïde
+        reste en tête, les épisodes sans embedding en fin.
+        """
+        stored = self.episodic.get_embeddings([ep.id for ep in episodes])
+        embedded = [ep for ep in episodes if ep.id in stored]
+
+        groups = defaultdict(list)
         for episode in episodes:
-            # Extraire un pattern simplifié
-            action_words = episode.action.lower().split()[:3]
-            pattern_key = "_".join(action_words) if action_words else "unknown"
+            if episode.id not in stored:
+                groups[self._pattern_key(episode)].append(episode)
+
+        if not embedded:
+            return dict(groups)
+
+        vectors = normalize_rows(np.array([stored[ep.id] for ep in embedded]))
+        clustering = cluster_embeddings(
+            vectors,
+            target_size=MEMORY_CONFIG["cluster_target_size"],
+            min_similarity=MEMORY_CONFIG["cluster_min_similarity"]
+        )
 
-            groups[pattern_key].append(episode)
+        members_by_cluster = defaultdict(list)
+        for index, label in enumerate(clustering.labels.tolist()):
+            if label < 0:
+                groups[self._pattern_key(embedded[index])].append(embedded[index])
+            else:
+                members_by_cluster[label].append(index)
+
+        anchors: dict[str, tuple[int, int]] = {}  # pattern_key -> (taille, médoïde) du plus grand cluster
+        for label in sorted(members_by_cluster):
+            members = members_by_cluster[label]
+            medoid = clustering.medoids[label]
+            ordered = [medoid] + [i for i in members if i != medoid]
+
+            key_counts = defaultdict(int)
+            for i in members:
+                key_counts[self._pattern_key(embedded[i])] += 1
+            pattern_key = min(key_counts, key=lambda k: (-key_counts[k], k))
+
+            groups[pattern_key].extend(embedded[i] for i in ordered)
+            if len(members) > anchors.get(pattern_key, (0, -1))[0]:
+                anchors[pattern_key] = (len(members), medoid)
+
+        # Groupes fusionnés (clusters ou heuristique sous la même clé): médoïde d'abord
+        position = {ep.id: i for i, ep in enumerate(embedded)}
+        for pattern_key, (_, medoid) in anchors.items():
+            similarity = vectors @ vectors[medoid]
+            groups[pattern_key].sort(key=lambda ep: (
+                position.get(ep.id) != medoid,
+                -similarity[position[ep.id]] if ep.id in position else math.inf
+            ))
 
         return dict(groups)
 
@@ -142,10 +408,12 @@ class MemoryConsolidator:
         self,
         pattern_key: str,
         episodes: list[Episode],
-        dry_run: bool
+        dry_run: bool,
+        plan: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """
         Consolide un groupe d'épisodes en skill.
+        `plan` contient les composants précalculés par plan_skill (workers).
         """
         result = {"created": False, "updated": False, "skill_id": None}
 
@@ -153,23 +421,16 @@ class MemoryConsolidator:
         avg_valence = sum(ep.emotional_valence for ep in episodes) / len(episodes)
         avg_importance = sum(ep.importance for ep in episodes) / len(episodes)
 
-        # Extraire le pattern commun
-        contexts = [ep.context for ep in episodes]
-        actions = [ep.action for ep in episodes]
-        outcomes = [ep.outcome for ep in episodes]
-
         # Générer les composants du skill
         skill_name = f"skill_{pattern_key}"
         description = f"Pattern appris depuis {len(episodes)} épisodes réussis"
 
-        # Pattern = action commune généralisée
-        common_action = self._find_common_pattern(actions)
-
-        # Conditions = contextes communs
-        trigger_conditions = self._extract_trigger_conditions(contexts)
-
-        # Template d'action = action avec placeholders
-        action_template = self._generalize_action(common_action)
+        # Pattern = action commune, conditions = contextes communs, template = placeholders
+        if plan is None:
+            plan = plan_skill(([ep.action for ep in episodes], [ep.context for ep in episodes]))
+        common_action = plan["pattern"]
+        trigger_conditions = plan["trigger_conditions"]
+        action_template = plan["action_template"]
 
         # Vérifier si un skill similaire existe
         existing_skill = self.procedural.get_skill_by_name(skill_name)
@@ -212,107 +473,71 @@ class MemoryConsolidator:
 
         return result
 
-    def _find_common_pattern(self, texts: list[str]) -> str:
-        """Trouve le pattern commun dans une liste de textes."""
-        if not texts:
-            return ""
-
-        # Tokenizer simple
-        word_sets = [set(t.lower().split()) for t in texts]
-
-        # Intersection des mots
-        common_words = word_sets[0]
-        for ws in word_sets[1:]:
-            common_words &= ws
-
-        # Prendre le premier texte et garder seulement les mots communs
-        first_words = texts[0].split()
-        pattern = " ".join(w for w in first_words if w.lower() in common_words)
-
-        return pattern if pattern else texts[0][:100]
-
-    def _extract_trigger_conditions(self, contexts: list[str]) -> list[str]:
-        """Extrait les conditions déclencheuses depuis les contextes."""
-        # Mots-clés fréquents dans les contextes
-        word_freq = defaultdict(int)
-        for ctx in contexts:
-            for word in ctx.lower().split():
-                if len(word) > 3:  # Ignorer les petits mots
-                    word_freq[word] += 1
-
-        # Garder les mots présents dans au moins la moitié des contextes
-        threshold = len(contexts) / 2
-        common_keywords = [w for w, c in word_freq.items() if c >= threshold]
-
-        return common_keywords[:5]  # Max 5 conditions
-
-    def _generalize_action(self, action: str) -> str:
-        """Généralise une action en template avec placeholders."""
-        # Remplacer les valeurs spécifiques par des placeholders
-        import re
-
-        template = action
-
-        # Remplacer les chemins
-        template = re.sub(r'/[\w/.-]+', '{{PATH}}', template)
-
-        # Remplacer les nombres
-        template = re.sub(r'\b\d+\b', '{{NUMBER}}', template)
-
-        # Remplacer les chaînes entre guillemets
-        template = re.sub(r'"[^"]*"', '{{STRING}}', template)
-        template = re.sub(r"'[^']*'", '{{STRING}}', template)
-
-        return template
+    @staticmethod
+    def _knowledge_payload(episode: Episode) -> tuple[str, str, list[str]]:
+        """Entrée picklable de plan_episode_knowledge pour un épisode."""
+        # Combiner contexte et action pour l'extraction
+        text = f"{episode.context}. {episode.action}. {episode.outcome}"
+        return (episode.id[:8], text, list(episode.entities or []))
 
     def _extract_knowledge_from_episode(
         self,
         episode: Episode,
-        dry_run: bool
+        dry_run: bool,
+        plan: list[tuple[str, str, str, float]] | None = None
     ) -> int:
-        """Extrait des triplets de connaissance depuis un épisode."""
+        """
+        Extrait des triplets de connaissance depuis un épisode.
+        `plan` contient les triplets précalculés par plan_episode_knowledge (workers).
+        """
         if dry_run:
             return 0
 
-        created_count = 0
-
-        # Combiner contexte et action pour l'extraction
-        text = f"{episode.context}. {episode.action}. {episode.outcome}"
+        if plan is None:
+            plan = plan_episode_knowledge(self._knowledge_payload(episode))
+
+        # Triplets extraits du texte puis entités mentionnées
+        for subject, predicate, obj, confidence in plan:
+            self.knowledge.add_triple(
+                subject=subject,
+                predicate=predicate,
+                obj=obj,
+                confidence=confidence,
+                source_episode=episode.id
+            )
 
-        # Utiliser l'extraction automatique du graphe
-        created_ids = self.knowledge.extract_triples_from_text(
-            text,
-            source_episode=episode.id
-        )
-        created_count = len(created_ids)
-
-        # Ajouter des triplets explicites pour les entités mentionnées
-        if episode.entities:
-            for entity in episode.entities:
-                self.knowledge.add_triple(
-                    subject=entity,
-                    predicate="mentioned_in",
-                    obj=f"episode_{episode.id[:8]}",
-                    confidence=0.9,
-                    source_episode=episode.id
-                )
-                created_count += 1
+        return len(plan)
 
-        return created_count
+    def archive_old(self, days_old: int = 30) -> int:
+        """Rétention: archive les épisodes consolidés plus anciens que X jours."""
+        state = self._load_state()
+        archived = self._archive_old_consolidated(state, days_old)
+        self._save_state(state)
+        return archived
 
-    def _archive_old_consolidated(self, days_old: int = 30) -> int:
-        """Archive les épisodes consolidés plus anciens que X jours."""
+    def _archive_old_consolidated(self, state: dict[str, Any], days_old: int = 30) -> int:
+        """
+        Archive les épisodes consolidés plus anciens que X jours.
+        Dépile la file triée au lieu de rescanner les épisodes.
+        """
         from datetime import timedelta
 
         cutoff = datetime.now() - timedelta(days=days_old)
         cutoff_iso = cutoff.isoformat()
 
+        if state["archive_queue"] is None:
+            state["archive_queue"] = [list(k) for k in self.episodic.get_consolidated_keys()]
+        queue = state["archive_queue"]
+
+        due = 0
+        while due < len(queue) and queue[due][0] < cutoff_iso:
+            due += 1
+
         archived = 0
-        for episode in self.episodic.get_recent_episodes(limit=1000):
-            if episode.metadata.status == MemoryStatus.CONSOLIDATED.name:
-                if episode.timestamp < cutoff_iso:
-                    if self.episodic.archive_episode(episode.id):
-                        archived += 1
+        for _, episode_id in queue[:due]:
+            if self.episodic.archive_episode(episode_id):
+                archived += 1
+        del queue[:due]
 
         return archived
 
@@ -400,6 +625,9 @@ if __name__ == "__main__":
     cons_p.add_argument("--min-episodes", type=int, default=None)
     cons_p.add_argument("--min-valence", type=float, default=0.3)
     cons_p.add_argument("--dry-run", action="store_true")
+    cons_p.add_argument("--batch-size", type=int, default=100)
+    cons_p.add_argument("--workers", type=int, default=None, help="Processus workers (1 = série)")
+    cons_p.add_argument("--reset", action="store_true", help="Oublier le watermark avant de consolider")
 
     # analyze
     analyze_p = subparsers.add_parser("analyze", help="Analyser les patterns")
@@ -422,10 +650,14 @@ if __name__ == "__main__":
 
     if args.command == "consolidate":
         print("Lancement de la consolidation...")
+        if args.reset:
+            consolidator.reset_watermark()
         result = consolidator.consolidate(
             min_episodes=args.min_episodes,
             min_valence=args.min_valence,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            batch_size=args.batch_size,
+            workers=args.workers
         )
 
         print("\n=== Résultat de la consolidation ===")
@@ -469,6 +701,9 @@ if __name__ == "__main__":
                 print(f"  Épisodes: {entry['episodes_processed']}")
                 print(f"  Skills: +{entry['skills_created']} / ↻{entry['skills_updated']}")
                 print(f"  Triplets: +{entry['triples_extracted']}")
+                timings = entry.get("details", {}).get("timings_ms")
+                if timings:
+                    print(f"  Timings (ms): {timings}")
                 print()
 
     elif args.command == "stats":
@@ -91,6 +91,8 @@ class Episode:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> 'Episode':
+        # Copie filtrée: ne pas muter le cache et ignorer les clés annexes (consolidated_into)
+        data = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
         if 'metadata' in data and isinstance(data['metadata'], dict):
             data['metadata'] = MemoryMetadata.from_dict(data['metadata'])
         return cls(**data)
@@ -128,6 +130,7 @@ class Skill:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> 'Skill':
+        data = dict(data)
         if 'metadata' in data and isinstance(data['metadata'], dict):
             data['metadata'] = MemoryMetadata.from_dict(data['metadata'])
         return cls(**data)
@@ -166,6 +169,7 @@ class KnowledgeTriple:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> 'KnowledgeTriple':
+        data = dict(data)
         if 'metadata' in data and isinstance(data['metadata'], dict):
             data['metadata'] = MemoryMetadata.from_dict(data['metadata'])
         return cls(**data)
@@ -226,7 +230,11 @@ MEMORY_CONFIG = {
     "max_latency_ms": 100,
     "recency_decay_days": 30,  # Demi-vie de la récence
     "consolidation_threshold": 10,  # Nb d'épisodes avant consolidation
+    "consolidation_workers": 1,  # Processus pour le calcul textuel (1 = série)
     "min_skill_occurrences": 3,  # Nb minimum pour créer un skill
+    "cluster_episodes": True,  # Grouper les épisodes par embeddings (sinon par mots)
+    "cluster_target_size": 8,  # Taille moyenne visée par cluster
+    "cluster_min_similarity": 0.75,  # Cohésion cosinus minimale dans un cluster
     "collections": {
         "episodes": "Mémoire épisodique - interactions complètes",
         "skills": "Mémoire procédurale - patterns appris",
@@ -0,0 +1,389 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests du superviseur d'agents (agents de test écrits dans un répertoire temporaire).
+Vérifie l'exécution asyncio, l'annulation, le streaming des sorties, la
+spéculation, le cache de résultats et le journal des checkpoints.
+"""
+
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@contextmanager
+def _supervisor(tmpdir: str, agents: dict[str, str], **kwargs):
+    """
+    Superviseur isolé: agents, journal, sorties et statistiques dans tmpdir.
+
+    Args:
+        tmpdir: Répertoire temporaire
+        agents: nom -> code Python de l'agent
+    """
+    import agent_supervisor
+    import intent_router
+    from agent_supervisor import AgentSupervisor, CheckpointJournal
+    from result_cache import AgentResultCache
+
+    tmp = Path(tmpdir)
+    for name, code in agents.items():
+        (tmp / f"{name}.py").write_text(textwrap.dedent(code))
+
+    names = ("AGENTS_DIR", "SPILL_DIR", "SPECULATION_STATS_FILE", "CHECKPOINTS_DIR")
+    saved = {name: getattr(agent_supervisor, name) for name in names}
+    agent_supervisor.AGENTS_DIR = tmp
+    agent_supervisor.SPILL_DIR = tmp / "spill"
+    agent_supervisor.SPECULATION_STATS_FILE = tmp / "speculation_stats.json"
+    agent_supervisor.CHECKPOINTS_DIR = tmp
+
+    numpy_available = intent_router.NUMPY_AVAILABLE
+    intent_router.NUMPY_AVAILABLE = False  # Routeur par keywords: pas de modèle à charger
+    try:
+        supervisor = AgentSupervisor(**kwargs)
+    finally:
+        intent_router.NUMPY_AVAILABLE = numpy_available
+    supervisor.journal.close()
+    supervisor.journal = CheckpointJournal(tmp / "journal.db")
+    supervisor.result_cache = AgentResultCache("supervisor", ttls={}, cache_dir=tmp / "cache")
+    try:
+        yield supervisor
+    finally:
+        supervisor.shutdown()
+        supervisor.journal.close()
+        for name, value in saved.items():
+            setattr(agent_supervisor, name, value)
+
+
+def _sleeper(seconds: float, marker: str = "") -> str:
+    """Code d'un agent qui note son pid puis dort."""
+    return f"""
+        import os, sys, time
+        from pathlib import Path
+        if {marker!r}:
+            Path({marker!r}).write_text(str(os.getpid()))
+        time.sleep({seconds})
+        print("status: ok")
+    """
+
+
+def _pid_alive(pid: int) -> bool:
+    import os
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_async_execution():
+    """Test: exécution parallèle bornée, créneau par agent pris avant le créneau global."""
+    print("Test: supervisor async...")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        stamp = Path(tmpdir) / "fast.time"
+        agents = {
+            "slow": _sleeper(0.6),
+            "fast": f"import time; open({str(stamp)!r}, 'w').write(str(time.time()))",
+            "fail": "import sys; sys.exit(3)"
+        }
+        with _supervisor(tmpdir, agents, max_workers=2, per_agent_limit=1) as supervisor:
+            start = time.time()
+            task = supervisor.supervise("test", agents=["slow", "slow", "fast"], parallel=True)
+            elapsed = time.time() - start
+            assert task.state.name == "COMPLETED"
+            assert [r.agent for r in task.results] == ["slow", "slow", "fast"]
+            assert all(r.success for r in task.results)
+            # Deux "slow" en série (limite par agent); le second attend sans bloquer
+            # de créneau global, "fast" tourne donc pendant le premier
+            assert 1.2 <= elapsed < 1.8, elapsed
+            assert float(stamp.read_text()) - start < 0.6
+            print(f"  Parallèle: {elapsed:.2f}s pour 2 x slow (limite 1) + fast")
+
+            task = supervisor.supervise("test", agents=["fail", "fast"])
+            assert task.state.name == "FAILED"
+            assert [r.return_code for r in task.results] == [3]
+
+    print("  OK!")
+
+
+def test_cancellation():
+    """Test: l'annulation tue le processus et n'enchaîne pas l'agent suivant."""
+    print("Test: supervisor cancel...")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = str(Path(tmpdir) / "first.pid")
+        second = str(Path(tmpdir) / "second.pid")
+        agents = {"first": _sleeper(30, first), "second": _sleeper(0, second)}
+        with _supervisor(tmpdir, agents) as supervisor:
+            tasks = []
+            thread = threading.Thread(
+                target=lambda: tasks.append(supervisor.supervise("test", agents=["first", "second"]))
+            )
+            thread.start()
+            deadline = time.time() + 10
+            while not Path(first).exists() and time.time() < deadline:
+                time.sleep(0.05)
+            time.sleep(0.1)
+            pid = int(Path(first).read_text())
+
+            task_id = next(iter(supervisor.active_tasks))
+            assert supervisor.cancel_task(task_id)
+            thread.join(timeout=10)
+            assert not thread.is_alive()
+
+            task = tasks[0]
+            assert task.state.name == "CANCELLED"
+            assert task.aggregated_result == "Tâche annulée"
+            assert not Path(second).exists()
+            deadline = time.time() + 5
+            while _pid_alive(pid) and time.time() < deadline:
+                time.sleep(0.05)
+            assert not _pid_alive(pid)
+            print(f"  Agent {pid} tué, second agent non lancé")
+
+    print("  OK!")
+
+
+def test_streaming():
+    """Test: constats reçus pendant l'exécution, résultat partiel, débordement disque."""
+    print("Test: supervisor streaming...")
+
+    import agent_supervisor
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        agents = {
+            "talker": """
+                import time
+                print("status: démarrage", flush=True)
+                time.sleep(0.8)
+                print("warning: fin")
+            """,
+            "verbose": "for i in range(200): print(f'ligne {i:03d} ' + 'x' * 50)"
+        }
+        with _supervisor(tmpdir, agents) as supervisor:
+            findings = []
+            partials = []
+
+            def on_finding(agent, line):
+                findings.append((time.time(), agent, line))
+                if len(findings) == 1:
+                    task_id = next(iter(supervisor.active_tasks))
+                    threading.Timer(0.2, lambda: partials.append(supervisor.get_partial_result(task_id))).start()
+
+            task = supervisor.supervise("test", agents=["talker"], on_finding=on_finding)
+            end = time.time()
+            assert [line for _, _, line in findings] == ["status: démarrage", "warning: fin"]
+            assert end - findings[0][0] >= 0.5  # Reçu bien avant la fin de l'agent
+            assert "[talker] (en cours)" in partials[0] and "status: démarrage" in partials[0]
+            assert task.findings == [("talker", "status: démarrage"), ("talker", "warning: fin")]
+            print(f"  Premier constat {end - findings[0][0]:.2f}s avant la fin")
+
+            saved = agent_supervisor.SPILL_THRESHOLD, agent_supervisor.INLINE_OUTPUT_LIMIT
+            agent_supervisor.SPILL_THRESHOLD, agent_supervisor.INLINE_OUTPUT_LIMIT = 2000, 500
+            try:
+                task = supervisor.supervise("test", agents=["verbose"])
+            finally:
+                agent_supervisor.SPILL_THRESHOLD, agent_supervisor.INLINE_OUTPUT_LIMIT = saved
+            result = task.results[0]
+            full = Path(result.output_file).read_text()
+            assert full.splitlines()[-1].startswith("ligne 199")
+            assert len(full.splitlines()) == 200
+            assert result.output.startswith("ligne 000") and "tronqué" in result.output
+            assert len(result.output) < 1000
+            print(f"  Débordement: {len(full)} caractères sur disque, {len(result.output)} en mémoire")
+
+    print("  OK!")
+
+
+def test_speculation():
+    """Test: secondaires rapides lancés avec le principal, tués s'il échoue."""
+    print("Test: supervisor speculation...")
+
+    from intent_router import AgentCapability
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        marker = str(Path(tmpdir) / "doomed.pid")
+        agents = {
+            "primary": _sleeper(0.5),
+            "broken": "import time, sys; time.sleep(0.5); sys.exit(1)",
+            "quick": _sleeper(0.5),
+            "doomed": _sleeper(30, marker),
+            "slow": _sleeper(0)
+        }
+        with _supervisor(tmpdir, agents) as supervisor:
+            for name, duration in (("quick", "quick"), ("doomed", "quick"), ("slow", "long")):
+                supervisor.router.add_agent(AgentCapability(
+                    name=name, description=name, keywords=[], typical_duration=duration
+                ))
+
+            start = time.time()
+            task = supervisor.supervise("test", agents=["primary", "quick", "slow"], speculative=True)
+            elapsed = time.time() - start
+            assert task.state.name == "COMPLETED"
+            assert [r.agent for r in task.results] == ["primary", "quick", "slow"]
+            assert task.metadata["speculated"] == ["quick"]
+            assert elapsed < 0.95, elapsed  # "quick" a tourné pendant "primary"
+            assert task.metadata["speculation_saved_s"] > 0.3
+            print(f"  Succès: {elapsed:.2f}s, gain {task.metadata['speculation_saved_s']}s")
+
+            task = supervisor.supervise("test", agents=["broken", "doomed"], speculative=True)
+            assert task.state.name == "FAILED"
+            assert [r.agent for r in task.results] == ["broken"]
+            assert task.metadata["speculation_wasted_s"] > 0
+            pid = int(Path(marker).read_text())
+            deadline = time.time() + 5
+            while _pid_alive(pid) and time.time() < deadline:
+                time.sleep(0.05)
+            assert not _pid_alive(pid)
+
+            stats = supervisor.get_speculation_stats()
+            assert stats["runs"] == 2 and stats["wasted_runs"] == 1
+            assert stats["speculated_agents"] == 2 and stats["waste_rate"] == 0.5
+            print(f"  Échec du principal: spéculé tué, {stats['wasted_seconds']}s perdues")
+
+    print("  OK!")
+
+
+def test_result_cache():
+    """Test: résultats mémoïsés selon le TTL, appels identiques simultanés fusionnés."""
+    print("Test: supervisor result cache...")
+
+    from result_cache import AgentResultCache
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        runs = Path(tmpdir) / "runs.log"
+        counted = f"""
+            import sys, time
+            with open({str(runs)!r}, "a") as f:
+                f.write(" ".join(sys.argv[1:]) + "\\n")
+            time.sleep(0.3)
+            print("status: ok")
+            sys.exit(1 if "fail" in sys.argv else 0)
+        """
+        with _supervisor(tmpdir, {"counted": counted}) as supervisor:
+            ttls = {"counted": {"scan": 60, "*": 0}}
+            supervisor.result_cache = AgentResultCache("supervisor", ttls=ttls, cache_dir=Path(tmpdir) / "cache")
+            cache = supervisor.result_cache
+            assert cache.ttl_for("counted", ["scan"]) == 60
+            assert cache.ttl_for("counted", ["clean"]) == 0 and cache.ttl_for("other") == 0
+
+            async def run_twice(args):
+                import asyncio
+                return await asyncio.gather(
+                    supervisor._execute_agent_async("counted", args),
+                    supervisor._execute_agent_async("counted", args)
+                )
+
+            first, second = supervisor._submit(run_twice(["scan"])).result()
+            assert first == second and first.success and not first.cached
+            assert cache.stats["coalesced"] == 1
+            assert runs.read_text().splitlines() == ["scan"]
+
+            task = supervisor.supervise("test", agents=["counted"])
+            assert task.results[0].agent == "counted"
+            again = supervisor._execute_agent("counted", ["scan"])
+            assert again.cached and again.output == first.output
+            assert AgentResultCache("supervisor", ttls=ttls, cache_dir=Path(tmpdir) / "cache").get("counted", ["scan"])
+
+            # Sans TTL (ou en échec): toujours exécuté
+            supervisor._execute_agent("counted", ["clean"])
+            supervisor._execute_agent("counted", ["clean"])
+            supervisor._execute_agent("counted", ["scan", "fail"])
+            supervisor._execute_agent("counted", ["scan", "fail"])
+            assert runs.read_text().splitlines() == ["scan", "", "clean", "clean", "scan fail", "scan fail"]
+            print(f"  Stats: {cache.stats}")
+
+    print("  OK!")
+
+
+def test_checkpoint_journal():
+    """Test: journal append-only, dernier état par tâche, compaction, IDs uniques."""
+    print("Test: supervisor journal...")
+
+    import os
+    from agent_supervisor import CheckpointJournal
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal = CheckpointJournal(Path(tmpdir) / "journal.db", compact_every=1000)
+        for state in ("PENDING", "EXECUTING", "COMPLETED"):
+            journal.append({"id": "t1", "state": state})
+        journal.append({"id": "t2", "state": "EXECUTING"})
+        assert journal.latest("t1")["state"] == "COMPLETED"
+        assert [c["state"] for c in journal.history("t1")] == ["PENDING", "EXECUTING", "COMPLETED"]
+        assert [t["id"] for t in journal.tasks()] == ["t2", "t1"]
+        assert [t["id"] for t in journal.tasks(state="EXECUTING")] == ["t2"]  # État courant seulement
+
+        assert journal.compact() == 2
+        assert [c["state"] for c in journal.history("t1")] == ["COMPLETED"]
+        assert journal.compact(older_than=time.time() + 1) == 2
+        assert journal.tasks() == []
+        journal.close()
+
+        # Compaction automatique toutes les compact_every écritures
+        journal = CheckpointJournal(Path(tmpdir) / "auto.db", compact_every=5)
+        for i in range(5):
+            journal.append({"id": "t", "state": f"S{i}"})
+        assert len(journal.history("t")) == 1
+        journal.close()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with _supervisor(tmpdir, {"ok": _sleeper(0)}) as supervisor:
+            task = supervisor.supervise("test", agents=["ok"])
+            assert f"_{os.getpid()}_" in task.id
+            history = supervisor.journal.history(task.id)
+            assert [c["state"] for c in history] == ["ROUTING", "COMPLETED"]
+
+            del supervisor.active_tasks[task.id]
+            restored = supervisor.get_task(task.id)
+            assert restored.state.name == "COMPLETED" and restored.results[0].agent == "ok"
+            resumed = supervisor.resume_from_checkpoint(task.id)
+            assert resumed.id == task.id and resumed.state.name == "COMPLETED"
+
+            assert supervisor._generate_task_id() != supervisor._generate_task_id()
+            print(f"  Tâche {task.id}: {len(history)} checkpoints")
+
+    print("  OK!")
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests du superviseur d'agents")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_async_execution,
+        test_cancellation,
+        test_streaming,
+        test_speculation,
+        test_result_cache,
+        test_checkpoint_journal
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
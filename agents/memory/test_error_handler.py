@@ -0,0 +1,299 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests du gestionnaire d'erreurs (error_handler).
+Vérifie les magasins d'états des circuits, les retries asyncio, le hedging
+et l'index des logs d'erreurs.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@contextmanager
+def _handler(tmpdir: str, agents: dict[str, str] | None = None):
+    """Gestionnaire dont agents (nom -> code), logs, latences et caches sont dans tmpdir."""
+    import error_handler
+    from error_handler import CircuitStateStore, ErrorHandler, LatencyTracker
+    from result_cache import AgentResultCache
+
+    for name, code in (agents or {}).items():
+        (Path(tmpdir) / f"{name}.py").write_text(code)
+
+    saved = (error_handler.AGENTS_DIR, error_handler.ERROR_LOG_DIR)
+    error_handler.AGENTS_DIR = Path(tmpdir)
+    error_handler.ERROR_LOG_DIR = Path(tmpdir) / "error_logs"
+    error_handler.ERROR_LOG_DIR.mkdir()
+    try:
+        handler = ErrorHandler()
+        handler.circuit_store = CircuitStateStore(Path(tmpdir) / "circuits.json")
+        handler.latency = LatencyTracker(Path(tmpdir) / "latency.json")
+        handler.result_cache = AgentResultCache("test", ttls={}, cache_dir=Path(tmpdir) / "cache")
+        yield handler
+    finally:
+        error_handler.AGENTS_DIR, error_handler.ERROR_LOG_DIR = saved
+
+
+AGENT = """
+import os, sys, time
+with open(os.path.join(os.path.dirname(__file__), "pids.txt"), "a") as f:
+    f.write(f"{os.getpid()}\\n")
+mode = sys.argv[1] if len(sys.argv) > 1 else "ok"
+if mode == "slow":
+    time.sleep(float(sys.argv[2]))
+elif mode == "fail":
+    print("boom", file=sys.stderr)
+    sys.exit(1)
+print(os.path.basename(__file__), mode)
+"""
+
+BACKUP = """
+import os
+with open(os.path.join(os.path.dirname(__file__), "pids.txt"), "a") as f:
+    f.write(f"{os.getpid()}\\n")
+print("backup")
+"""
+
+
+def _alive(pid: int) -> bool:
+    import os
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+
+
+def test_circuit_stores():
+    """Test: fusion des écritures JSON différées, état SQLite partagé, transitions du circuit."""
+    print("Test: error_handler circuits...")
+
+    from error_handler import (
+        CircuitBreakerConfig, CircuitState, CircuitStateStore, ErrorHandler, SqliteCircuitStore
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "circuits.json"
+
+        # Deux processus: chacun n'écrit que ses agents modifiés
+        first = CircuitStateStore(path, flush_delay=100)
+        second = CircuitStateStore(path, flush_delay=100)
+        with first.transaction("alpha") as state:
+            state.failure_count = 3
+        with second.transaction("beta") as state:
+            state.state = CircuitState.OPEN
+        assert not path.exists()  # Écriture différée
+        first.flush()
+        second.flush()
+        data = json.loads(path.read_text())
+        assert data["alpha"]["failure_count"] == 3 and data["beta"]["state"] == "OPEN"
+        assert sorted(CircuitStateStore(path).all()) == ["alpha", "beta"]
+
+        # Transaction sans effet: rien à écrire
+        with first.transaction("alpha"):
+            pass
+        path.unlink()
+        first.flush()
+        assert not path.exists()
+
+        assert second.reset("beta") and not second.reset("gamma")
+        assert json.loads(path.read_text())["beta"]["state"] == "CLOSED"
+        assert not list(Path(tmpdir).glob("*.tmp"))
+        print(f"  JSON fusionné: {sorted(data)}")
+
+        # SQLite: une connexion voit immédiatement les transitions de l'autre
+        db = Path(tmpdir) / "circuits.db"
+        one, other = SqliteCircuitStore(db), SqliteCircuitStore(db)
+        with one.transaction("alpha") as state:
+            state.state = CircuitState.HALF_OPEN
+            state.half_open_calls = 2
+        seen = other.peek("alpha")
+        assert seen.state == CircuitState.HALF_OPEN and seen.half_open_calls == 2
+        try:
+            with other.transaction("alpha") as state:
+                state.failure_count = 9
+                raise RuntimeError("annulée")
+        except RuntimeError:
+            pass
+        assert one.peek("alpha").failure_count == 0  # Rollback
+        assert one.reset("alpha") and other.peek("alpha").state == CircuitState.CLOSED
+
+        # Transitions: ouverture au seuil, fail fast partagé entre gestionnaires
+        config = CircuitBreakerConfig(failure_threshold=2)
+        handlers = []
+        for _ in range(2):
+            handler = ErrorHandler()
+            handler.circuit_store = SqliteCircuitStore(db)
+            handler._log_error = lambda error: None
+            handlers.append(handler)
+        assert handlers[0]._check_circuit("flaky", config)
+        handlers[0]._record_failure("flaky", "boom", config)
+        handlers[0]._record_failure("flaky", "boom", config)
+        assert not handlers[1]._check_circuit("flaky", config)
+        assert handlers[1].get_circuit_status()["flaky"]["state"] == "OPEN"
+
+    print("  OK!")
+
+
+def test_async_fallback():
+    """Test: retries asyncio, fallback, requête hedgée au-delà du p95 et budget total."""
+    print("Test: error_handler async...")
+
+    import asyncio
+
+    from error_handler import DeadlineExceededError, RetryConfig
+
+    retry = RetryConfig(max_attempts=3, initial_delay=0.05, jitter=False)
+    agents = {"primary": AGENT, "backup": BACKUP, "broken": AGENT}
+    with tempfile.TemporaryDirectory() as tmpdir, _handler(tmpdir, agents) as handler:
+        pids = Path(tmpdir) / "pids.txt"
+
+        # Échecs: 3 essais de chaque agent, agents absents ignorés
+        result = asyncio.run(handler.execute_with_fallback_async(
+            "primary", ["fail"], fallbacks=["absent", "broken"], budget=20, retry_config=retry
+        ))
+        assert not result["success"] and result["tried"] == ["primary", "broken"]
+        assert "boom" in result["errors"]["primary"]
+        assert len(pids.read_text().split()) == 6
+
+        result = asyncio.run(handler.execute_with_fallback_async(
+            "primary", ["fail"], fallbacks=["backup"], budget=20, retry_config=retry
+        ))
+        assert result["success"] and result["was_fallback"] and not result["hedged"]
+
+        # Hedging: le principal dépasse son p95 appris, le fallback répond d'abord
+        for _ in range(5):
+            handler.latency.record("primary", 0.1)
+        pids.unlink()
+        start = time.monotonic()
+        result = asyncio.run(handler.execute_with_fallback_async(
+            "primary", ["slow", "10"], fallbacks=["backup"], budget=20, retry_config=retry
+        ))
+        elapsed = time.monotonic() - start
+        assert result["success"] and result["hedged"] and result["was_fallback"]
+        assert result["output"].strip() == "backup"
+        assert elapsed < 5
+        assert not any(_alive(int(pid)) for pid in pids.read_text().split())  # Principal tué
+        print(f"  Hedgé: {result['tried']} en {elapsed:.2f}s")
+
+        # Sans hedging: un seul agent, arrêté à l'épuisement du budget
+        pids.unlink()
+        start = time.monotonic()
+        result = asyncio.run(handler.execute_with_fallback_async(
+            "primary", ["slow", "10"], fallbacks=["backup"], budget=1, retry_config=retry, hedge=False
+        ))
+        assert not result["success"] and result["tried"] == ["primary"]
+        assert result["error"] == "Budget de 1s épuisé"
+        assert time.monotonic() - start < 5
+        assert not any(_alive(int(pid)) for pid in pids.read_text().split())
+
+        # Synchrone: pas de retry qui dépasserait le budget
+        start = time.monotonic()
+        try:
+            handler.retry_with_backoff(
+                lambda: 1 / 0, RetryConfig(max_attempts=5, initial_delay=1, jitter=False), budget=2.5
+            )
+        except DeadlineExceededError as e:
+            print(f"  Budget: {e}")
+        else:
+            raise AssertionError("budget ignoré")
+        assert time.monotonic() - start < 2
+
+    print("  OK!")
+
+
+def test_error_log_index():
+    """Test: erreurs récentes et comptes horaires lus via l'index identiques au parcours complet."""
+    print("Test: error_handler index...")
+
+    import random
+    from datetime import datetime, timedelta
+
+    from error_handler import ErrorRecord, load_error_index
+
+    rng = random.Random(46)
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as tmpdir, _handler(tmpdir) as handler:
+        import error_handler
+
+        # Écritures dans le désordre (processus concurrents, horodatage avant écriture)
+        records = []
+        for i in range(300):
+            timestamp = (now - timedelta(minutes=rng.randrange(0, 60 * 50))).isoformat()
+            record = ErrorRecord(agent=f"agent{i % 4}", error_type="X", message=str(i), timestamp=timestamp)
+            handler._log_error(record)
+            records.append(record)
+        log_files = sorted(error_handler.ERROR_LOG_DIR.glob("*.jsonl"))
+        assert len(log_files) >= 3
+
+        def expected(hours, agent=None):
+            cutoff = (now - timedelta(hours=hours)).isoformat()
+            return sorted(
+                (r.message for r in records if r.timestamp > cutoff and agent in (None, r.agent)),
+                key=int
+            )
+
+        for hours, agent in ((1, None), (5, None), (5, "agent1"), (30, "agent3"), (72, None), (72, "absent")):
+            found = handler.get_recent_errors(hours=hours, agent=agent)
+            assert sorted((e.message for e in found), key=int) == expected(hours, agent), (hours, agent)
+            assert [e.timestamp for e in found] == sorted((e.timestamp for e in found), reverse=True)
+
+        counts = handler.get_error_counts(hours=72)
+        buckets: dict[str, dict[str, int]] = {}
+        for r in records:
+            per_hour = buckets.setdefault(r.agent, {})
+            per_hour[r.timestamp[:13]] = per_hour.get(r.timestamp[:13], 0) + 1
+        assert counts == {agent: dict(sorted(hours.items())) for agent, hours in sorted(buckets.items())}
+        print(f"  {len(records)} erreurs, {len(log_files)} fichiers, {sum(len(h) for h in counts.values())} heures")
+
+        # Index absent ou en retard sur le fichier (ligne ajoutée sans lui): reconstruit
+        today = log_files[-1]
+        error_handler._index_path(today).unlink()
+        with open(today, "a") as f:
+            f.write(json.dumps({"agent": "late", "error_type": "X", "message": "late",
+                                "timestamp": now.isoformat(), "context": {}}) + "\n")
+        assert [e.message for e in handler.get_recent_errors(hours=1, agent="late")] == ["late"]
+        assert load_error_index(today)["size"] == today.stat().st_size
+
+    print("  OK!")
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests de error_handler")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_circuit_stores,
+        test_async_fallback,
+        test_error_log_index
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests de l'index des règles d'event_watcher.
+Vérifie que RuleIndex donne les mêmes règles que le parcours linéaire.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+RULES = [
+    {"id": "a", "path": "/x/y", "pattern": "*.md", "event": "create"},
+    {"id": "b", "path": "/x", "pattern": "*", "event": "create"},
+    {"id": "c", "path": "/x/y/z.md", "pattern": "z.*", "event": "create"},
+    {"id": "d", "path": "rel/dir", "pattern": "*.*", "event": "modify"},
+    {"id": "e", "path": "/", "pattern": "[!.]*", "event": "delete", "enabled": True},
+    {"id": "f", "path": "/x/y/", "pattern": "*.md", "event": "create", "enabled": False},
+    {"id": "g", "path": "/x//y/.", "pattern": "?.md", "event": "create"},
+    {"id": "h", "path": "/x/y", "pattern": "a|b.md", "event": "create"},
+]
+
+PATHS = [
+    "/x/y/z.md", "/x/y/a.md", "/x/yy/a.md", "/x/a", "rel/dir/f.txt", "/rel/dir/f.txt",
+    "rel/dir/sub/f.txt", "/", "/x/y", "/x/y/z.md/", "/.hidden", "/x/.h", "x/y/a.md",
+    "/x/y/q.md", "/x/y/a|b.md", "/x/y/./b.md",
+]
+
+EVENTS = ["create", "modify", "delete"]
+
+
+def _linear_matches(rules: list, file_path: str, event_type: str) -> list:
+    """Toutes les règles qui correspondent, selon le matcher de référence."""
+    from event_watcher import match_rule_linear
+
+    return [rule for rule in rules if match_rule_linear([rule], file_path, event_type) is rule]
+
+
+def test_rule_index():
+    """Test: match et matches identiques au parcours linéaire (cas limites et règles aléatoires)."""
+    print("Test: event_watcher RuleIndex...")
+
+    from event_watcher import RuleIndex, benchmark_matching, match_rule_linear
+
+    index = RuleIndex(RULES)
+    for path in PATHS:
+        for event in EVENTS:
+            assert index.match(path, event) is match_rule_linear(RULES, path, event), (path, event)
+            assert index.matches(path, event) == _linear_matches(RULES, path, event), (path, event)
+    assert [r["id"] for r in index.matches("/x/y/a.md", "create")] == ["a", "b", "g"]
+
+    # Règles aléatoires: répertoires imbriqués, motifs variés, règles désactivées
+    rng = random.Random(50)
+    dirs = ["/", "/home", "/home/u", "/home/u/docs", "/home/u/docs/a", "/tmp", "rel", "rel/sub"]
+    patterns = ["*", "*.*", "*.md", "report_*", "[a-c]*", "?.txt", "*.[jp][pn]g", "[!r]*"]
+    names = ["a.md", "b.txt", "report_1.csv", "x.png", "c", ".hidden", "r.jpg"]
+    for _ in range(20):
+        rules = [
+            {"id": str(i), "path": rng.choice(dirs), "pattern": rng.choice(patterns),
+             "event": rng.choice(EVENTS), "enabled": rng.random() > 0.1}
+            for i in range(rng.randrange(1, 40))
+        ]
+        index = RuleIndex(rules)
+        for _ in range(50):
+            path = f"{rng.choice(dirs).rstrip('/')}/{rng.choice(names)}"
+            event = rng.choice(EVENTS)
+            assert index.match(path, event) is match_rule_linear(rules, path, event), (path, event)
+            assert index.matches(path, event) == _linear_matches(rules, path, event), (path, event)
+
+    result = benchmark_matching(n_events=5_000, n_rules=200, linear_sample=1_000)
+    assert result["mismatches"] == 0
+    print(f"  Benchmark: {result['index_us_per_event']}µs/événement (linéaire {result['linear_us_per_event']}µs)")
+
+    print("  OK!")
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests d'event_watcher")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_rule_index
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests du routeur d'intentions (sans modèle d'embeddings).
+Vérifie le matcher compilé, le cache de décisions et le routage par lots.
+"""
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@contextmanager
+def _isolated(tmpdir: str):
+    """Fichiers de config et de cache du routeur dans un répertoire temporaire."""
+    import intent_router
+
+    names = ("ROUTING_CONFIG", "FASTPATH_FILE", "CACHE_STATS_FILE")
+    saved = {name: getattr(intent_router, name) for name in names}
+    for name in names:
+        setattr(intent_router, name, Path(tmpdir) / saved[name].name)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(intent_router, name, value)
+
+
+QUERIES = [
+    "vérifie l'état du système et la mémoire",
+    "check the firewall please",
+    "nettoie le cache puis range mes téléchargements",
+    "fais un audit sécurité complet",
+    "qui consomme autant de CPU ?",
+    "bonjour, ça va ?",
+    "",
+]
+
+
+def test_keyword_matcher():
+    """Test: le matcher compilé donne exactement les scores de la boucle naïve."""
+    print("Test: intent_router matcher...")
+
+    with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir):
+        from intent_router import IntentRouter, benchmark_keyword_match
+
+        router = IntentRouter(use_embeddings=False, persist_stats=False)
+        for query in QUERIES:
+            assert router._keyword_match(query) == router._keyword_match_python(query), query
+
+        result = benchmark_keyword_match(num_queries=300)
+        assert result["identical"]
+        print(f"  Accélération: x{result['speedup']} ({result['keywords']} keywords)")
+
+    print("  OK!")
+
+
+def test_decision_cache():
+    """Test: cache de décisions, fast-path appris et compteurs persistés entre processus."""
+    print("Test: intent_router cache...")
+
+    with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir):
+        from intent_router import FASTPATH_MIN_SUCCESSES, IntentRouter
+
+        router = IntentRouter(use_embeddings=False, persist_stats=False)
+        first = router.route("Vérifie la mémoire")
+        again = router.route("  vérifie   la MÉMOIRE ")  # Même requête normalisée
+        assert again == first and again is not first
+        assert router.cache_stats["cache_hits"] == 1
+
+        # Fast-path: confirmé après FASTPATH_MIN_SUCCESSES succès, partagé via le disque
+        query = "fais un audit sécurité complet"
+        decision = router.route(query)
+        for _ in range(FASTPATH_MIN_SUCCESSES):
+            router.record_outcome(query, decision, success=True)
+        other = IntentRouter(use_embeddings=False, persist_stats=False)
+        fast = other.route(query)
+        assert other.cache_stats["fastpath_hits"] == 1
+        assert fast.primary_agent == decision.primary_agent
+        assert fast.reasoning.startswith("Fast-path")
+
+        # Un échec de l'agent principal oublie l'entrée
+        other.record_outcome(query, fast, success=False)
+        assert IntentRouter(use_embeddings=False, persist_stats=False).route(query).reasoning == decision.reasoning
+
+        # Compteurs: cumul persisté + processus courant
+        router.save_cache_stats()
+        assert router.cache_stats["lookups"] == 0
+        stats = IntentRouter(use_embeddings=False, persist_stats=False).get_cache_stats()
+        assert stats["lookups"] == 3 and stats["cache_hits"] == 1
+        assert stats["misses"] == 2
+
+        # Routeurs persistés: vidés par l'unique hook atexit, collectables une fois jetés
+        import gc
+        import weakref
+        import intent_router
+        persisted = IntentRouter(use_embeddings=False)
+        persisted.route("Vérifie la mémoire")
+        intent_router._save_all_cache_stats()
+        assert persisted.cache_stats["lookups"] == 0
+        assert IntentRouter(use_embeddings=False, persist_stats=False).get_cache_stats()["lookups"] == 4
+        ref = weakref.ref(persisted)
+        del persisted
+        gc.collect()
+        assert ref() is None
+        print(f"  Taux de hit: {stats['hit_rate']}, fast-path: {stats['fastpath_entries']} entrée(s)")
+
+    print("  OK!")
+
+
+def test_route_batch():
+    """Test: route_batch décide comme route; doublons du lot scorés une fois, comptés à part."""
+    print("Test: intent_router batch...")
+
+    with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir):
+        from intent_router import IntentRouter, benchmark_routing
+
+        expected = [IntentRouter(use_embeddings=False, persist_stats=False).route(q) for q in QUERIES]
+
+        router = IntentRouter(use_embeddings=False, persist_stats=False)
+        router.route(QUERIES[0])
+        batch = QUERIES + [QUERIES[1], QUERIES[1].upper()]
+        decisions = router.route_batch(batch)
+        assert decisions[:len(QUERIES)] == expected
+        assert decisions[-1] == decisions[-2] == expected[1]
+        assert decisions[-1] is not decisions[-2]
+        assert router.cache_stats == {
+            "lookups": len(batch) + 1, "cache_hits": 1, "fastpath_hits": 0, "batch_duplicates": 2
+        }
+
+        result = benchmark_routing(use_embeddings=False)
+        assert result["same_decisions"]
+        print(f"  Corpus: {result['queries']} requêtes, précision {result['accuracy']}")
+
+    print("  OK!")
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests du routeur d'intentions")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_keyword_matcher,
+        test_decision_cache,
+        test_route_batch
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -171,6 +171,96 @@ def test_knowledge_graph():
         print("  OK!")
 
 
+def test_temporal_graph():
+    """Test du graphe temporel (scoring decay vectorisé)."""
+    print("Test: temporal_graph...")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        from temporal_graph import TemporalGraph
+
+        graph = TemporalGraph(storage_path=Path(tmpdir))
+        ids = [
+            graph.add("Aura", "version", f"3.{i}", confidence=0.5 + i / 20)
+            for i in range(8)
+        ]
+        graph.add("Python", "is_a", "language", confidence=0.9)
+        graph.update(ids[0], new_object="4.0")
+        graph.invalidate(ids[1])
+
+        expected = graph._search_with_decay_python("Aura", None, None, 0.1, 0.0, None)
+        results = graph.search_with_decay(subject="Aura")
+        assert [t.id for t, _ in results] == [t.id for t, _ in expected]
+        assert ids[1] not in {t.id for t, _ in results}
+        print(f"  Résultats decay: {len(results)}")
+
+        top = graph.search_with_decay(limit=3)
+        assert len(top) == 3
+        assert top[0][1] >= top[1][1] >= top[2][1]
+        print(f"  Top-3: {[round(score, 3) for _, score in top]}")
+
+        # Rechargement: les colonnes sont reconstruites depuis le JSONL
+        reloaded = TemporalGraph(storage_path=Path(tmpdir))
+        assert len(reloaded.search_with_decay(subject="Python")) == 1
+
+        print("  OK!")
+
+
+def test_episode_clustering():
+    """Test du clustering d'embeddings (candidats skills)."""
+    print("Test: episode_clustering...")
+
+    import numpy as np
+    from episode_clustering import cluster_embeddings
+
+    rng = np.random.default_rng(0)
+    centers = np.eye(16)[:2]
+    embeddings = np.vstack([
+        centers[0] + 0.05 * rng.standard_normal((6, 16)),
+        centers[1] + 0.05 * rng.standard_normal((6, 16))
+    ])
+
+    result = cluster_embeddings(embeddings, target_size=6, min_similarity=0.8)
+    assert len(set(result.labels[:6].tolist())) == 1
+    assert len(set(result.labels[6:].tolist())) == 1
+    assert result.labels[0] != result.labels[6]
+    assert all(result.labels[m] == c for c, m in result.medoids.items())
+    print(f"  Clusters: {len(result.medoids)} en {result.elapsed_ms:.1f}ms")
+
+    print("  OK!")
+
+
+def test_consolidation_workers():
+    """Test: le calcul réparti sur processus donne le même résultat qu'en série."""
+    print("Test: consolidation_workers...")
+
+    from concurrent.futures import ProcessPoolExecutor
+    from text_patterns import plan_episode_knowledge, plan_skill
+
+    payloads = [
+        (f"ep_{i:06d}", f"Python est un langage. Aura utilise Python {i}. Le cache a {i} fichiers",
+         ["Python", f"projet_{i % 3}"])
+        for i in range(40)
+    ]
+    groups = [
+        ([f"nettoie le cache /tmp/run_{j}" for j in range(i, i + 4)],
+         ["Le disque est plein", "Disque plein après build", "Le disque sature"])
+        for i in range(10)
+    ]
+
+    serial = [plan_episode_knowledge(p) for p in payloads]
+    serial_skills = [plan_skill(g) for g in groups]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        parallel = list(pool.map(plan_episode_knowledge, payloads, chunksize=4))
+        parallel_skills = list(pool.map(plan_skill, groups))
+
+    assert parallel == serial
+    assert parallel_skills == serial_skills
+    assert serial_skills[0]["pattern"] == "nettoie le cache"
+    print(f"  Triplets planifiés: {sum(len(p) for p in serial)}")
+
+    print("  OK!")
+
+
 def test_consolidator():
     """Test du consolidateur."""
     print("Test: memory_consolidator...")
@@ -206,6 +296,23 @@ def test_consolidator():
         result = consolidator.consolidate(min_episodes=3, dry_run=True)
         print(f"  Dry-run: {result.episodes_processed} épisodes traités")
 
+        # Consolidation incrémentale: seuls les nouveaux épisodes sont relus
+        result = consolidator.consolidate(min_episodes=3)
+        assert result.episodes_processed == 5
+        assert "knowledge" in result.details["timings_ms"]
+        result = consolidator.consolidate(min_episodes=3)
+        assert result.episodes_processed == 0
+        for i in range(3):
+            episodic.record_interaction(
+                context=f"Nouveau contexte {i}",
+                action=f"Action similaire {i + 5}",
+                outcome="Succès",
+                emotional_valence=0.5
+            )
+        result = consolidator.consolidate(min_episodes=3)
+        assert result.episodes_processed == 3
+        print(f"  Incrémental: {result.episodes_processed} nouveaux épisodes")
+
         print("  OK!")
 
 
@@ -242,6 +349,16 @@ def test_memory_api():
         result = api.add_knowledge("Test", "is_a", "API")
         print(f"  Triple: {result['triple_id']}")
 
+        # Maintenance (appelée par memory_scheduler): refresh relit le disque
+        other = MemoryAPI(base_path=Path(tmpdir))
+        episode_id = other.record_episode(context="Autre processus", action="Écrire", outcome="Succès")["episode_id"]
+        assert api.episodic.get_episode(episode_id) is None
+        api.refresh()
+        assert api.episodic.get_episode(episode_id) is not None
+        result = api.apply_retention(days=30)
+        assert result["episodes_archived"] == 0
+        print(f"  Rétention: {result['episodes_archived']} épisodes archivés")
+
         # Stats
         stats = api.get_stats()
         print(f"  Version: {stats['version']}")
@@ -261,6 +378,9 @@ def main():
         test_episodic_memory,
         test_procedural_memory,
         test_knowledge_graph,
+        test_temporal_graph,
+        test_episode_clustering,
+        test_consolidation_workers,
         test_consolidator,
         test_memory_api
     ]
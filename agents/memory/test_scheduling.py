@@ -0,0 +1,304 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests de la planification (scheduling_core et system_scheduler).
+Vérifie le calcul des échéances cron, l'historique JSONL et le moteur de
+planification.
+"""
+
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@contextmanager
+def _isolated(tmpdir: str):
+    """Planning et historique de system_scheduler dans un répertoire temporaire."""
+    import system_scheduler
+
+    names = ("SCHEDULE_FILE", "HISTORY_FILE", "HISTORY_STATS_FILE", "HISTORY_LOCK_FILE",
+             "LEGACY_HISTORY_FILE", "HISTORY_MAX_BYTES")
+    saved = {name: getattr(system_scheduler, name) for name in names}
+    for name in names[:-1]:
+        setattr(system_scheduler, name, Path(tmpdir) / saved[name].name)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(system_scheduler, name, value)
+
+
+def _next_by_minute(cron, after: datetime) -> datetime:
+    """Échéance de référence: parcours minute par minute (jours exclus sautés)."""
+    dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while True:
+        if dt.month not in cron.months or not cron._day_matches(dt):
+            dt = datetime(dt.year, dt.month, dt.day) + timedelta(days=1)
+        elif dt.minute in cron.minutes and dt.hour in cron.hours:
+            return dt
+        else:
+            dt += timedelta(minutes=1)
+
+
+def test_cron():
+    """Test: next_after identique au parcours minute par minute, alias et erreurs."""
+    print("Test: scheduling cron...")
+
+    from scheduling_core import CronExpr, parse_cron
+
+    rng = random.Random(47)
+    exprs = [
+        "*/15 * * * *", "30 3 * * 1-5", "0 0 1 * *", "5/20 9-17 * * *",
+        "0 12 13 * 5", "@weekly", "0 0 29 2 *", "0,30 */6 1-7 * 7", "59 23 31 12 *"
+    ]
+    for expr in exprs:
+        cron = parse_cron(expr)
+        for _ in range(25):
+            after = datetime(2026, 1, 1) + timedelta(minutes=rng.randrange(0, 2 * 365 * 24 * 60), seconds=30)
+            assert cron.next_after(after) == _next_by_minute(cron, after), (expr, after)
+    print(f"  {len(exprs)} expressions comparées au parcours minute par minute")
+
+    # Échéance strictement après, même à la minute exacte
+    assert parse_cron("*/15 * * * *").next_after(datetime(2026, 3, 1, 10, 15)) == datetime(2026, 3, 1, 10, 30)
+
+    # Jour du mois ET jour de semaine restreints: l'un ou l'autre (vendredi 13 n'est pas requis)
+    assert parse_cron("0 12 13 * 5").next_after(datetime(2026, 3, 1)) == datetime(2026, 3, 6, 12, 0)
+    assert parse_cron("0 0 * * 7").weekdays == parse_cron("0 0 * * 0").weekdays == {0}
+    assert parse_cron("@daily").minutes == CronExpr("0 0 * * *").minutes
+    assert parse_cron("@hourly") is parse_cron("@hourly")  # Cache
+
+    for bad in ("0 0 * *", "60 * * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *", "a * * * *"):
+        try:
+            CronExpr(bad)
+        except ValueError as e:
+            print(f"  Rejeté: {e}")
+        else:
+            raise AssertionError(f"Expression invalide acceptée: {bad}")
+    try:
+        CronExpr("0 0 30 2 *").next_after(datetime(2026, 1, 1))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("30 février planifié")
+
+    print("  OK!")
+
+
+def test_history():
+    """Test: fin d'historique lue depuis la fin, statistiques incrémentales, rétention."""
+    print("Test: scheduling historique...")
+
+    import system_scheduler
+    from system_scheduler import (
+        append_history, history_stats, load_history, prune_history, read_history_tail
+    )
+
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir):
+        # Ancien format JSON: migré à la première lecture
+        system_scheduler.LEGACY_HISTORY_FILE.write_text(json.dumps([
+            {"task_name": "legacy", "status": "success", "duration": 1.0, "started": now.isoformat()}
+        ]))
+        assert [e["task_name"] for e in read_history_tail(5)] == ["legacy"]
+        assert not system_scheduler.LEGACY_HISTORY_FILE.exists()
+
+        def writer(k: int) -> None:
+            for i in range(100):
+                append_history({"task_name": f"t{k}", "status": "failed" if i % 10 == 0 else "success",
+                                "duration": i / 100, "started": now.isoformat(), "stdout": "x" * (i % 7) * 50})
+
+        threads = [threading.Thread(target=writer, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        entries = load_history()
+        assert len(entries) == 401
+        for limit in (1, 10, 150, 401, 1000):
+            assert read_history_tail(limit) == entries[-limit:], limit
+
+        # Ligne en cours d'écriture par un autre processus: ignorée
+        complete = system_scheduler.HISTORY_FILE.read_bytes()
+        system_scheduler.HISTORY_FILE.write_bytes(complete + b'{"task_name": "partiel", "sta')
+        assert read_history_tail(10) == entries[-10:]
+        system_scheduler.HISTORY_FILE.write_bytes(complete)
+
+        stats = history_stats()
+        assert stats["t1"]["runs"] == 100 and stats["t1"]["failures"] == 10
+        assert stats["t1"]["p50"] == 0.5 and stats["t1"]["p95"] == 0.95
+        system_scheduler.HISTORY_STATS_FILE.unlink()
+        assert history_stats() == stats  # Reconstruites depuis le fichier
+        print(f"  {len(entries)} entrées, t1: p50={stats['t1']['p50']}s p95={stats['t1']['p95']}s")
+
+        # Au-delà de HISTORY_MAX_BYTES: les entrées récentes sont gardées (moitié du plafond)
+        system_scheduler.HISTORY_MAX_BYTES = system_scheduler.HISTORY_FILE.stat().st_size
+        append_history({"task_name": "last", "status": "success", "duration": 2.0, "started": now.isoformat()})
+        size = system_scheduler.HISTORY_FILE.stat().st_size
+        assert size <= system_scheduler.HISTORY_MAX_BYTES // 2
+        kept = load_history()
+        assert kept == (entries + [kept[-1]])[-len(kept):] and kept[-1]["task_name"] == "last"
+        assert sum(task["runs"] for task in history_stats().values()) == len(kept)
+
+        # Rétention par âge
+        old = (now - timedelta(days=40)).isoformat()
+        system_scheduler.HISTORY_FILE.write_text("".join(
+            json.dumps({"task_name": "old" if i < 5 else "new", "status": "success", "duration": 1.0,
+                        "started": old if i < 5 else now.isoformat()}) + "\n"
+            for i in range(8)
+        ))
+        assert prune_history(max_days=30) == 5
+        assert list(history_stats()) == ["new"] and history_stats()["new"]["runs"] == 3
+
+    print("  OK!")
+
+
+def test_scheduling_engine():
+    """Test: exécution bornée des jobs échus, replanification, report selon la charge (persisté)."""
+    print("Test: scheduling engine...")
+
+    import scheduling_core
+    from scheduling_core import Job, SchedulingEngine, parse_interval
+
+    assert parse_interval("5m") == timedelta(minutes=5) and parse_interval("2W") == timedelta(weeks=2)
+    for bad in ("5s", "h"):
+        try:
+            parse_interval(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Intervalle invalide accepté: {bad}")
+    try:
+        Job("x", dict)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Job sans récurrence accepté")
+
+    # Jobs échus: au plus max_workers à la fois, les autres attendent leur échéance
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def work():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.2)
+        with lock:
+            active["now"] -= 1
+        return {"status": "success"}
+
+    engine = SchedulingEngine(max_workers=2)
+    try:
+        for key in ("a", "b", "c"):
+            engine.schedule(Job(key, work, interval=timedelta(hours=1)))
+        engine.schedule(Job("broken", lambda: 1 / 0, interval=timedelta(hours=1)))
+        engine.schedule(Job("later", work, interval=timedelta(hours=1)), datetime.now() + timedelta(hours=1))
+        results = {job.key: result["status"] for job, result in engine.run_pending()}
+        assert results == {"a": "success", "b": "success", "c": "success", "broken": "error"}
+        assert active["peak"] == 2
+        next_due = engine.next_due("a")
+        assert timedelta(minutes=59) < next_due - datetime.now() <= timedelta(hours=1)
+        assert engine.next_due("later") is not None
+
+        # Boucle step/wait: pas de rattrapage, intervalle respecté
+        runs = []
+        engine.clear()
+        engine.schedule(Job("tick", lambda: runs.append(time.monotonic()), interval=timedelta(seconds=0.2)))
+        start = time.monotonic()
+        while time.monotonic() - start < 1.1:
+            engine.step()
+            engine.wait(0.05)
+        assert 4 <= len(runs) <= 6, runs
+        assert all(b - a >= 0.19 for a, b in zip(runs, runs[1:]))
+    finally:
+        engine.shutdown()
+
+    # Charge élevée: report des jobs defer_on_load, jusqu'au report maximal
+    saved = scheduling_core.load_per_cpu
+    scheduling_core.load_per_cpu = lambda: 9.0
+    try:
+        deferred_since: dict[str, float] = {}
+        engine = SchedulingEngine(max_workers=1, on_finish=lambda job, result: None,
+                                  deferred_since=deferred_since)
+        engine.schedule(Job("heavy", dict, interval=timedelta(hours=1), defer_on_load=True))
+        engine.schedule(Job("light", dict, interval=timedelta(hours=1)))
+        results = {job.key: result for job, result in engine.run_pending()}
+        assert results["light"]["status"] == "success"
+        assert results["heavy"]["status"] == "deferred" and results["heavy"]["load_per_cpu"] == 9.0
+        assert list(deferred_since) == ["heavy"]
+        engine.shutdown()
+
+        # Nouveau processus: le début du report persisté s'applique toujours
+        deferred_since["heavy"] -= scheduling_core.MAX_DEFER_SECONDS
+        engine = SchedulingEngine(max_workers=1, on_finish=lambda job, result: None,
+                                  deferred_since=deferred_since)
+        engine.schedule(Job("heavy", dict, interval=timedelta(hours=1), defer_on_load=True))
+        assert [result["status"] for _, result in engine.run_pending()] == ["success"]
+        assert deferred_since == {}
+        engine.shutdown()
+
+        # system_scheduler: deferred_since gardé dans schedules.json entre deux `check`
+        import system_scheduler
+        with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir):
+            assert system_scheduler.add_task("none", "true") == {}  # Ni intervalle ni cron
+            system_scheduler.add_task("heavy", "true", "1h", defer_on_load=True)
+            assert system_scheduler.check_and_run() == []
+            since = system_scheduler.load_schedules()["tasks"][0]["deferred_since"]
+            assert system_scheduler.check_and_run() == []
+            assert system_scheduler.load_schedules()["tasks"][0]["deferred_since"] == since
+
+            data = system_scheduler.load_schedules()
+            data["tasks"][0]["deferred_since"] = since - scheduling_core.MAX_DEFER_SECONDS
+            system_scheduler.save_schedules(data)
+            assert [r["status"] for r in system_scheduler.check_and_run()] == ["success"]
+            task = system_scheduler.load_schedules()["tasks"][0]
+            assert "deferred_since" not in task and task["run_count"] == 1
+            print(f"  Report persisté puis levé après {scheduling_core.MAX_DEFER_SECONDS}s")
+    finally:
+        scheduling_core.load_per_cpu = saved
+
+    print("  OK!")
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests de la planification")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_cron,
+        test_history,
+        test_scheduling_engine
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
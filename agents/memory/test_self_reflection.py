@@ -0,0 +1,138 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests du lecteur de fin de log de self_reflection.
+Vérifie la lecture par offsets indexés et les statistiques glissantes.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _agent(tmpdir: str):
+    """Agent dont le log et l'index sont dans un répertoire temporaire."""
+    from self_reflection import SelfReflectionAgent
+
+    agent = SelfReflectionAgent()
+    agent.reflections_file = Path(tmpdir) / "reflection_log.jsonl"
+    agent.index_file = Path(tmpdir) / "reflection_log.index.json"
+    return agent
+
+
+def _valid_lines(path: Path) -> list[str]:
+    """Lignes JSON complètes et valides du log (lecture intégrale, référence)."""
+    lines = []
+    for raw in path.read_bytes().splitlines(keepends=True):
+        if not raw.endswith(b"\n"):
+            continue
+        try:
+            json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+        lines.append(raw.decode("utf-8"))
+    return lines
+
+
+def test_tail_lines():
+    """Test: les dernières lignes viennent de l'offset indexé, lignes invalides ignorées."""
+    print("Test: self_reflection tail...")
+
+    from self_reflection import SelfReflectionAgent
+
+    stride = SelfReflectionAgent.OFFSET_STRIDE
+    SelfReflectionAgent.OFFSET_STRIDE = 10
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agent = _agent(tmpdir)
+            for i in range(25):
+                agent.reflect_on_task(f"Tâche {i}", "ok", success=i % 2 == 0)
+
+            # Lignes écrites par un autre processus: une invalide, une en cours d'écriture
+            with open(agent.reflections_file, "a", encoding="utf-8") as f:
+                f.write("pas du json\n")
+                f.write(json.dumps({"type": "error_analysis", "task": "Erreur 25"}) + "\n")
+                f.write('{"type": "task_completion", "task": "inachev')
+
+            expected = _valid_lines(agent.reflections_file)
+            assert len(expected) == 26
+            for count in (1, 7, 10, 16, 26, 40):
+                assert agent._tail_lines(count) == expected[-count:], count
+            print(f"  Offsets indexés: {len(agent._load_index()['offsets'])}")
+
+            recent = agent._load_recent_reflections(3)
+            assert [r["task"] for r in recent] == ["Tâche 23", "Tâche 24", "Erreur 25"]
+
+        print("  OK!")
+    finally:
+        SelfReflectionAgent.OFFSET_STRIDE = stride
+
+
+def test_stats_window():
+    """Test: statistiques sur la fenêtre récente, totaux depuis le début du log."""
+    print("Test: self_reflection stats...")
+
+    from self_reflection import SelfReflectionAgent
+
+    window = SelfReflectionAgent.STATS_WINDOW
+    SelfReflectionAgent.STATS_WINDOW = 4
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            agent = _agent(tmpdir)
+            for i in range(6):
+                agent.reflect_on_task(f"Tâche {i}", "ok", success=i < 2)
+
+            stats = agent.get_stats()
+            assert stats["total_reflections"] == 4
+            assert stats["success_rate"] == 0.0
+            assert stats["all_time"]["total_reflections"] == 6
+            assert stats["all_time"]["success_rate"] == 33.3
+            print(f"  Fenêtre: {stats['total_reflections']}, total: {stats['all_time']['total_reflections']}")
+
+            # Log tronqué (rotation): l'index est reconstruit
+            agent.reflections_file.write_text("")
+            agent.reflect_on_task("Après rotation", "ok", success=True)
+            stats = agent.get_stats()
+            assert stats["all_time"]["total_reflections"] == 1
+            assert stats["success_rate"] == 100.0
+
+        print("  OK!")
+    finally:
+        SelfReflectionAgent.STATS_WINDOW = window
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests de self_reflection")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_tail_lines,
+        test_stats_window
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests du gestionnaire de tâches en arrière-plan (task_runner).
+Vérifie le reaper partagé, l'utilisation des ressources, la file d'admission
+et les sorties plafonnées.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@contextmanager
+def _isolated(tmpdir: str, agents: dict[str, str]):
+    """Journal, sorties et agents (nom -> code) dans un répertoire temporaire."""
+    import task_runner
+
+    for name, code in agents.items():
+        (Path(tmpdir) / f"{name}.py").write_text(code)
+
+    names = ("AGENTS_DIR", "TASKS_DIR", "TASKS_LOG", "RUNNING_TASKS_FILE")
+    saved = {name: getattr(task_runner, name) for name in names}
+    task_runner.AGENTS_DIR = Path(tmpdir)  # Pas de voice_speak.py: notifications muettes
+    task_runner.TASKS_DIR = Path(tmpdir)
+    task_runner.TASKS_LOG = Path(tmpdir) / "tasks.jsonl"
+    task_runner.RUNNING_TASKS_FILE = Path(tmpdir) / "running.json"
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(task_runner, name, value)
+
+
+BURN = """
+import sys
+data = bytearray(60 * 1024 * 1024)
+total = sum(range(3_000_000))
+print("done", *sys.argv[1:])
+sys.exit(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+"""
+
+SLEEPER = "import time\ntime.sleep(30)\n"
+
+SPAN = """
+import sys, time
+start = time.time()
+time.sleep(float(sys.argv[2]))
+with open(sys.argv[1], "a") as f:
+    f.write(f"{start} {time.time()}\\n")
+"""
+
+
+def _spans(path: Path) -> list[tuple[float, float]]:
+    """Intervalles (début, fin) écrits par les agents SPAN, triés."""
+    return sorted(tuple(map(float, line.split())) for line in path.read_text().splitlines())
+
+
+def _overlaps(spans: list[tuple[float, float]]) -> int:
+    """Nombre maximal d'intervalles simultanés."""
+    events = sorted([(start, 1) for start, _ in spans] + [(end, -1) for _, end in spans])
+    current = peak = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def test_reaper():
+    """Test: un seul thread reaper, code de sortie, temps CPU et RSS max des tâches."""
+    print("Test: task_runner reaper...")
+
+    with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir, {"burn": BURN, "sleeper": SLEEPER}):
+        from task_runner import TaskRunner, get_reaper
+
+        runner = TaskRunner()
+        ok = runner.run_agent("burn", ["0"], notify=False)["task_id"]
+        ko = runner.run_agent("burn", ["3"], notify=False)["task_id"]
+        slow = runner.run_agent("sleeper", notify=False)["task_id"]
+
+        reapers = [t for t in threading.enumerate() if t.name == "task-reaper"]
+        assert len(reapers) == 1  # Pas de thread par tâche
+
+        done = runner.wait_task(ok, 30)
+        assert done["status"] == "completed" and done["return_code"] == 0
+        assert done["cpu_user"] > 0
+        assert done["max_rss_kb"] > 50 * 1024  # Le bytearray de l'agent, pas la capture
+        failed = runner.wait_task(ko, 30)
+        assert failed["status"] == "failed" and failed["return_code"] == 3
+        print(f"  CPU: {done['cpu_user']}s, RSS max: {done['max_rss_kb'] // 1024} Mo")
+
+        # Tuée: le statut "killed" n'est pas écrasé par le reaper
+        assert runner.kill_task(slow)
+        killed = runner.wait_task(slow, 10)
+        assert killed["status"] == "killed"
+        for _ in range(100):
+            if get_reaper().pending() == 0:
+                break
+            time.sleep(0.05)
+        assert get_reaper().pending() == 0
+        assert runner.get_task(slow)["return_code"] == -15
+
+        # Un autre processus relit l'état final depuis le journal
+        statuses = {t["id"]: t["status"] for t in TaskRunner().list_tasks()}
+        assert statuses == {ok: "completed", ko: "failed", slow: "killed"}
+
+        # RSS de l'agent, pas celui du lanceur (ru_maxrss hérité à travers fork/exec)
+        ballast = bytearray(300 * 1024 * 1024)
+        small = runner.wait_task(runner.run_agent("burn", ["0"], notify=False)["task_id"], 30)
+        del ballast
+        assert 50 * 1024 < small["max_rss_kb"] < 150 * 1024, small["max_rss_kb"]
+
+    print("  OK!")
+
+
+def test_detached_launcher():
+    """Test: tâche lancée par la CLI (lanceur terminé): code et rusage relus de la capture."""
+    print("Test: task_runner lanceur terminé...")
+
+    import os
+    import subprocess
+
+    import task_runner
+
+    with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir, {"burn": BURN}):
+        from task_runner import TaskRunner
+
+        env = {**os.environ, "HOME": tmpdir}
+        for code in ("0", "3"):
+            subprocess.run(
+                [sys.executable, task_runner.__file__, "run", str(Path(tmpdir) / "burn.py"), code, "--no-notify"],
+                env=env, capture_output=True, timeout=30, check=True
+            )
+
+        task_runner.TASKS_DIR = Path(tmpdir) / ".aura" / "tasks"
+        task_runner.TASKS_LOG = task_runner.TASKS_DIR / "tasks.jsonl"
+        runner = TaskRunner()
+        deadline = time.time() + 30
+        while any(t["status"] == "running" for t in runner.list_tasks()) and time.time() < deadline:
+            time.sleep(0.1)
+
+        tasks = sorted(runner.list_tasks(), key=lambda t: t["args"])
+        assert [(t["status"], t["return_code"]) for t in tasks] == [("completed", 0), ("failed", 3)]
+        assert all(50 * 1024 < t["max_rss_kb"] < 150 * 1024 and t["cpu_user"] > 0 for t in tasks)
+        print(f"  RSS max: {[t['max_rss_kb'] // 1024 for t in tasks]} Mo")
+
+    print("  OK!")
+
+
+def test_admission_queue():
+    """Test: run_parallel respecte max_concurrency et diffère sur manque de mémoire."""
+    print("Test: task_runner admission...")
+
+    import task_runner
+
+    saved = (task_runner.available_memory_mb, task_runner.load_per_cpu)
+    task_runner.load_per_cpu = lambda: None
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir, {"span": SPAN, "sleeper": SLEEPER}):
+            from task_runner import DEFAULT_TASK_MEMORY_MB, MIN_FREE_MEMORY_MB, TaskRunner
+
+            spans_file = Path(tmpdir) / "spans.txt"
+            tasks = [{"agent": "span", "args": [str(spans_file), "0.3"]} for _ in range(4)]
+
+            # Concurrence: jamais plus de 2 agents à la fois, tous lancés au final
+            # (lanceur volumineux: ne doit pas gonfler les estimations)
+            ballast = bytearray(DEFAULT_TASK_MEMORY_MB * 1024 * 1024)
+            task_runner.available_memory_mb = lambda: None
+            runner = TaskRunner()
+            result = runner.run_parallel(tasks, notify_all=False, max_concurrency=2)
+            ids = [r["task_id"] for r in result["results"]]
+            assert all(r["status"] == "queued" for r in result["results"])
+            assert runner.wait_dispatched(30)
+            assert all(runner.wait_task(i, 30)["status"] == "completed" for i in ids)
+            assert _overlaps(_spans(spans_file)) == 2
+            assert runner.admission_delays == 0  # Attente de place: pas un retard d'admission
+            del ballast
+
+            # Mémoire: estimation tirée des RSS mesurés, de quoi lancer une seule à la fois
+            spans_file.unlink()
+            runner = TaskRunner()
+            runner._record({"id": "legacy", "agent": "span.py", "status": "completed",
+                            "max_rss_kb": 900 * 1024})  # Ancienne mesure: RSS du lanceur, ignorée
+            estimate = runner.estimate_memory_mb("span")
+            assert 0 < estimate < DEFAULT_TASK_MEMORY_MB, estimate
+            task_runner.available_memory_mb = lambda: MIN_FREE_MEMORY_MB + 1.5 * estimate
+            ids = [r["task_id"] for r in runner.run_parallel(tasks[:3], notify_all=False, max_concurrency=3)["results"]]
+            assert runner.wait_dispatched(30)
+            assert all(runner.wait_task(i, 30)["status"] == "completed" for i in ids)
+            assert _overlaps(_spans(spans_file)) == 1
+            assert runner.admission_delays > 0
+            print(f"  Retards d'admission (mémoire): {runner.admission_delays}")
+
+            # Une tâche encore en file peut être retirée
+            task_runner.available_memory_mb = lambda: None
+            runner = TaskRunner()
+            first, second = (
+                r["task_id"] for r in runner.run_parallel(
+                    [{"agent": "sleeper"}, {"agent": "sleeper"}], notify_all=False, max_concurrency=1
+                )["results"]
+            )
+            assert runner.get_task(second)["status"] == "queued"
+            assert runner.kill_task(second) and runner.get_task(second)["status"] == "killed"
+            assert runner.kill_task(first)
+            runner.wait_task(first, 10)
+    finally:
+        task_runner.available_memory_mb, task_runner.load_per_cpu = saved
+
+    print("  OK!")
+
+
+def test_queued_orphans():
+    """Test: une tâche en file d'un processus disparu expire, pas celles d'un processus vivant."""
+    print("Test: task_runner file orpheline...")
+
+    import os
+    import subprocess
+    from datetime import datetime, timedelta
+
+    with tempfile.TemporaryDirectory() as tmpdir, _isolated(tmpdir, {}):
+        from task_runner import QUEUED_TTL_SECONDS, TaskRunner
+
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        now = datetime.now()
+        old = now - timedelta(seconds=QUEUED_TTL_SECONDS + 60)
+
+        runner = TaskRunner()
+        for task_id, owner, queued_at in (
+            ("dead_owner", dead.pid, now),
+            ("live_owner", os.getppid(), now),
+            ("own", os.getpid(), old),
+            ("legacy_old", None, old),
+            ("legacy_recent", None, now)
+        ):
+            task = {"id": task_id, "agent": "x.py", "status": "queued", "queued_at": queued_at.isoformat()}
+            if owner is not None:
+                task["owner_pid"] = owner
+            runner._record(task)
+
+        statuses = {t["id"]: t["status"] for t in TaskRunner().list_tasks()}
+        assert statuses == {
+            "dead_owner": "expired", "live_owner": "queued", "own": "queued",
+            "legacy_old": "expired", "legacy_recent": "queued"
+        }, statuses
+        assert {t["id"] for t in TaskRunner().list_tasks("expired")} == {"dead_owner", "legacy_old"}
+        print(f"  Expirées: {sorted(i for i, s in statuses.items() if s == 'expired')}")
+
+    print("  OK!")
+
+
+def test_capped_output():
+    """Test: début + deux segments de fin au plus, marqueur de troncature, dernières lignes."""
+    print("Test: task_runner CappedOutput...")
+
+    from task_runner import (
+        TRUNCATION_MARKER, CappedOutput, output_segments, read_last_lines, read_output, remove_output
+    )
+
+    lines = [f"line {i:05d}\n".encode() for i in range(2000)]  # 11 octets par ligne
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "task.stdout"
+
+        # Sous le plafond: fichier unique, contenu intact
+        output = CappedOutput(path, head_bytes=100, tail_bytes=1000)
+        output.write(b"".join(lines[:9]))
+        output.close()
+        assert output_segments(path) == [path]
+        assert read_output(path) == b"".join(lines[:9]).decode()
+
+        # Écritures de tailles variées, coupant les lignes
+        output = CappedOutput(path, head_bytes=100, tail_bytes=1000)
+        data = b"".join(lines)
+        chunk = 1
+        while data:
+            output.write(data[:chunk])
+            data = data[chunk:]
+            chunk = chunk % 97 + 13
+        output.close()
+
+        head, previous, current = output_segments(path)
+        assert head.read_bytes() == b"".join(lines)[:100] + TRUNCATION_MARKER.encode()
+        assert 1000 <= previous.stat().st_size < 1110
+        assert current.stat().st_size <= 1110
+        text = read_output(path)
+        assert text.endswith(b"".join(lines[-100:]).decode())
+        print(f"  {len(lines) * 11} octets -> {len(text)} conservés")
+
+        # Dernières lignes, y compris à cheval sur deux segments
+        expected = [line.decode().rstrip("\n") for line in lines]
+        tail_lines = current.read_bytes().count(b"\n")
+        for n in (1, 5, tail_lines, tail_lines + 1, tail_lines + 50):
+            assert read_last_lines(path, n) == expected[-n:], n
+        assert read_last_lines(path, 10_000)[0] == "line 00000"
+        assert read_last_lines(Path(tmpdir) / "absent", 5) == []
+
+        remove_output(path)
+        assert output_segments(path) == []
+
+    print("  OK!")
+
+
+def test_capture_signals():
+    """Test: la capture reproduit le code de sortie ou le signal de l'agent."""
+    print("Test: task_runner capture...")
+
+    import subprocess
+
+    import task_runner
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for script, expected in (("echo sortie; exit 4", 4), ("kill -9 $$", -9), ("kill -15 $$", -15)):
+            result = subprocess.run(
+                [sys.executable, task_runner.__file__, "capture",
+                 f"{tmpdir}/out", f"{tmpdir}/err", "--", "sh", "-c", script],
+                capture_output=True, text=True, timeout=30
+            )
+            assert result.returncode == expected, (script, result.returncode, result.stderr)
+            assert not result.stderr  # Pas de traceback dans la capture
+            if expected == 4:
+                assert task_runner.read_output(Path(tmpdir) / "out") == "sortie\n"
+
+    print("  OK!")
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests de task_runner")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_reaper,
+        test_detached_launcher,
+        test_admission_queue,
+        test_queued_orphans,
+        test_capped_output,
+        test_capture_signals
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Tests du moteur DAG de workflow_coordinator.
+Vérifie la construction du DAG, l'ordre topologique, le chemin critique et l'exécution.
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def test_build_dag():
+    """Test: depends_on en parallèle, chaînage topologique en séquentiel, erreurs."""
+    print("Test: workflow build_dag...")
+
+    from workflow_coordinator import DEFAULT_TEMPLATES, build_dag, positive_int
+
+    assert DEFAULT_TEMPLATES["daily_maintenance"]["parallel"]  # Sinon ses depends_on sont sans effet
+    steps = DEFAULT_TEMPLATES["daily_maintenance"]["agents"]
+    parallel = build_dag(steps, parallel=True)
+    assert parallel == {
+        "sys_health": [], "security_quick": [], "claude_cleaner": [],
+        "backup": ["sys_health", "claude_cleaner"]
+    }
+    sequential = build_dag(steps, parallel=False)
+    assert sequential == {
+        "sys_health": [], "security_quick": ["sys_health"],
+        "claude_cleaner": ["security_quick"], "backup": ["claude_cleaner"]
+    }
+
+    # Séquentiel: une dépendance déclarée vers une étape plus loin est respectée
+    steps = [
+        {"id": "report", "cmd": "true", "depends_on": ["scan"]},
+        {"id": "scan", "cmd": "true"}
+    ]
+    assert build_dag(steps) == {"scan": [], "report": ["scan"]}
+    print(f"  Séquentiel: {' -> '.join(build_dag(steps))}")
+
+    for bad in (
+        [{"id": "a", "cmd": "true"}, {"id": "a", "cmd": "true"}],
+        [{"id": "a", "cmd": "true", "depends_on": ["z"]}],
+        [{"id": "a", "cmd": "true", "depends_on": ["b"]}, {"id": "b", "cmd": "true", "depends_on": ["a"]}]
+    ):
+        try:
+            build_dag(bad, parallel=True)
+        except ValueError as e:
+            print(f"  Rejeté: {e}")
+        else:
+            raise AssertionError(f"DAG invalide accepté: {bad}")
+
+    assert positive_int("3") == 3
+    try:
+        positive_int("0")
+    except argparse.ArgumentTypeError:
+        pass
+    else:
+        raise AssertionError("--workers 0 accepté")
+
+    print("  OK!")
+
+
+def test_critical_path():
+    """Test: ordre topologique stable et plus long chemin pondéré."""
+    print("Test: workflow critical_path...")
+
+    from workflow_coordinator import critical_path, topological_order
+
+    deps = {"a": [], "b": [], "c": ["a"], "d": ["b", "c"], "e": ["a"]}
+    assert topological_order(deps) == ["a", "b", "c", "e", "d"]
+
+    path, length = critical_path(deps, {"a": 2.0, "b": 5.0, "c": 4.0, "d": 1.0, "e": 10.0})
+    assert path == ["a", "e"] and length == 12.0
+    path, length = critical_path(deps, {"a": 2.0, "b": 5.0, "c": 4.0, "d": 1.0, "e": 1.0})
+    assert path == ["a", "c", "d"] and length == 7.0
+    assert critical_path({}, {}) == ([], 0.0)
+    print(f"  Chemin critique: {' -> '.join(path)} ({length}s)")
+
+    print("  OK!")
+
+
+def test_run_dag():
+    """Test: exécution respectant les dépendances, contexte des ancêtres transmis."""
+    print("Test: workflow run_dag...")
+
+    import json
+    from workflow_coordinator import build_dag, run_dag
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        steps = [
+            {"id": "first", "cmd": "sleep 0.2; echo premier", "resource": "network"},
+            {"id": "other", "cmd": "echo autre", "resource": "network"},
+            {"id": "last", "cmd": "cat \"$AURA_WORKFLOW_CONTEXT\"", "resource": "network",
+             "depends_on": ["first"]}
+        ]
+        results, timing = run_dag(steps, build_dag(steps, parallel=True), Path(tmpdir), {"workflow": "test"})
+
+        assert list(results) == ["first", "other", "last"]
+        assert all(r["status"] == "success" for r in results.values())
+        assert results["last"]["started_offset"] >= 0.2  # Après le sleep de "first"
+        assert results["other"]["started_offset"] < 0.2  # Indépendante: en même temps
+        context = json.loads(results["last"]["output"])
+        assert [r["agent_id"] for r in context["previous_results"]] == ["first"]
+        assert context["previous_results"][0]["summary"].strip() == "premier"
+        assert timing["critical_path"] == ["first", "last"]
+        print(f"  Mur: {timing['wall_time']:.2f}s, cumul: {timing['total_time']:.2f}s")
+
+    print("  OK!")
+
+
+def main():
+    """Lance tous les tests."""
+    print("=" * 50)
+    print("Tests de workflow_coordinator")
+    print("=" * 50)
+    print()
+
+    tests = [
+        test_build_dag,
+        test_critical_path,
+        test_run_dag
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"  ÉCHEC: {e}")
+            failed += 1
+        print()
+
+    print("=" * 50)
+    print(f"Résultats: {passed} passés, {failed} échoués")
+    print("=" * 50)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
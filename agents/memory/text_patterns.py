@@ -0,0 +1,149 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Aura Text Patterns - Extraction textuelle pure pour la consolidation.
+Fonctions sans état ni dépendance lourde (ChromaDB, modèles), utilisables
+telles quelles dans des processus workers: mêmes entrées, mêmes sorties.
+"""
+
+import re
+from collections import defaultdict
+
+# Patterns d'extraction de triplets: (regex, prédicat[, sujet par défaut])
+TRIPLE_PATTERNS = [
+    # "X est un Y"
+    (re.compile(r"(\w+(?:\s+\w+)?)\s+est\s+un[e]?\s+(\w+(?:\s+\w+)?)", re.IGNORECASE), "is_a"),
+    # "X utilise Y"
+    (re.compile(r"(\w+(?:\s+\w+)?)\s+utilise\s+(\w+(?:\s+\w+)?)", re.IGNORECASE), "uses"),
+    # "X dépend de Y"
+    (re.compile(r"(\w+(?:\s+\w+)?)\s+dépend\s+de\s+(\w+(?:\s+\w+)?)", re.IGNORECASE),
+     "depends_on"),
+    # "X préfère Y"
+    (re.compile(r"l'?utilisateur\s+préfère\s+(\w+(?:\s+\w+)?)", re.IGNORECASE),
+     "prefers", "utilisateur"),
+    # "X a Y"
+    (re.compile(r"(\w+(?:\s+\w+)?)\s+a\s+(\w+(?:\s+\w+)?)", re.IGNORECASE), "has"),
+    # "X peut Y"
+    (re.compile(r"(\w+(?:\s+\w+)?)\s+peut\s+(\w+(?:\s+\w+)?)", re.IGNORECASE), "can"),
+]
+
+EXTRACTED_CONFIDENCE = 0.7
+ENTITY_CONFIDENCE = 0.9
+
+
+def find_triples(text: str) -> list[tuple[str, str, str]]:
+    """
+    Trouve les triplets (sujet, prédicat, objet) exprimés dans un texte.
+
+    Args:
+        text: Texte à analyser
+
+    Returns:
+        Triplets dans l'ordre des patterns puis des occurrences
+    """
+    triples = []
+    for pattern_tuple in TRIPLE_PATTERNS:
+        if len(pattern_tuple) == 3:
+            pattern, predicate, default_subject = pattern_tuple
+            for match in pattern.finditer(text):
+                triples.append((default_subject, predicate, match.group(1)))
+        else:
+            pattern, predicate = pattern_tuple
+            for match in pattern.finditer(text):
+                triples.append((match.group(1), predicate, match.group(2)))
+    return triples
+
+
+def find_common_pattern(texts: list[str]) -> str:
+    """Trouve le pattern commun dans une liste de textes."""
+    if not texts:
+        return ""
+
+    # Tokenizer simple
+    word_sets = [set(t.lower().split()) for t in texts]
+
+    # Intersection des mots
+    common_words = word_sets[0]
+    for ws in word_sets[1:]:
+        common_words &= ws
+
+    # Prendre le premier texte et garder seulement les mots communs
+    first_words = texts[0].split()
+    pattern = " ".join(w for w in first_words if w.lower() in common_words)
+
+    return pattern if pattern else texts[0][:100]
+
+
+def extract_trigger_conditions(contexts: list[str]) -> list[str]:
+    """Extrait les conditions déclencheuses depuis les contextes."""
+    # Mots-clés fréquents dans les contextes
+    word_freq = defaultdict(int)
+    for ctx in contexts:
+        for word in ctx.lower().split():
+            if len(word) > 3:  # Ignorer les petits mots
+                word_freq[word] += 1
+
+    # Garder les mots présents dans au moins la moitié des contextes
+    threshold = len(contexts) / 2
+    common_keywords = [w for w, c in word_freq.items() if c >= threshold]
+
+    return common_keywords[:5]  # Max 5 conditions
+
+
+def generalize_action(action: str) -> str:
+    """Généralise une action en template avec placeholders."""
+    template = action
+
+    # Remplacer les chemins
+    template = re.sub(r'/[\w/.-]+', '{{PATH}}', template)
+
+    # Remplacer les nombres
+    template = re.sub(r'\b\d+\b', '{{NUMBER}}', template)
+
+    # Remplacer les chaînes entre guillemets
+    template = re.sub(r'"[^"]*"', '{{STRING}}', template)
+    template = re.sub(r"'[^']*'", '{{STRING}}', template)
+
+    return template
+
+
+def plan_skill(payload: tuple[list[str], list[str]]) -> dict:
+    """
+    Calcule les composants d'un skill depuis un groupe d'épisodes.
+
+    Args:
+        payload: (actions, contextes) du groupe, médoïde en tête
+
+    Returns:
+        pattern, trigger_conditions, action_template
+    """
+    actions, contexts = payload
+    common_action = find_common_pattern(actions)
+    return {
+        "pattern": common_action,
+        "trigger_conditions": extract_trigger_conditions(contexts),
+        "action_template": generalize_action(common_action)
+    }
+
+
+def plan_episode_knowledge(
+    payload: tuple[str, str, list[str]]
+) -> list[tuple[str, str, str, float]]:
+    """
+    Calcule les triplets à créer pour un épisode.
+
+    Args:
+        payload: (id court de l'épisode, texte combiné, entités)
+
+    Returns:
+        Liste de (sujet, prédicat, objet, confiance)
+    """
+    short_id, text, entities = payload
+    planned = [
+        (subject, predicate, obj, EXTRACTED_CONFIDENCE)
+        for subject, predicate, obj in find_triples(text)
+    ]
+    planned.extend(
+        (entity, "mentioned_in", f"episode_{short_id}", ENTITY_CONFIDENCE)
+        for entity in entities
+    )
+    return planned
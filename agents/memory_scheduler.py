@@ -7,22 +7,33 @@ Team: core (memory)
 
 Features:
 - Consolidation épisodes → skills (quotidienne)
-- Nettoyage des vieux épisodes (hebdomadaire)
+- Rétention: archivage des vieux épisodes consolidés (hebdomadaire)
 - Indexation RAG incrémentale
 - Garbage collection
 
+Les tâches mémoire s'exécutent dans le processus, sur une MemoryAPI dont les
+modèles restent chargés (mode daemon) mais dont l'état est relu depuis le
+disque avant chaque tâche; seules les tâches d'autres agents lancent un
+subprocess. La planification (jitter, report selon la
+charge) est celle de scheduling_core, partagée avec system_scheduler.
+
 Usage:
   python3 memory_scheduler.py run      # Lance les tâches dues
+  python3 memory_scheduler.py daemon   # Boucle continue, MemoryAPI gardée chaude
   python3 memory_scheduler.py status   # État des tâches
   python3 memory_scheduler.py force TASK  # Force une tâche
 """
 
 import argparse
 import json
+import os
 import subprocess
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any, Callable
+
+from scheduling_core import Job, SchedulingEngine
 
 
 SCHEDULER_DIR = Path.home() / ".aura" / "scheduler"
@@ -31,6 +42,14 @@ SCHEDULER_DIR.mkdir(parents=True, exist_ok=True)
 STATE_FILE = SCHEDULER_DIR / "memory_state.json"
 LOG_FILE = SCHEDULER_DIR / "memory_scheduler.log"
 
+# Processus workers de la consolidation (la moitié des CPU, laisse la machine réactive)
+CONSOLIDATION_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Tâches exécutées en série: elles partagent la même MemoryAPI
+MAX_WORKERS = 1
+# Délai avant une nouvelle tentative après un échec (mode daemon)
+RETRY_DELAY = timedelta(minutes=30)
+
 
 class ScheduledTask:
     """Définition d'une tâche planifiée."""
@@ -38,39 +57,41 @@ class ScheduledTask:
     def __init__(
         self,
         name: str,
-        command: list[str],
         interval_hours: float,
         description: str = "",
-        on_failure: str = "continue"
+        on_failure: str = "continue",
+        command: list[str] | None = None,
+        action: Callable[[Any], dict] | None = None,
+        jitter_minutes: float = 0,
+        defer_on_load: bool = False
     ):
         self.name = name
-        self.command = command
+        self.command = command  # Subprocess (autres agents)
+        self.action = action    # Callable recevant la MemoryAPI (dans le processus)
         self.interval_hours = interval_hours
         self.description = description
         self.on_failure = on_failure  # continue, retry, stop
+        self.jitter_minutes = jitter_minutes
+        self.defer_on_load = defer_on_load
 
 
 # Tâches de maintenance mémoire
 SCHEDULED_TASKS = [
     ScheduledTask(
         name="consolidate_memory",
-        command=[
-            sys.executable,
-            str(Path.home() / ".aura/agents/memory/memory_api.py"),
-            "consolidate"
-        ],
+        action=lambda api: api.consolidate(workers=CONSOLIDATION_WORKERS),
         interval_hours=24,
-        description="Consolide les épisodes en skills"
+        description="Consolide les épisodes en skills",
+        jitter_minutes=30,
+        defer_on_load=True
     ),
     ScheduledTask(
         name="cleanup_old_episodes",
-        command=[
-            sys.executable,
-            str(Path.home() / ".aura/agents/memory_manager.py"),
-            "cleanup", "--days", "30"
-        ],
+        action=lambda api: api.apply_retention(days=30),
         interval_hours=168,  # 7 jours
-        description="Nettoie les vieux épisodes"
+        description="Archive les vieux épisodes consolidés",
+        jitter_minutes=60,
+        defer_on_load=True
     ),
     ScheduledTask(
         name="reindex_rag",
@@ -80,7 +101,9 @@ SCHEDULED_TASKS = [
             "index", str(Path.home() / ".aura")
         ],
         interval_hours=72,  # 3 jours
-        description="Réindexe les documents RAG"
+        description="Réindexe les documents RAG",
+        jitter_minutes=60,
+        defer_on_load=True
     ),
     ScheduledTask(
         name="analyze_patterns",
@@ -90,7 +113,8 @@ SCHEDULED_TASKS = [
             "meta", "--count", "50"
         ],
         interval_hours=12,
-        description="Analyse les patterns de réflexion"
+        description="Analyse les patterns de réflexion",
+        jitter_minutes=15
     ),
 ]
 
@@ -98,17 +122,34 @@ SCHEDULED_TASKS = [
 class MemoryScheduler:
     """Gestionnaire de tâches planifiées pour la mémoire."""
 
-    def __init__(self):
+    def __init__(self, api: Any = None, max_workers: int = MAX_WORKERS):
         self.state = self._load_state()
+        self._api = api
+        self.engine = SchedulingEngine(
+            max_workers=max_workers,
+            on_finish=self._on_finish,
+            deferred_since=self.state["deferred_since"]  # Persisté: le report maximal vaut entre deux `run`
+        )
+        self._tasks = {task.name: task for task in SCHEDULED_TASKS}
+
+    @property
+    def api(self):
+        """MemoryAPI chargée à la première tâche, puis réutilisée."""
+        if self._api is None:
+            sys.path.insert(0, str(Path(__file__).parent / "memory"))
+            from memory_api import MemoryAPI
+            self._api = MemoryAPI()
+        return self._api
 
     def _load_state(self) -> dict:
         """Charge l'état des exécutions."""
+        state = {"last_run": {}, "next_run": {}, "run_count": {}, "failures": {}, "deferred_since": {}}
         if STATE_FILE.exists():
             try:
-                return json.loads(STATE_FILE.read_text())
+                state.update(json.loads(STATE_FILE.read_text()))
             except Exception:
                 pass
-        return {"last_run": {}, "run_count": {}, "failures": {}}
+        return state
 
     def _save_state(self) -> None:
         """Sauvegarde l'état."""
@@ -121,43 +162,40 @@ class MemoryScheduler:
             f.write(f"[{timestamp}] {message}\n")
         print(f"[{timestamp}] {message}")
 
-    def is_due(self, task: ScheduledTask) -> bool:
-        """Vérifie si une tâche doit être exécutée."""
+    def next_run(self, task: ScheduledTask) -> datetime | None:
+        """Prochaine exécution (None: jamais exécutée)."""
+        next_run_str = self.state["next_run"].get(task.name)
+        if next_run_str:
+            return datetime.fromisoformat(next_run_str)
         last_run_str = self.state["last_run"].get(task.name)
         if not last_run_str:
-            return True
+            return None
+        return datetime.fromisoformat(last_run_str) + timedelta(hours=task.interval_hours)
 
-        last_run = datetime.fromisoformat(last_run_str)
-        next_run = last_run + timedelta(hours=task.interval_hours)
-        return datetime.now() >= next_run
+    def is_due(self, task: ScheduledTask) -> bool:
+        """Vérifie si une tâche doit être exécutée."""
+        next_run = self.next_run(task)
+        return next_run is None or datetime.now() >= next_run
 
     def time_until_next(self, task: ScheduledTask) -> timedelta | None:
         """Calcule le temps jusqu'à la prochaine exécution."""
-        last_run_str = self.state["last_run"].get(task.name)
-        if not last_run_str:
+        next_run = self.next_run(task)
+        if next_run is None:
             return timedelta(0)
-
-        last_run = datetime.fromisoformat(last_run_str)
-        next_run = last_run + timedelta(hours=task.interval_hours)
         delta = next_run - datetime.now()
         return delta if delta.total_seconds() > 0 else timedelta(0)
 
-    def run_task(self, task: ScheduledTask, force: bool = False) -> bool:
-        """
-        Exécute une tâche.
-
-        Args:
-            task: La tâche à exécuter
-            force: Forcer l'exécution même si pas due
-
-        Returns:
-            True si succès
-        """
-        if not force and not self.is_due(task):
-            return True
+    # === Exécution ===
 
+    def _execute(self, task: ScheduledTask) -> dict:
+        """Exécute une tâche: callable sur la MemoryAPI, sinon subprocess."""
         self._log(f"Starting task: {task.name}")
 
+        if task.action is not None:
+            # D'autres processus ont pu écrire depuis la tâche précédente
+            self.api.refresh()
+            return {"status": "success", "result": task.action(self.api)}
+
         try:
             result = subprocess.run(
                 task.command,
@@ -165,51 +203,92 @@ class MemoryScheduler:
                 text=True,
                 timeout=300  # 5 minutes max
             )
-
-            if result.returncode == 0:
-                self._log(f"Task {task.name} completed successfully")
-                self.state["last_run"][task.name] = datetime.now().isoformat()
-                self.state["run_count"][task.name] = self.state["run_count"].get(task.name, 0) + 1
-                self.state["failures"].pop(task.name, None)
-                self._save_state()
-                return True
-            else:
-                self._log(f"Task {task.name} failed: {result.stderr}")
-                self.state["failures"][task.name] = {
-                    "time": datetime.now().isoformat(),
-                    "error": result.stderr[:500]
-                }
-                self._save_state()
-                return False
-
         except subprocess.TimeoutExpired:
-            self._log(f"Task {task.name} timed out")
+            return {"status": "timeout", "error": "Timeout after 300s"}
+        if result.returncode != 0:
+            return {"status": "failed", "error": result.stderr}
+        return {"status": "success"}
+
+    def _job(self, task: ScheduledTask) -> Job:
+        return Job(
+            key=task.name,
+            action=lambda: self._execute(task),
+            interval=timedelta(hours=task.interval_hours),
+            jitter=task.jitter_minutes * 60,
+            defer_on_load=task.defer_on_load
+        )
+
+    def _on_finish(self, job: Job, result: dict) -> datetime:
+        """Enregistre le résultat d'une exécution; retourne la prochaine échéance."""
+        task = self._tasks[job.key]
+        now = datetime.now()
+
+        if result["status"] == "success":
+            self._log(f"Task {task.name} completed successfully")
+            next_run = job.next_after(now)
+            self.state["last_run"][task.name] = now.isoformat()
+            self.state["next_run"][task.name] = next_run.isoformat()
+            self.state["run_count"][task.name] = self.state["run_count"].get(task.name, 0) + 1
+            self.state["failures"].pop(task.name, None)
+        else:
+            error = result.get("error", "")
+            self._log(f"Task {task.name} failed: {error}")
             self.state["failures"][task.name] = {
-                "time": datetime.now().isoformat(),
-                "error": "Timeout after 300s"
+                "time": now.isoformat(),
+                "error": error[:500]
             }
-            self._save_state()
-            return False
+            next_run = now + RETRY_DELAY
 
-        except Exception as e:
-            self._log(f"Task {task.name} error: {e}")
-            self.state["failures"][task.name] = {
-                "time": datetime.now().isoformat(),
-                "error": str(e)
-            }
-            self._save_state()
-            return False
+        self._save_state()
+        return next_run
 
-    def run_all_due(self) -> dict:
-        """Exécute toutes les tâches dues."""
-        results = {}
+    def run_task(self, task: ScheduledTask, force: bool = False) -> bool:
+        """
+        Exécute une tâche.
+
+        Args:
+            task: La tâche à exécuter
+            force: Forcer l'exécution même si pas due
+
+        Returns:
+            True si succès
+        """
+        if not force and not self.is_due(task):
+            return True
+        return self.engine.run_now(self._job(task))["status"] == "success"
+
+    def _schedule_all(self) -> None:
+        """Place toutes les tâches dans le moteur à leur prochaine échéance."""
         for task in SCHEDULED_TASKS:
-            if self.is_due(task):
-                results[task.name] = self.run_task(task)
+            self.engine.schedule(self._job(task), self.next_run(task))
+
+    def run_all_due(self) -> dict:
+        """Exécute toutes les tâches dues (les tâches lourdes sont reportées si la machine est chargée)."""
+        results = {task.name: None for task in SCHEDULED_TASKS}  # None: pas due
+        self._schedule_all()
+        for job, result in self.engine.run_pending():
+            if result["status"] == "deferred":
+                self._log(f"Task {job.key} deferred (load {result['load_per_cpu']}/CPU)")
+                results[job.key] = "deferred"
             else:
-                results[task.name] = None  # Not due
+                results[job.key] = result["status"] == "success"
+        if "deferred" in results.values():
+            self._save_state()
+        self.engine.clear()
         return results
 
+    def run_daemon(self) -> None:
+        """Boucle continue: dort jusqu'à la prochaine échéance, MemoryAPI gardée chaude."""
+        self._schedule_all()
+        try:
+            while True:
+                for job, result in self.engine.step():
+                    if result["status"] == "deferred":
+                        self._log(f"Task {job.key} deferred until {result['retry_at'][:19]}")
+                self.engine.wait()
+        finally:
+            self.engine.shutdown()
+
     def get_status(self) -> dict:
         """Retourne l'état de toutes les tâches."""
         status = {}
@@ -218,6 +297,7 @@ class MemoryScheduler:
             status[task.name] = {
                 "description": task.description,
                 "interval_hours": task.interval_hours,
+                "in_process": task.action is not None,
                 "last_run": self.state["last_run"].get(task.name),
                 "run_count": self.state["run_count"].get(task.name, 0),
                 "is_due": self.is_due(task),
@@ -261,6 +341,9 @@ def main():
     # run
     subparsers.add_parser("run", help="Exécute les tâches dues")
 
+    # daemon
+    subparsers.add_parser("daemon", help="Boucle continue (MemoryAPI gardée chaude)")
+
     # status
     subparsers.add_parser("status", help="Affiche l'état")
 
@@ -281,11 +364,19 @@ def main():
         for task, success in results.items():
             if success is None:
                 print(f"  ⏭️  {task}: Not due")
+            elif success == "deferred":
+                print(f"  ⏸️  {task}: Deferred (system load)")
             elif success:
                 print(f"  ✅ {task}: Success")
             else:
                 print(f"  ❌ {task}: Failed")
 
+    elif args.command == "daemon":
+        try:
+            scheduler.run_daemon()
+        except KeyboardInterrupt:
+            print("\nScheduler stopped")
+
     elif args.command == "status":
         status = scheduler.get_status()
         print_status(status)
@@ -0,0 +1,225 @@
+#!/home/tinkerbell/.aura/venv/bin/python3
+"""
+Aura Result Cache v1.0
+Mémoïsation des résultats d'agents en lecture seule, avec TTL par agent.
+
+Patterns implémentés:
+- TTL déclarés dans agents_manifest.json ("cache_ttl": secondes, ou
+  {"sous-commande": secondes, "*": défaut})
+- Cache mémoire + disque (partagé entre processus CLI)
+- Request coalescing: des appels identiques simultanés partagent une exécution
+
+Seuls les résultats réussis sont mis en cache; un agent sans cache_ttl n'est
+jamais mémoïsé ni fusionné.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable
+
+# Configuration
+AURA_DIR = Path.home() / ".aura"
+MANIFEST_FILE = AURA_DIR / "agents_manifest.json"
+RESULT_CACHE_DIR = AURA_DIR / "cache" / "agent_results"
+
+
+def load_manifest_ttls(manifest_file: Path = MANIFEST_FILE) -> dict[str, Any]:
+    """Lit les cache_ttl déclarés dans le manifest (agent -> ttl ou dict)."""
+    try:
+        manifest = json.loads(manifest_file.read_text())
+    except Exception:
+        return {}
+    return {
+        agent["id"]: agent["cache_ttl"]
+        for agent in manifest.get("agents", [])
+        if "cache_ttl" in agent
+    }
+
+
+class AgentResultCache:
+    """Cache TTL des résultats d'agents avec fusion des appels concurrents."""
+
+    def __init__(self, namespace: str, ttls: dict[str, Any] | None = None,
+                 cache_dir: Path = RESULT_CACHE_DIR):
+        self.namespace = namespace
+        self.ttls = load_manifest_ttls() if ttls is None else ttls
+        self.cache_dir = cache_dir
+        self._memory: dict[str, tuple[float, dict]] = {}  # clé -> (expiration, valeur)
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def ttl_for(self, agent: str, args: list[str] | None = None) -> float:
+        """TTL (secondes) d'un appel; 0 = pas de cache."""
+        ttl = self.ttls.get(agent, 0)
+        if isinstance(ttl, dict):
+            command = args[0] if args and not args[0].startswith("-") else None
+            ttl = ttl.get(command, ttl.get("*", 0)) if command else ttl.get("*", 0)
+        try:
+            return max(float(ttl), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def key(self, agent: str, args: list[str] | None = None) -> str:
+        """Clé d'un appel: agent, arguments et répertoire courant."""
+        raw = json.dumps([self.namespace, agent, list(args or []), os.getcwd()])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def get(self, agent: str, args: list[str] | None = None) -> dict | None:
+        """Résultat encore valide (mémoire puis disque), sinon None."""
+        key = self.key(agent, args)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry and entry[0] > now:
+            self.stats["hits"] += 1
+            return entry[1]
+
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            data = json.loads(cache_file.read_text())
+            if data["expires_at"] > now:
+                self._memory[key] = (data["expires_at"], data["value"])
+                self.stats["hits"] += 1
+                return data["value"]
+            cache_file.unlink(missing_ok=True)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self._memory.pop(key, None)
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, agent: str, args: list[str] | None, value: dict, ttl: float | None = None) -> None:
+        """Mémorise un résultat pour la durée de son TTL."""
+        ttl = self.ttl_for(agent, args) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        key = self.key(agent, args)
+        expires_at = time.time() + ttl
+        self._memory[key] = (expires_at, value)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f"{key}.tmp"
+            tmp.write_text(json.dumps({
+                "agent": agent,
+                "args": list(args or []),
+                "expires_at": expires_at,
+                "value": value
+            }, ensure_ascii=False))
+            os.replace(tmp, self.cache_dir / f"{key}.json")
+        except OSError:
+            pass
+
+    def get_or_compute(
+        self,
+        agent: str,
+        args: list[str] | None,
+        compute: Callable[[], dict],
+        is_success: Callable[[dict], bool] = lambda value: bool(value.get("success"))
+    ) -> dict:
+        """
+        Résultat en cache, sinon calculé une seule fois pour tous les appelants
+        simultanés (les autres threads attendent la même exécution).
+
+        Args:
+            agent: Nom de l'agent
+            args: Arguments de l'appel
+            compute: Exécution réelle, retourne un dict sérialisable
+            is_success: Résultat à mettre en cache ou non
+
+        Returns:
+            Résultat (avec "cached": True s'il vient du cache)
+        """
+        ttl = self.ttl_for(agent, args)
+        if ttl <= 0:
+            return compute()
+
+        cached = self.get(agent, args)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        key = self.key(agent, args)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if is_success(value):
+                self.put(agent, args, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def purge(self) -> int:
+        """Supprime les entrées expirées du disque."""
+        count = 0
+        now = time.time()
+        self._memory = {k: v for k, v in self._memory.items() if v[0] > now}
+        if not self.cache_dir.exists():
+            return 0
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                if json.loads(cache_file.read_text())["expires_at"] <= now:
+                    cache_file.unlink()
+                    count += 1
+            except (OSError, ValueError, KeyError):
+                cache_file.unlink(missing_ok=True)
+                count += 1
+        return count
+
+    def clear(self) -> int:
+        """Vide tout le cache (mémoire et disque)."""
+        self._memory.clear()
+        count = 0
+        if self.cache_dir.exists():
+            for cache_file in self.cache_dir.glob("*.json"):
+                cache_file.unlink(missing_ok=True)
+                count += 1
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aura Result Cache - Mémoïsation des agents")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("ttls", help="TTL déclarés dans le manifest")
+    subparsers.add_parser("purge", help="Supprimer les entrées expirées")
+    subparsers.add_parser("clear", help="Vider le cache")
+
+    args = parser.parse_args()
+    cache = AgentResultCache(namespace="cli")
+
+    if args.command == "ttls":
+        for agent, ttl in sorted(cache.ttls.items()):
+            print(f"{agent:<20} {ttl}")
+    elif args.command == "purge":
+        print(f"Supprimé: {cache.purge()} entrée(s) expirée(s)")
+    elif args.command == "clear":
+        print(f"Supprimé: {cache.clear()} entrée(s)")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+AURA Scheduling Core v1.0
+Moteur de planification commun à system_scheduler et memory_scheduler.
+
+Patterns implémentés:
+- Tas de jobs trié par échéance, attente exacte jusqu'à la prochaine
+- Intervalles (5m, 1h, 2d, 1w) et expressions cron à 5 champs
+- Exécution parallèle bornée (pool de threads), un job ne chevauche jamais
+  sa propre exécution
+- Jitter: décalage aléatoire des échéances pour étaler les tâches lourdes
+- Report selon la charge: un job marqué defer_on_load attend que la charge
+  par CPU redescende (au plus MAX_DEFER_SECONDS)
+
+Les jobs sont des callables Python: une commande externe n'est qu'un job
+qui lance un subprocess. La persistance de l'état reste à l'appelant
+(callback on_finish).
+"""
+
+import functools
+import heapq
+import itertools
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable
+
+# Configuration
+DEFAULT_WORKERS = 4
+MAX_LOAD_PER_CPU = 1.5          # Au-delà, les jobs defer_on_load sont reportés
+DEFER_SECONDS = 300             # Délai entre deux tentatives d'un job reporté
+MAX_DEFER_SECONDS = 6 * 3600    # Report maximal, le job s'exécute ensuite quelle que soit la charge
+
+
+def parse_interval(interval: str) -> timedelta:
+    """Parse un intervalle humain (5m, 1h, 2d, 1w)"""
+    units = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+    value = int(interval[:-1])
+    unit = interval[-1].lower()
+    if unit not in units:
+        raise ValueError(f"Unité inconnue: {unit}. Utilisez m/h/d/w")
+    return timedelta(**{units[unit]: value})
+
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+
+# (min, max) de chaque champ: minute, heure, jour du mois, mois, jour de semaine (0 et 7 = dimanche)
+CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> frozenset:
+    """Parse un champ cron (*, 5, 1-5, */15, 10-40/10, listes séparées par des virgules)"""
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"Pas invalide: {field}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start  # "5/15" = de 5 à la fin, tous les 15
+        if not low <= start <= end <= high:
+            raise ValueError(f"Valeur hors limites ({low}-{high}): {field}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpr:
+    """Expression cron à 5 champs (minute heure jour mois jour_semaine)"""
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        fields = CRON_ALIASES.get(expr.strip().lower(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"Expression cron invalide (5 champs attendus): {expr}")
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_RANGES)
+        )
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        """Jour du mois et jour de semaine: si les deux sont restreints, l'un ou l'autre suffit (comme cron)"""
+        in_days = dt.day in self.days
+        in_weekdays = dt.isoweekday() % 7 in self.weekdays
+        if self.any_day:
+            return in_weekdays
+        if self.any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        """Première échéance strictement après `after`"""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after.year + 5
+        while dt.year <= limit:
+            if dt.month not in self.months:
+                dt = datetime(dt.year + dt.month // 12, dt.month % 12 + 1, 1)
+            elif not self._day_matches(dt):
+                dt = datetime(dt.year, dt.month, dt.day) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            else:
+                minute = min((m for m in self.minutes if m >= dt.minute), default=None)
+                if minute is not None:
+                    return dt.replace(minute=minute)
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+        raise ValueError(f"Aucune échéance pour l'expression cron: {self.expr}")
+
+
+@functools.lru_cache(maxsize=256)
+def parse_cron(expr: str) -> CronExpr:
+    """Parse (et garde en cache) une expression cron"""
+    return CronExpr(expr)
+
+
+def load_per_cpu() -> float | None:
+    """Load average sur 1 minute rapporté au nombre de CPU."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return None
+
+
+class Job:
+    """Tâche planifiable: un callable et sa règle de récurrence."""
+
+    def __init__(
+        self,
+        key: str,
+        action: Callable[[], dict],
+        interval: timedelta | None = None,
+        cron: str | None = None,
+        name: str | None = None,
+        jitter: float = 0.0,
+        defer_on_load: bool = False
+    ):
+        """
+        Args:
+            key: Identifiant unique dans le moteur
+            action: Exécution, retourne un dict avec au moins "status" ("success" si réussi)
+            interval: Récurrence fixe (ignorée si cron est fourni)
+            cron: Expression cron
+            name: Nom affiché (défaut: key)
+            jitter: Décalage aléatoire maximal ajouté à chaque échéance (secondes)
+            defer_on_load: Reporter le job quand la machine est chargée
+        """
+        if cron:
+            parse_cron(cron)  # Valide l'expression dès la création
+        elif interval is None:
+            raise ValueError(f"Job {key}: interval ou cron requis")
+        self.key = key
+        self.action = action
+        self.interval = interval
+        self.cron = cron
+        self.name = name or key
+        self.jitter = jitter
+        self.defer_on_load = defer_on_load
+
+    def next_after(self, after: datetime) -> datetime:
+        """Prochaine échéance après `after`, jitter inclus."""
+        if self.cron:
+            next_run = parse_cron(self.cron).next_after(after)
+        else:
+            next_run = after + self.interval
+        if self.jitter > 0:
+            next_run += timedelta(seconds=random.uniform(0, self.jitter))
+        return next_run
+
+    def execute(self) -> dict:
+        """Exécute l'action; les exceptions deviennent un résultat "error"."""
+        started = datetime.now()
+        try:
+            result = dict(self.action() or {})
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        result.setdefault("status", "success")
+        result.setdefault("task_name", self.name)
+        result.setdefault("started", started.isoformat())
+        result.setdefault("duration", (datetime.now() - started).total_seconds())
+        return result
+
+
+class SchedulingEngine:
+    """
+    Moteur de planification.
+
+    Les jobs sont dans un tas (échéance, seq, clé); une entrée dont
+    l'échéance ne correspond plus à self._due est caduque et ignorée.
+    Les résultats des workers passent par une file lue par le thread
+    appelant (step/run_pending): seul lui modifie le tas et appelle
+    on_finish.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        on_finish: Callable[[Job, dict], datetime | None] | None = None,
+        max_load_per_cpu: float = MAX_LOAD_PER_CPU,
+        defer_seconds: float = DEFER_SECONDS,
+        max_defer_seconds: float = MAX_DEFER_SECONDS,
+        deferred_since: dict[str, float] | None = None
+    ):
+        """
+        Args:
+            max_workers: Jobs exécutés simultanément
+            on_finish: Appelé après chaque exécution avec le job et son résultat;
+                retourne la prochaine échéance (None = ne pas replanifier).
+                Par défaut: job.next_after(début de l'exécution).
+            max_load_per_cpu: Seuil de charge des jobs defer_on_load
+            defer_seconds: Délai entre deux tentatives d'un job reporté
+            max_defer_seconds: Report maximal d'un job
+            deferred_since: Début du report de chaque job (timestamp), partagé avec
+                l'appelant pour être persisté entre deux processus
+        """
+        self.max_workers = max_workers
+        self.on_finish = on_finish
+        self.max_load_per_cpu = max_load_per_cpu
+        self.defer_seconds = defer_seconds
+        self.max_defer_seconds = max_defer_seconds
+        self.jobs: dict[str, Job] = {}
+        self.running: set[str] = set()
+        self._heap: list[tuple[float, int, str]] = []
+        self._due: dict[str, float] = {}
+        self.deferred_since: dict[str, float] = {} if deferred_since is None else deferred_since
+        self._seq = itertools.count()
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._wakeup = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduler")
+
+    # === Planification ===
+
+    def schedule(self, job: Job, at: datetime | None = None) -> None:
+        """Ajoute ou replanifie un job (at=None: dès que possible)."""
+        self.jobs[job.key] = job
+        if job.key in self.running:
+            return  # Replanifié à la fin de son exécution
+        due = at.timestamp() if at else time.time()
+        self._due[job.key] = due
+        heapq.heappush(self._heap, (due, next(self._seq), job.key))
+        self._wakeup.set()
+
+    def unschedule(self, key: str) -> None:
+        """Retire un job (une exécution en cours se termine normalement)."""
+        self.jobs.pop(key, None)
+        self._due.pop(key, None)
+
+    def clear(self) -> None:
+        """Retire tous les jobs."""
+        for key in list(self.jobs):
+            self.unschedule(key)
+        self._heap = []
+
+    def next_due(self, key: str) -> datetime | None:
+        """Échéance planifiée d'un job."""
+        due = self._due.get(key)
+        return datetime.fromtimestamp(due) if due is not None else None
+
+    # === Exécution ===
+
+    def _dispatch(self, job: Job) -> None:
+        self._due.pop(job.key, None)
+        self.deferred_since.pop(job.key, None)
+        self.running.add(job.key)
+
+        def done(future):
+            self._done.put((job, future))
+            self._wakeup.set()
+
+        self._executor.submit(job.execute).add_done_callback(done)
+
+    def _should_defer(self, job: Job, now: float) -> float | None:
+        """Charge courante si le job doit être reporté, sinon None."""
+        if not job.defer_on_load:
+            return None
+        load = load_per_cpu()
+        if load is None or load <= self.max_load_per_cpu:
+            return None
+        since = self.deferred_since.setdefault(job.key, now)
+        if now - since >= self.max_defer_seconds:
+            return None
+        return load
+
+    def _dispatch_due(self, until: float) -> list[tuple[Job, dict]]:
+        """Lance les jobs échus avant `until`; retourne les reports."""
+        deferred = []
+        now = time.time()
+        while self._heap and self._heap[0][0] <= until and len(self.running) < self.max_workers:
+            due, _, key = heapq.heappop(self._heap)
+            if self._due.get(key) != due or key in self.running or key not in self.jobs:
+                continue  # Entrée caduque
+            job = self.jobs[key]
+            load = self._should_defer(job, now)
+            if load is not None:
+                retry = now + self.defer_seconds
+                self._due[key] = retry
+                heapq.heappush(self._heap, (retry, next(self._seq), key))
+                deferred.append((job, {
+                    "task_name": job.name,
+                    "status": "deferred",
+                    "load_per_cpu": round(load, 2),
+                    "retry_at": datetime.fromtimestamp(retry).isoformat()
+                }))
+                continue
+            self._dispatch(job)
+        return deferred
+
+    def _finish(self, job: Job, result: dict) -> None:
+        """Replanifie un job après son exécution."""
+        self.running.discard(job.key)
+        if self.on_finish is not None:
+            next_run = self.on_finish(job, result)
+        else:
+            now = datetime.now()
+            next_run = job.next_after(datetime.fromisoformat(result["started"]))
+            if next_run <= now:
+                next_run = job.next_after(now)  # Pas de rattrapage en rafale
+        current = self.jobs.get(job.key)
+        if next_run is not None and current is not None:
+            self.schedule(current, next_run)
+
+    def collect(self) -> list[tuple[Job, dict]]:
+        """Traite les exécutions terminées et replanifie leurs jobs."""
+        finished = []
+        while True:
+            try:
+                job, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            result = future.result()  # Job.execute ne lève pas
+            self._finish(job, result)
+            finished.append((job, result))
+        return finished
+
+    def step(self) -> list[tuple[Job, dict]]:
+        """Un tour: exécutions terminées, puis lancement des jobs échus."""
+        self._wakeup.clear()
+        finished = self.collect()
+        return finished + self._dispatch_due(time.time())
+
+    def next_timeout(self, poll_interval: float | None = None) -> float | None:
+        """Secondes avant la prochaine échéance (None: attendre un réveil)."""
+        timeout = None
+        if self._heap and len(self.running) < self.max_workers:
+            timeout = max(self._heap[0][0] - time.time(), 0.0)
+        if poll_interval is not None:
+            timeout = poll_interval if timeout is None else min(timeout, poll_interval)
+        return timeout
+
+    def wait(self, poll_interval: float | None = None) -> None:
+        """Dort jusqu'à la prochaine échéance, une fin d'exécution ou wake()."""
+        self._wakeup.wait(self.next_timeout(poll_interval))
+
+    def wake(self) -> None:
+        """Réveille la boucle (ex: configuration modifiée)."""
+        self._wakeup.set()
+
+    def run_pending(self) -> list[tuple[Job, dict]]:
+        """
+        Exécute une fois les jobs échus maintenant et attend leur fin.
+
+        Les jobs reportés figurent dans le résultat avec le statut "deferred";
+        les replanifications après exécution ne sont pas relancées.
+        """
+        until = time.time()
+        results = self._dispatch_due(until)
+        while self.running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            results += self.collect()
+            results += self._dispatch_due(until)
+        return results
+
+    def run_now(self, job: Job) -> dict:
+        """Exécute un job immédiatement dans le thread appelant (sans report)."""
+        if job.key in self.running:
+            return {"task_name": job.name, "status": "error", "error": "Exécution déjà en cours"}
+        self.jobs.setdefault(job.key, job)
+        self._due.pop(job.key, None)
+        self.running.add(job.key)
+        result = job.execute()
+        self._finish(job, result)
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -58,9 +58,16 @@ class SelfReflectionAgent:
         "very_low": {"score": 0.20, "desc": "Likely incorrect, needs intervention"}
     }
 
+    # Une ligne sur OFFSET_STRIDE a son offset dans l'index
+    OFFSET_STRIDE = 1000
+    # Fenêtre des statistiques (dernières réflexions)
+    STATS_WINDOW = 1000
+
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
         self.reflections_file = REFLECTION_DIR / "reflection_log.jsonl"
+        # Index sidecar: octets déjà agrégés, offsets de lignes, compteurs cumulés
+        self.index_file = REFLECTION_DIR / "reflection_log.index.json"
 
     def reflect_on_task(
         self,
@@ -290,30 +297,134 @@ class SelfReflectionAgent:
         }
 
     def _save_reflection(self, reflection: dict) -> None:
-        """Sauvegarde une réflexion dans le log."""
+        """Sauvegarde une réflexion dans le log et met à jour l'index."""
+        line = json.dumps(reflection, ensure_ascii=False) + "\n"
         with open(self.reflections_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(reflection, ensure_ascii=False) + "\n")
+            offset = f.tell()
+            f.write(line)
+
+        index = self._load_index()
+        if index["size"] == offset:
+            self._aggregate(index, reflection, offset)
+            index["size"] = offset + len(line.encode("utf-8"))
+            self._save_index(index)
+        else:
+            # Écriture concurrente ou log modifié: rattraper depuis l'index
+            self._sync_index()
 
-    def _load_recent_reflections(self, count: int) -> list[dict]:
-        """Charge les réflexions récentes."""
-        if not self.reflections_file.exists():
+    def _tail_lines(self, count: int) -> list[str]:
+        """
+        Lit les `count` dernières réflexions: l'index donne l'offset de la ligne
+        de départ (à OFFSET_STRIDE lignes près), sans parcourir le début du log.
+        """
+        if count <= 0 or not self.reflections_file.exists():
             return []
 
+        index = self._sync_index()
+        start_line = max(0, index["lines"] - count)
+        checkpoint = start_line // self.OFFSET_STRIDE
+        to_skip = start_line - checkpoint * self.OFFSET_STRIDE
+
+        lines = []
+        with open(self.reflections_file, "rb") as f:
+            f.seek(index["offsets"][checkpoint] if checkpoint < len(index["offsets"]) else 0)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Ligne en cours d'écriture
+                try:
+                    json.loads(raw)
+                except json.JSONDecodeError:
+                    continue  # Comme l'index: seules les lignes valides comptent
+                if to_skip:
+                    to_skip -= 1
+                    continue
+                lines.append(raw.decode("utf-8"))
+
+        return lines[-count:]
+
+    def _load_recent_reflections(self, count: int) -> list[dict]:
+        """Charge les réflexions récentes (lecture depuis la fin du log)."""
         reflections = []
-        with open(self.reflections_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
+        for line in self._tail_lines(count):
+            try:
+                reflections.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+        return reflections
+
+    @staticmethod
+    def _empty_index() -> dict:
+        """Index vide: rien d'agrégé."""
+        return {"size": 0, "lines": 0, "offsets": [], "by_type": {}, "tasks": 0, "task_successes": 0}
+
+    def _load_index(self) -> dict:
+        """Charge l'index sidecar."""
+        if self.index_file.exists():
+            try:
+                index = json.loads(self.index_file.read_text())
+                if "offsets" in index:  # Sinon: ancien format, à reconstruire
+                    return index
+            except (json.JSONDecodeError, OSError):
+                pass
+        return self._empty_index()
+
+    def _save_index(self, index: dict) -> None:
+        """Sauvegarde l'index sidecar (écriture atomique)."""
+        tmp_file = self.index_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(index))
+        tmp_file.replace(self.index_file)
+
+    @staticmethod
+    def _aggregate(index: dict, reflection: dict, offset: int) -> None:
+        """Ajoute une réflexion (commençant à `offset`) à l'index."""
+        rtype = reflection.get("type", "unknown")
+        if index["lines"] % SelfReflectionAgent.OFFSET_STRIDE == 0:
+            index["offsets"].append(offset)
+        index["lines"] += 1
+        index["by_type"][rtype] = index["by_type"].get(rtype, 0) + 1
+        if rtype == "task_completion":
+            index["tasks"] += 1
+            if reflection.get("success"):
+                index["task_successes"] += 1
+
+    def _sync_index(self) -> dict:
+        """
+        Met l'index à jour avec les octets ajoutés depuis le dernier passage.
+        Reconstruit l'index si le log a été tronqué ou remplacé.
+        """
+        index = self._load_index()
+        if not self.reflections_file.exists():
+            return self._empty_index()
+
+        size = self.reflections_file.stat().st_size
+        if size == index["size"]:
+            return index
+        if size < index["size"]:
+            index = self._empty_index()
+
+        with open(self.reflections_file, "rb") as f:
+            f.seek(index["size"])
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Ligne en cours d'écriture: la reprendre plus tard
+                offset = index["size"]
+                index["size"] += len(raw)
+                if raw.strip():
                     try:
-                        reflections.append(json.loads(line))
+                        self._aggregate(index, json.loads(raw), offset)
                     except json.JSONDecodeError:
                         continue
 
-        return reflections[-count:]
+        self._save_index(index)
+        return index
 
     def get_stats(self) -> dict:
-        """Retourne les statistiques des réflexions."""
-        reflections = self._load_recent_reflections(1000)
+        """
+        Retourne les statistiques des STATS_WINDOW dernières réflexions, plus
+        les totaux depuis le début du log ("all_time", compteurs de l'index).
+        """
+        reflections = self._load_recent_reflections(self.STATS_WINDOW)
 
         stats = {
             "total_reflections": len(reflections),
@@ -331,6 +442,13 @@ class SelfReflectionAgent:
             successes = sum(1 for r in task_refs if r.get("success"))
             stats["success_rate"] = round(successes / len(task_refs) * 100, 1)
 
+        index = self._load_index()  # Déjà synchronisé par la lecture ci-dessus
+        stats["all_time"] = {
+            "total_reflections": index["lines"],
+            "by_type": dict(index["by_type"]),
+            "success_rate": round(index["task_successes"] / index["tasks"] * 100, 1) if index["tasks"] else None
+        }
+
         return stats
 
 
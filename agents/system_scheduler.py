@@ -3,19 +3,56 @@
 AURA-OS System Scheduler Agent
 Planification intelligente de tâches avec support cron-like et événements
 Team: core
+
+La planification (tas trié par next_run, cron, exécution parallèle bornée,
+jitter, report selon la charge) est celle de scheduling_core, partagée avec
+memory_scheduler. Le daemon dort jusqu'à la prochaine échéance ou jusqu'à une
+modification de schedules.json.
+
+L'historique est un JSONL en ajout seul (rétention par taille et par âge), lu
+depuis la fin; un fichier de statistiques à côté garde les dernières durées
+de chaque tâche (p50/p95).
 """
 
 import argparse
+import fcntl
+import functools
 import json
 import os
 import subprocess
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 import hashlib
 
+from scheduling_core import DEFAULT_WORKERS, Job, SchedulingEngine, parse_cron, parse_interval
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
 SCHEDULE_FILE = Path.home() / ".aura" / "schedules.json"
-HISTORY_FILE = Path.home() / ".aura" / "schedule_history.json"
+HISTORY_FILE = Path.home() / ".aura" / "schedule_history.jsonl"
+HISTORY_STATS_FILE = Path.home() / ".aura" / "schedule_history.stats.json"
+HISTORY_LOCK_FILE = Path.home() / ".aura" / "schedule_history.lock"
+LEGACY_HISTORY_FILE = Path.home() / ".aura" / "schedule_history.json"
+
+# Rétention de l'historique: au-delà de HISTORY_MAX_BYTES, on ne garde que les
+# HISTORY_MAX_DAYS derniers jours, dans la limite de la moitié de la taille max
+HISTORY_MAX_BYTES = 5 * 1024 * 1024
+HISTORY_MAX_DAYS = 30
+HISTORY_STATS_SAMPLES = 200  # Durées gardées par tâche pour p50/p95
+HISTORY_TAIL_BLOCK = 8192
+
+# Tâches exécutées simultanément (daemon et check)
+MAX_WORKERS = DEFAULT_WORKERS
+
+_history_lock = threading.Lock()
 
 def load_schedules() -> dict:
     """Charge les tâches planifiées"""
@@ -26,33 +63,214 @@ def load_schedules() -> dict:
 def save_schedules(data: dict):
     """Sauvegarde les tâches planifiées"""
     SCHEDULE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SCHEDULE_FILE.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+    # Écriture atomique: le daemon peut relire le fichier à tout moment
+    tmp = SCHEDULE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+    os.replace(tmp, SCHEDULE_FILE)
+
+@contextmanager
+def _history_locked():
+    """Verrou de l'historique (threads du daemon et autres processus)"""
+    with _history_lock:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(HISTORY_LOCK_FILE, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                _migrate_legacy_history()
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _write_json(path: Path, data):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False))
+    os.replace(tmp, path)
+
+def _migrate_legacy_history():
+    """Convertit l'ancien historique JSON (liste complète) en JSONL"""
+    if not LEGACY_HISTORY_FILE.exists():
+        return
+    try:
+        entries = json.loads(LEGACY_HISTORY_FILE.read_text())
+    except (OSError, ValueError):
+        entries = []
+    with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    LEGACY_HISTORY_FILE.unlink()
+
+def _parse_history_lines(lines) -> list:
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue  # Ligne en cours d'écriture ou corrompue
+    return entries
+
+def _read_history() -> list:
+    if not HISTORY_FILE.exists():
+        return []
+    with open(HISTORY_FILE, "rb") as f:
+        return _parse_history_lines(f)
 
 def load_history() -> list:
-    """Charge l'historique d'exécution"""
-    if HISTORY_FILE.exists():
-        return json.loads(HISTORY_FILE.read_text())
-    return []
+    """Charge tout l'historique d'exécution (préférer read_history_tail)"""
+    if LEGACY_HISTORY_FILE.exists():
+        with _history_locked():
+            pass
+    return _read_history()
+
+def read_history_tail(limit: int = 10) -> list:
+    """Les `limit` dernières exécutions, en lisant le fichier depuis la fin"""
+    if LEGACY_HISTORY_FILE.exists():
+        with _history_locked():
+            pass
+    if limit <= 0 or not HISTORY_FILE.exists():
+        return []
 
-def save_history(history: list):
-    """Sauvegarde l'historique (garde les 100 derniers)"""
-    HISTORY_FILE.write_text(json.dumps(history[-100:], indent=2, ensure_ascii=False))
+    with open(HISTORY_FILE, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        buffer = b""
+        entries: list = []  # Du plus récent au plus ancien
+        while position > 0 and len(entries) < limit:
+            read_size = min(HISTORY_TAIL_BLOCK, position)
+            position -= read_size
+            f.seek(position)
+            # Le premier segment peut être une ligne tronquée: le garder pour le bloc suivant
+            buffer, *complete = (f.read(read_size) + buffer).split(b"\n")
+            # Seules les lignes valides comptent (pas une ligne en cours d'écriture)
+            entries.extend(_parse_history_lines(reversed(complete)))
+        if position == 0 and len(entries) < limit:
+            entries.extend(_parse_history_lines([buffer]))
+
+    return entries[:limit][::-1]
+
+def _stats_add(stats: dict, entry: dict):
+    """Compte une exécution dans les statistiques de sa tâche"""
+    task = stats["tasks"].setdefault(entry.get("task_name", "?"), {"runs": 0, "failures": 0, "durations": []})
+    task["runs"] += 1
+    if entry.get("status") != "success":
+        task["failures"] += 1
+    task["durations"].append(round(entry.get("duration", 0.0), 3))
+    del task["durations"][:-HISTORY_STATS_SAMPLES]
+
+def _build_history_stats(entries: list, size: int) -> dict:
+    stats = {"size": size, "tasks": {}}
+    for entry in entries:
+        _stats_add(stats, entry)
+    return stats
+
+def _load_history_stats() -> dict:
+    """Statistiques à jour, reconstruites si elles ne couvrent pas tout l'historique (sous verrou)"""
+    size = HISTORY_FILE.stat().st_size if HISTORY_FILE.exists() else 0
+    try:
+        stats = json.loads(HISTORY_STATS_FILE.read_text())
+        if stats.get("size") == size:
+            return stats
+    except (OSError, ValueError):
+        pass
+    stats = _build_history_stats(_read_history(), size)
+    _write_json(HISTORY_STATS_FILE, stats)
+    return stats
+
+def _compact_history(max_days: int = HISTORY_MAX_DAYS, max_bytes: int | None = None) -> tuple[dict, int]:
+    """Réécrit l'historique en gardant les entrées récentes (sous verrou)"""
+    max_bytes = HISTORY_MAX_BYTES // 2 if max_bytes is None else max_bytes
+    if not HISTORY_FILE.exists():
+        return _build_history_stats([], 0), 0
+    cutoff = (datetime.now() - timedelta(days=max_days)).isoformat()
+    with open(HISTORY_FILE, "rb") as f:
+        lines = [line for line in f if line.strip()]
+
+    kept, size = [], 0
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if entry.get("started", "") < cutoff or size + len(line) > max_bytes:
+            break
+        kept.append((line, entry))
+        size += len(line)
+    kept.reverse()
+
+    tmp = HISTORY_FILE.with_suffix(".tmp")
+    tmp.write_bytes(b"".join(line if line.endswith(b"\n") else line + b"\n" for line, _ in kept))
+    os.replace(tmp, HISTORY_FILE)
+    return _build_history_stats([entry for _, entry in kept], size), len(lines) - len(kept)
+
+def append_history(entry: dict):
+    """Ajoute une exécution à l'historique (O(1), compaction au-delà de HISTORY_MAX_BYTES)"""
+    line = (json.dumps(entry, ensure_ascii=False) + "\n").encode()
+    with _history_locked():
+        stats = _load_history_stats()
+        with open(HISTORY_FILE, "ab") as f:
+            f.write(line)
+            size = f.tell()
+        if size > HISTORY_MAX_BYTES:
+            stats, _ = _compact_history()
+        else:
+            _stats_add(stats, entry)
+            stats["size"] = size
+        _write_json(HISTORY_STATS_FILE, stats)
+
+def prune_history(max_days: int = HISTORY_MAX_DAYS) -> int:
+    """Applique la rétention (âge et taille); retourne le nombre d'entrées supprimées"""
+    with _history_locked():
+        stats, removed = _compact_history(max_days)
+        _write_json(HISTORY_STATS_FILE, stats)
+    return removed
+
+def _percentile(samples: list, q: float) -> float | None:
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+def history_stats(task_name: str | None = None) -> dict:
+    """Durées p50/p95 (sur les HISTORY_STATS_SAMPLES dernières exécutions) et taux d'échec par tâche"""
+    with _history_locked():
+        stats = _load_history_stats()
+    result = {}
+    for name, task in sorted(stats["tasks"].items()):
+        if task_name and name != task_name:
+            continue
+        result[name] = {
+            "runs": task["runs"],
+            "failures": task["failures"],
+            "p50": _percentile(task["durations"], 0.50),
+            "p95": _percentile(task["durations"], 0.95),
+        }
+    return result
 
 def generate_task_id(name: str) -> str:
     """Génère un ID unique pour une tâche"""
     return hashlib.md5(f"{name}{datetime.now().isoformat()}".encode()).hexdigest()[:8]
 
-def parse_interval(interval: str) -> timedelta:
-    """Parse un intervalle humain (5m, 1h, 2d, 1w)"""
-    units = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
-    value = int(interval[:-1])
-    unit = interval[-1].lower()
-    if unit not in units:
-        raise ValueError(f"Unité inconnue: {unit}. Utilisez m/h/d/w")
-    return timedelta(**{units[unit]: value})
-
-def add_task(name: str, command: str, interval: str, enabled: bool = True) -> dict:
-    """Ajoute une tâche planifiée"""
+def _announce_and_run(task: dict) -> dict:
+    print(f"[>] Exécution de '{task['name']}'...")
+    return run_task(task)
+
+def task_job(task: dict) -> Job:
+    """Job du moteur de planification pour une tâche de schedules.json"""
+    return Job(
+        key=task["id"],
+        action=functools.partial(_announce_and_run, task),
+        interval=None if task.get("cron") else parse_interval(task["interval"]),
+        cron=task.get("cron"),
+        name=task["name"],
+        jitter=task.get("jitter", 0),
+        defer_on_load=task.get("defer_on_load", False)
+    )
+
+def compute_next_run(task: dict, after: datetime) -> datetime:
+    """Prochaine exécution d'une tâche (cron ou intervalle, jitter inclus) après `after`"""
+    return task_job(task).next_after(after)
+
+def add_task(name: str, command: str, interval: str | None = None, enabled: bool = True,
+             cron: str | None = None, jitter: float = 0, defer_on_load: bool = False) -> dict:
+    """Ajoute une tâche planifiée (intervalle ou expression cron)"""
     data = load_schedules()
 
     # Vérifie si la tâche existe déjà
@@ -61,22 +279,44 @@ def add_task(name: str, command: str, interval: str, enabled: bool = True) -> di
             print(f"[!] Tâche '{name}' existe déjà. Utilisez 'update' pour modifier.")
             return task
 
+    now = datetime.now()
+    if cron:
+        try:
+            next_run = parse_cron(cron).next_after(now)
+        except ValueError as e:
+            print(f"[-] {e}")
+            return {}
+    elif not interval:
+        print("[-] Intervalle ou expression cron requis")
+        return {}
+    else:
+        try:
+            parse_interval(interval)
+        except ValueError as e:
+            print(f"[-] Intervalle invalide: {e}")
+            return {}
+        next_run = now
+
     task = {
         "id": generate_task_id(name),
         "name": name,
         "command": command,
         "interval": interval,
+        "cron": cron,
+        "jitter": jitter,
+        "defer_on_load": defer_on_load,
         "enabled": enabled,
-        "created": datetime.now().isoformat(),
+        "created": now.isoformat(),
         "last_run": None,
-        "next_run": datetime.now().isoformat(),
+        "next_run": next_run.isoformat(),
         "run_count": 0,
         "last_status": None
     }
 
     data["tasks"].append(task)
     save_schedules(data)
-    print(f"[+] Tâche '{name}' ajoutée (interval: {interval})")
+    schedule = f"cron: {cron}" if cron else f"interval: {interval}"
+    print(f"[+] Tâche '{name}' ajoutée ({schedule})")
     return task
 
 def remove_task(task_id: str) -> bool:
@@ -139,38 +379,51 @@ def run_task(task: dict) -> dict:
     result["ended"] = datetime.now().isoformat()
 
     # Enregistre dans l'historique
-    history = load_history()
-    history.append(result)
-    save_history(history)
+    append_history(result)
 
     return result
 
-def check_and_run() -> list:
-    """Vérifie et exécute les tâches dues"""
+def check_and_run(max_workers: int = MAX_WORKERS) -> list:
+    """Vérifie et exécute les tâches dues (en parallèle)"""
     data = load_schedules()
     now = datetime.now()
-    executed = []
-
+    tasks = {task["id"]: task for task in data["tasks"]}
+
+    def on_finish(job: Job, result: dict) -> None:
+        # Mise à jour de la tâche et calcul de la prochaine exécution
+        task = tasks[job.key]
+        task["last_run"] = now.isoformat()
+        task["run_count"] += 1
+        task["last_status"] = result["status"]
+        task["next_run"] = compute_next_run(task, now).isoformat()
+        return None  # Passage unique: pas de replanification
+
+    # Début du report de chaque tâche, persisté pour que le report maximal s'applique entre deux `check`
+    deferred_since = {task["id"]: task["deferred_since"] for task in data["tasks"] if "deferred_since" in task}
+    engine = SchedulingEngine(max_workers=max_workers, on_finish=on_finish, deferred_since=deferred_since)
     for task in data["tasks"]:
-        if not task["enabled"]:
-            continue
-
-        next_run = datetime.fromisoformat(task["next_run"])
-        if now >= next_run:
-            print(f"[>] Exécution de '{task['name']}'...")
-            result = run_task(task)
-            executed.append(result)
-
-            # Mise à jour de la tâche
-            task["last_run"] = now.isoformat()
-            task["run_count"] += 1
-            task["last_status"] = result["status"]
-
-            # Calcule la prochaine exécution
-            interval = parse_interval(task["interval"])
-            task["next_run"] = (now + interval).isoformat()
-
-    save_schedules(data)
+        if task["enabled"] and now >= datetime.fromisoformat(task["next_run"]):
+            engine.schedule(task_job(task), now)
+    try:
+        results = [result for _, result in engine.run_pending()]
+    finally:
+        engine.shutdown()
+
+    for result in results:
+        if result["status"] == "deferred":
+            print(f"[~] '{result['task_name']}' reportée (charge {result['load_per_cpu']}/CPU)")
+    executed = [result for result in results if result["status"] != "deferred"]
+    changed = False
+    for task in data["tasks"]:
+        since = deferred_since.get(task["id"])
+        if task.get("deferred_since") != since:
+            changed = True
+            if since is None:
+                task.pop("deferred_since", None)
+            else:
+                task["deferred_since"] = since
+    if executed or changed:
+        save_schedules(data)
     return executed
 
 def list_tasks(show_all: bool = False) -> list:
@@ -194,15 +447,15 @@ def list_tasks(show_all: bool = False) -> list:
         next_run = task["next_run"][:16] if task["next_run"] else "N/A"
         last_status = task.get("last_status", "-")
 
-        print(f"{task['id']:<10} {task['name']:<20} {task['interval']:<10} {status:<10} {next_run}")
+        schedule = task.get("cron") or task["interval"]
+        print(f"{task['id']:<10} {task['name']:<20} {schedule:<10} {status:<10} {next_run}")
 
     print(f"{'='*60}\n")
     return tasks
 
 def show_history(limit: int = 10) -> list:
-    """Affiche l'historique d'exécution"""
-    history = load_history()
-    recent = history[-limit:]
+    """Affiche l'historique d'exécution (lu depuis la fin du fichier)"""
+    recent = read_history_tail(limit)
 
     if not recent:
         print("[i] Aucun historique")
@@ -223,20 +476,145 @@ def show_history(limit: int = 10) -> list:
     print(f"{'='*70}\n")
     return recent
 
-def daemon_mode(check_interval: int = 60):
-    """Mode daemon - vérifie les tâches périodiquement"""
-    print(f"[*] Scheduler daemon démarré (check every {check_interval}s)")
-    print("[*] Ctrl+C pour arrêter\n")
+def show_stats(task_name: str | None = None) -> dict:
+    """Affiche les statistiques de durée par tâche"""
+    stats = history_stats(task_name)
+    if not stats:
+        print("[i] Aucun historique")
+        return {}
 
-    import time
-    try:
-        while True:
-            executed = check_and_run()
-            if executed:
-                for e in executed:
+    print(f"\n{'='*70}")
+    print(f"{'Tâche':<20} {'Exéc.':<8} {'Échecs':<8} {'p50':<10} {'p95':<10}")
+    print(f"{'='*70}")
+    for name, info in stats.items():
+        p50 = f"{info['p50']:.1f}s" if info["p50"] is not None else "-"
+        p95 = f"{info['p95']:.1f}s" if info["p95"] is not None else "-"
+        print(f"{name[:18]:<20} {info['runs']:<8} {info['failures']:<8} {p50:<10} {p95:<10}")
+    print(f"{'='*70}\n")
+    return stats
+
+class SchedulerDaemon:
+    """
+    Daemon de planification au-dessus de SchedulingEngine.
+
+    Il recharge schedules.json quand le fichier change (watchdog; à défaut,
+    vérification toutes les `poll_interval` secondes) et y enregistre chaque
+    exécution terminée; seule la boucle principale écrit le fichier.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, poll_interval: int = 60):
+        self.poll_interval = poll_interval
+        self.engine = SchedulingEngine(max_workers=max_workers, on_finish=self._on_finish)
+        self._mtime: int | None = None
+
+    def _file_mtime(self) -> int | None:
+        try:
+            return SCHEDULE_FILE.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self):
+        """Recharge schedules.json et replanifie toutes les tâches actives"""
+        mtime = self._file_mtime()
+        try:
+            data = load_schedules()
+        except (OSError, ValueError) as e:
+            print(f"[!] schedules.json illisible, configuration précédente conservée: {e}")
+            self._mtime = mtime
+            return
+        self._mtime = mtime
+        self.engine.clear()
+        for task in data["tasks"]:
+            if not task.get("enabled"):
+                continue
+            try:
+                job = task_job(task)
+            except ValueError as e:
+                print(f"[!] Planification invalide pour '{task['name']}', tâche ignorée: {e}")
+                continue
+            next_run = task.get("next_run")
+            self.engine.schedule(job, datetime.fromisoformat(next_run) if next_run else None)
+
+    def _on_finish(self, job: Job, result: dict) -> datetime | None:
+        """Enregistre une exécution dans schedules.json; retourne la prochaine échéance"""
+        if result["status"] == "error" and "task_id" not in result:
+            print(f"[!] Échec de la tâche '{job.name}': {result.get('error')}")
+
+        # La tâche a pu être modifiée ou supprimée pendant son exécution
+        data = load_schedules()
+        current = next((t for t in data["tasks"] if t["id"] == job.key), None)
+        if current is None:
+            return None
+
+        started = datetime.fromisoformat(result["started"])
+        now = datetime.now()
+        try:
+            next_run = compute_next_run(current, started)
+            if next_run <= now:
+                next_run = compute_next_run(current, now)  # Pas de rattrapage en rafale
+        except ValueError as e:
+            print(f"[!] Planification invalide pour '{current['name']}', tâche non replanifiée: {e}")
+            return None
+        current["last_run"] = started.isoformat()
+        current["run_count"] = current.get("run_count", 0) + 1
+        current["last_status"] = result["status"]
+        current["next_run"] = next_run.isoformat()
+        save_schedules(data)
+        self._mtime = self._file_mtime()
+        return next_run if current.get("enabled") else None
+
+    def _watch(self):
+        """Réveille la boucle à chaque modification de schedules.json"""
+        if not WATCHDOG_AVAILABLE:
+            return None
+        target = str(SCHEDULE_FILE)
+
+        def on_any_event(event):
+            if event.src_path == target or getattr(event, "dest_path", None) == target:
+                self.engine.wake()
+
+        handler = FileSystemEventHandler()
+        handler.on_any_event = on_any_event
+        SCHEDULE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        observer = Observer()
+        observer.schedule(handler, str(SCHEDULE_FILE.parent), recursive=False)
+        observer.start()
+        return observer
+
+    def step(self) -> list:
+        """Un tour de boucle: rechargement si besoin, résultats terminés, tâches dues"""
+        if self._file_mtime() != self._mtime:
+            self.reload()
+        return [result for _, result in self.engine.step()]
+
+    def run(self):
+        """Boucle principale (jusqu'à Ctrl+C)"""
+        prune_history()
+        self.reload()
+        observer = self._watch()
+        try:
+            while True:
+                for e in self.step():
+                    if e["status"] == "deferred":
+                        print(f"  ~ {e['task_name']}: reportée (charge {e['load_per_cpu']}/CPU)")
+                        continue
                     status_icon = "" if e["status"] == "success" else ""
                     print(f"  {status_icon} {e['task_name']}: {e['status']} ({e['duration']:.1f}s)")
-            time.sleep(check_interval)
+                self.engine.wait(None if WATCHDOG_AVAILABLE else self.poll_interval)
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
+            self.engine.shutdown()
+
+def daemon_mode(check_interval: int = 60, max_workers: int = MAX_WORKERS):
+    """Mode daemon - exécute les tâches à leur échéance"""
+    wake = "modification de schedules.json" if WATCHDOG_AVAILABLE else f"check every {check_interval}s"
+    print(f"[*] Scheduler daemon démarré ({max_workers} workers, réveil: échéance ou {wake})")
+    print("[*] Ctrl+C pour arrêter\n")
+
+    try:
+        SchedulerDaemon(max_workers=max_workers, poll_interval=check_interval).run()
     except KeyboardInterrupt:
         print("\n[*] Scheduler arrêté")
 
@@ -248,9 +626,11 @@ def main():
 Exemples:
   %(prog)s add "backup" "python3 ~/.aura/agents/backup_manager.py run" --interval 1d
   %(prog)s add "health-check" "python3 ~/.aura/agents/sys_health.py" --interval 30m
+  %(prog)s add "consolidate" "python3 ~/.aura/agents/memory_manager.py consolidate" --cron "30 3 * * 1-5"
   %(prog)s list
   %(prog)s run-now backup
   %(prog)s check
+  %(prog)s stats
   %(prog)s daemon
         """
     )
@@ -261,7 +641,11 @@ Exemples:
     add_parser = subparsers.add_parser("add", help="Ajouter une tâche planifiée")
     add_parser.add_argument("name", help="Nom de la tâche")
     add_parser.add_argument("cmd", help="Commande à exécuter")
-    add_parser.add_argument("--interval", "-i", required=True, help="Intervalle (5m, 1h, 2d, 1w)")
+    schedule_group = add_parser.add_mutually_exclusive_group(required=True)
+    schedule_group.add_argument("--interval", "-i", help="Intervalle (5m, 1h, 2d, 1w)")
+    schedule_group.add_argument("--cron", help="Expression cron (\"*/15 * * * *\", @daily...)")
+    add_parser.add_argument("--jitter", type=float, default=0, help="Décalage aléatoire max des échéances (secondes)")
+    add_parser.add_argument("--defer-on-load", action="store_true", help="Reporter quand la machine est chargée")
     add_parser.add_argument("--disabled", action="store_true", help="Créer désactivée")
 
     # remove
@@ -282,22 +666,32 @@ Exemples:
     # history
     hist_parser = subparsers.add_parser("history", help="Historique d'exécution")
     hist_parser.add_argument("--limit", "-n", type=int, default=10, help="Nombre d'entrées")
+    hist_parser.add_argument("--prune", action="store_true", help="Appliquer la rétention")
+    hist_parser.add_argument("--days", type=int, default=HISTORY_MAX_DAYS, help="Jours conservés (avec --prune)")
+
+    # stats
+    stats_parser = subparsers.add_parser("stats", help="Durées p50/p95 par tâche")
+    stats_parser.add_argument("task", nargs="?", help="Nom de la tâche")
 
     # run-now
     run_parser = subparsers.add_parser("run-now", help="Exécuter immédiatement")
     run_parser.add_argument("task_id", help="ID ou nom de la tâche")
 
     # check
-    subparsers.add_parser("check", help="Vérifier et exécuter les tâches dues")
+    check_parser = subparsers.add_parser("check", help="Vérifier et exécuter les tâches dues")
+    check_parser.add_argument("--workers", "-j", type=int, default=MAX_WORKERS, help="Tâches simultanées")
 
     # daemon
     daemon_parser = subparsers.add_parser("daemon", help="Mode daemon continu")
-    daemon_parser.add_argument("--interval", "-i", type=int, default=60, help="Intervalle de check (secondes)")
+    daemon_parser.add_argument("--interval", "-i", type=int, default=60,
+                               help="Intervalle de vérification de schedules.json sans watchdog (secondes)")
+    daemon_parser.add_argument("--workers", "-j", type=int, default=MAX_WORKERS, help="Tâches simultanées")
 
     args = parser.parse_args()
 
     if args.command == "add":
-        add_task(args.name, args.cmd, args.interval, not args.disabled)
+        add_task(args.name, args.cmd, args.interval, not args.disabled, cron=args.cron,
+                 jitter=args.jitter, defer_on_load=args.defer_on_load)
 
     elif args.command == "remove":
         remove_task(args.task_id)
@@ -312,8 +706,13 @@ Exemples:
         list_tasks(args.all)
 
     elif args.command == "history":
+        if args.prune:
+            print(f"[+] {prune_history(args.days)} entrée(s) supprimée(s)")
         show_history(args.limit)
 
+    elif args.command == "stats":
+        show_stats(args.task)
+
     elif args.command == "run-now":
         data = load_schedules()
         for task in data["tasks"]:
@@ -327,7 +726,7 @@ Exemples:
             print(f"[-] Tâche non trouvée: {args.task_id}")
 
     elif args.command == "check":
-        executed = check_and_run()
+        executed = check_and_run(args.workers)
         if not executed:
             print("[i] Aucune tâche à exécuter")
         else:
@@ -335,7 +734,7 @@ Exemples:
                 print(f"[{e['status']}] {e['task_name']} ({e['duration']:.1f}s)")
 
     elif args.command == "daemon":
-        daemon_mode(args.interval)
+        daemon_mode(args.interval, args.workers)
 
     else:
         parser.print_help()
@@ -2,18 +2,36 @@
 """
 Aura Task Runner - Exécution d'agents en arrière-plan
 Libère le terminal et notifie vocalement à la fin.
+
+Un seul thread "reaper" récupère tous les processus en arrière-plan (pidfd +
+wait4). La consommation de l'agent (temps CPU, RSS max) est mesurée par son
+processus de capture et écrite à côté de sa sortie (.exit.json): elle ne
+dépend ni de la taille du lanceur ni de sa survie. L'état des tâches est un
+journal JSONL append-only (une ligne = état complet d'une tâche).
+
+run_parallel passe par une file d'attente: concurrence maximale, estimation
+mémoire par agent (RSS max des exécutions passées) et admission retardée
+quand la mémoire disponible ou la charge système franchit un seuil.
+
+Les sorties des tâches sont plafonnées: début conservé (.stdout) + fin en deux
+segments tournants (.stdout.tail, .stdout.tail.1). Un petit processus de
+capture lit les pipes de l'agent, ce qui survit à la fin du lanceur.
 """
 
 import argparse
+import itertools
 import json
 import os
+import queue
+import selectors
 import signal
 import subprocess
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable
+from collections import deque
 import threading
 
 # Configuration
@@ -21,32 +39,469 @@ AGENTS_DIR = Path(__file__).parent
 TASKS_DIR = Path.home() / ".aura" / "tasks"
 TASKS_DIR.mkdir(parents=True, exist_ok=True)
 
-# PID file pour les tâches en cours
+# Ancien fichier d'état (relu une fois s'il existe) et journal des tâches
 RUNNING_TASKS_FILE = TASKS_DIR / "running.json"
+TASKS_LOG = TASKS_DIR / "tasks.jsonl"
+
+REAP_POLL_INTERVAL = 0.2  # Sondage wait4 si pidfd_open n'est pas disponible
+# ru_maxrss est en Ko sous Linux, en octets sous macOS
+MAXRSS_TO_KB = 1 / 1024 if sys.platform == "darwin" else 1
+
+# File d'attente de run_parallel (admission control)
+MAX_CONCURRENT_TASKS = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_TASK_MEMORY_MB = 400     # Estimation pour un agent jamais mesuré
+MEMORY_HISTORY = 20              # Exécutions passées prises en compte par agent
+MIN_FREE_MEMORY_MB = 1024        # Mémoire à laisser libre après un lancement
+MAX_LOAD_PER_CPU = 1.5           # Load average (1 min) par CPU au-delà duquel on attend
+RAMP_UP_SECONDS = 15             # Un agent lancé récemment n'a pas encore atteint son RSS
+ADMISSION_POLL_INTERVAL = 1.0    # Réévaluation d'une admission retardée
+QUEUED_TTL_SECONDS = 24 * 3600   # Tâche en file sans processus propriétaire connu: expirée
+
+# Sorties plafonnées des tâches
+OUTPUT_HEAD_BYTES = 256 * 1024   # Début de sortie conservé
+OUTPUT_TAIL_BYTES = 1024 * 1024  # Taille d'un segment de fin (deux segments au plus)
+TRUNCATION_MARKER = "\n... [sortie tronquée] ...\n"
+FOLLOW_POLL_INTERVAL = 0.25
+STATUS_STDOUT_LINES = 20         # Lignes de sortie renvoyées par get_task
+STATUS_STDERR_LINES = 10
+
+
+def available_memory_mb() -> float | None:
+    """Mémoire disponible (MemAvailable) en Mo, None si inconnue."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def load_per_cpu() -> float | None:
+    """Load average sur 1 minute rapporté au nombre de CPU."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return None
+
+
+class ChildReaper:
+    """
+    Boucle unique qui attend la fin de tous les processus suivis.
+
+    Chaque processus est surveillé via un pidfd (réveil dès sa fin, sans
+    sondage); wait4 récupère le code de sortie et l'utilisation des ressources.
+    Sans pidfd (noyau ancien, macOS), repli sur un sondage wait4(WNOHANG).
+    """
+
+    def __init__(self):
+        self._procs: dict[int, tuple[subprocess.Popen, Callable]] = {}
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread: threading.Thread | None = None
+
+    def track(self, proc: subprocess.Popen, on_exit: Callable[[int | None, Any], None]) -> None:
+        """Suit un processus; on_exit(code, rusage) est appelé depuis le reaper."""
+        with self._lock:
+            # La référence au Popen empêche subprocess de récupérer le pid à notre place
+            self._procs[proc.pid] = (proc, on_exit)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="task-reaper", daemon=True)
+                self._thread.start()
+        os.write(self._wake_w, b"\0")
+
+    def tracks(self, pid: int) -> bool:
+        """Le processus est-il suivi par ce reaper?"""
+        with self._lock:
+            return pid in self._procs
+
+    def pending(self) -> int:
+        """Nombre de processus encore suivis."""
+        with self._lock:
+            return len(self._procs)
+
+    def _run(self) -> None:
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_r, selectors.EVENT_READ, None)
+        watched: dict[int, int | None] = {}  # pid -> pidfd (None = sondage)
+
+        while True:
+            with self._lock:
+                new_pids = [pid for pid in self._procs if pid not in watched]
+            for pid in new_pids:
+                try:
+                    fd = os.pidfd_open(pid)
+                    selector.register(fd, selectors.EVENT_READ, pid)
+                except (AttributeError, OSError):
+                    fd = None
+                watched[pid] = fd
+
+            polled = [pid for pid, fd in watched.items() if fd is None]
+            events = selector.select(REAP_POLL_INTERVAL if polled else None)
+
+            ready = list(polled)
+            for key, _ in events:
+                if key.data is None:
+                    os.read(self._wake_r, 4096)
+                else:
+                    ready.append(key.data)
+
+            for pid in ready:
+                try:
+                    wpid, status, rusage = os.wait4(pid, os.WNOHANG)
+                    if wpid == 0:
+                        continue  # Toujours en cours
+                    code = os.waitstatus_to_exitcode(status)
+                except ChildProcessError:
+                    code, rusage = None, None  # Déjà récupéré ailleurs
+
+                fd = watched.pop(pid)
+                if fd is not None:
+                    selector.unregister(fd)
+                    os.close(fd)
+                with self._lock:
+                    proc, on_exit = self._procs.pop(pid)
+                if code is not None:
+                    proc.returncode = code
+                try:
+                    on_exit(code, rusage)
+                except Exception:
+                    pass  # Un callback défaillant ne doit pas arrêter le reaper
+
+
+_reaper: ChildReaper | None = None
+_reaper_lock = threading.Lock()
+
+
+def get_reaper() -> ChildReaper:
+    """Reaper partagé par tous les TaskRunner du processus."""
+    global _reaper
+    with _reaper_lock:
+        if _reaper is None:
+            _reaper = ChildReaper()
+        return _reaper
+
+
+class CappedOutput:
+    """
+    Fichier de sortie plafonné.
+
+    Les OUTPUT_HEAD_BYTES premiers octets vont dans `path`; la suite dans
+    `path.tail`, renommé en `path.tail.1` dès qu'il atteint OUTPUT_TAIL_BYTES.
+    Au second renommage, un segment est perdu: un marqueur est ajouté au début
+    (qui n'est plus jamais écrit), la lecture concaténée reste donc lisible.
+    """
+
+    def __init__(self, path: Path, head_bytes: int = OUTPUT_HEAD_BYTES, tail_bytes: int = OUTPUT_TAIL_BYTES):
+        self.path = Path(path)
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self._head = open(self.path, "wb")
+        self._head_size = 0
+        self._tail = None
+        self._tail_size = 0
+        self._rotations = 0
+
+    def write(self, data: bytes) -> None:
+        if self._head_size < self.head_bytes:
+            chunk = data[:self.head_bytes - self._head_size]
+            self._head.write(chunk)
+            self._head.flush()
+            self._head_size += len(chunk)
+            data = data[len(chunk):]
+            if not data:
+                return
+
+        if self._tail is None:
+            self._tail = open(tail_path(self.path), "wb")
+        elif self._tail_size >= self.tail_bytes:
+            self._rotate()
+        self._tail.write(data)
+        self._tail.flush()
+        self._tail_size += len(data)
+
+    def _rotate(self) -> None:
+        self._tail.close()
+        os.replace(tail_path(self.path), tail_path(self.path, 1))
+        self._rotations += 1
+        if self._rotations == 2:
+            self._head.write(TRUNCATION_MARKER.encode())
+            self._head.flush()
+        self._tail = open(tail_path(self.path), "wb")
+        self._tail_size = 0
+
+    def close(self) -> None:
+        self._head.close()
+        if self._tail:
+            self._tail.close()
+
+
+def tail_path(path: Path, index: int = 0) -> Path:
+    """Segment de fin d'une sortie (0 = courant, 1 = précédent)."""
+    return Path(f"{path}.tail.{index}") if index else Path(f"{path}.tail")
+
+
+def output_segments(path: Path) -> list[Path]:
+    """Fichiers d'une sortie plafonnée, dans l'ordre de lecture."""
+    path = Path(path)
+    return [p for p in (path, tail_path(path, 1), tail_path(path)) if p.exists()]
+
+
+def _last_lines_of(path: Path, n: int, block_size: int = 8192) -> list[bytes]:
+    """Les n dernières lignes d'un fichier (fins de ligne incluses), en lisant par blocs depuis la fin."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        data = b""
+        pos = end
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines(keepends=True)
+    return lines[-n:] if pos == 0 else lines[1:][-n:]  # Première ligne partielle
+
+
+def read_last_lines(path: Path, n: int = 20) -> list[str]:
+    """Les n dernières lignes d'une sortie plafonnée (sans lire les fichiers entiers)."""
+    lines: list[bytes] = []
+    for segment in reversed(output_segments(path)):
+        if n <= len(lines):
+            break
+        try:
+            head = _last_lines_of(segment, n - len(lines) + 1)
+        except OSError:
+            continue
+        if lines and head and not head[-1].endswith(b"\n"):
+            # Ligne coupée entre deux segments
+            lines[0] = head.pop() + lines[0]
+        lines = head + lines
+    return [line.rstrip(b"\r\n").decode("utf-8", errors="replace") for line in lines[-n:]]
+
+
+def read_output(path: Path) -> str:
+    """Sortie plafonnée complète (début + segments de fin)."""
+    return b"".join(p.read_bytes() for p in output_segments(path)).decode("utf-8", errors="replace")
+
+
+def remove_output(path: Path) -> None:
+    """Supprime une sortie et ses segments."""
+    for p in (Path(path), tail_path(path, 1), tail_path(path)):
+        p.unlink(missing_ok=True)
+
+
+def exit_record_path(stdout_path: Path) -> Path:
+    """Code de sortie et consommation de l'agent, écrits par le processus de capture."""
+    return Path(stdout_path).with_suffix(".exit.json")
+
+
+def write_exit_record(stdout_path: Path, code: int, rusage: Any) -> None:
+    """Enregistre la fin de l'agent (écriture atomique)."""
+    path = exit_record_path(stdout_path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({
+        "return_code": code,
+        "cpu_user": round(rusage.ru_utime, 3),
+        "cpu_system": round(rusage.ru_stime, 3),
+        "max_rss_kb": int(rusage.ru_maxrss * MAXRSS_TO_KB),
+        "rusage_from": "capture"
+    }))
+    os.replace(tmp, path)
+
+
+def read_exit_record(stdout_path: Path) -> dict[str, Any] | None:
+    """Fin de l'agent écrite par la capture, None si absente (capture tuée par SIGKILL)."""
+    try:
+        return json.loads(exit_record_path(stdout_path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def capture(cmd: list[str], stdout_path: Path, stderr_path: Path) -> int:
+    """
+    Exécute une commande en plafonnant ses sorties (processus de capture).
+
+    Les signaux d'arrêt visent le groupe entier: l'agent les reçoit, la capture
+    continue de vider les pipes puis reproduit la fin de l'agent (même code ou
+    même signal) pour que le reaper voie le vrai résultat.
+
+    La capture attend l'agent avec wait4 et écrit son code et son rusage
+    (exit_record_path): le rusage vu par le reaper serait celui de la capture,
+    dont ru_maxrss hérite du RSS max du lanceur à travers fork/exec.
+    """
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(sig, lambda signum, frame: None)
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    outputs = {
+        proc.stdout.fileno(): CappedOutput(stdout_path),
+        proc.stderr.fileno(): CappedOutput(stderr_path)
+    }
+    selector = selectors.DefaultSelector()
+    for fd in outputs:
+        selector.register(fd, selectors.EVENT_READ)
+
+    while selector.get_map():
+        for key, _ in selector.select():
+            data = os.read(key.fd, 65536)
+            if data:
+                outputs[key.fd].write(data)
+            else:
+                selector.unregister(key.fd)
+    for output in outputs.values():
+        output.close()
+
+    _, status, rusage = os.wait4(proc.pid, 0)
+    code = proc.returncode = os.waitstatus_to_exitcode(status)
+    try:
+        write_exit_record(stdout_path, code, rusage)
+    except OSError:
+        pass
+    if code < 0:
+        if -code not in (signal.SIGKILL, signal.SIGSTOP):  # Non interceptables
+            try:
+                signal.signal(-code, signal.SIG_DFL)
+            except (OSError, ValueError):
+                pass
+        os.kill(os.getpid(), -code)
+    return code
 
 
 class TaskRunner:
     """Gestionnaire de tâches en arrière-plan."""
 
     def __init__(self):
+        self._lock = threading.Lock()
+        self._log_offset = 0
+        self._counter = itertools.count(1)
+        self._batches: list[tuple[set[str], Callable[[], None]]] = []
+        self._notifications: queue.Queue | None = None
         self.running_tasks = self._load_running_tasks()
 
+        # File d'attente de run_parallel
+        self.max_concurrency = MAX_CONCURRENT_TASKS
+        self._queue: deque[tuple[dict[str, Any], list[str], bool]] = deque()
+        self._admitted: dict[str, tuple[float, float]] = {}  # task_id -> (lancement, estimation Mo)
+        self._queue_cond = threading.Condition()
+        self._dispatcher: threading.Thread | None = None
+        self.admission_delays = 0
+
     def _load_running_tasks(self) -> dict[str, Any]:
-        """Charge la liste des tâches en cours."""
+        """Charge l'état des tâches (ancien running.json puis journal)."""
+        tasks = {}
         if RUNNING_TASKS_FILE.exists():
             try:
-                return json.loads(RUNNING_TASKS_FILE.read_text())
+                tasks = json.loads(RUNNING_TASKS_FILE.read_text())
             except Exception:
-                return {}
-        return {}
+                tasks = {}
+        self.running_tasks = tasks
+        self._refresh()
+        return self.running_tasks
+
+    def _refresh(self) -> None:
+        """Relit les lignes ajoutées au journal (y compris par d'autres processus)."""
+        if not TASKS_LOG.exists():
+            return
+        with self._lock:
+            try:
+                with open(TASKS_LOG, "rb") as f:
+                    f.seek(self._log_offset)
+                    data = f.read()
+            except OSError:
+                return
+            end = data.rfind(b"\n") + 1  # Ignorer une ligne en cours d'écriture
+            self._log_offset += end
+            for line in data[:end].splitlines():
+                try:
+                    task = json.loads(line)
+                    self.running_tasks[task["id"]] = task
+                except (ValueError, KeyError):
+                    continue
+
+    def _record(self, task_info: dict[str, Any]) -> None:
+        """Ajoute l'état courant d'une tâche au journal (une écriture, sans réécriture)."""
+        line = json.dumps(task_info, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.running_tasks[task_info["id"]] = task_info
+            with open(TASKS_LOG, "a", encoding="utf-8") as f:
+                f.write(line)
 
     def _save_running_tasks(self):
-        """Sauvegarde la liste des tâches en cours."""
-        RUNNING_TASKS_FILE.write_text(json.dumps(self.running_tasks, indent=2))
+        """Réécrit le journal compacté (dernier état de chaque tâche)."""
+        with self._lock:
+            tmp = TASKS_LOG.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for task in self.running_tasks.values():
+                    f.write(json.dumps(task, ensure_ascii=False) + "\n")
+            os.replace(tmp, TASKS_LOG)
+            self._log_offset = TASKS_LOG.stat().st_size
+            RUNNING_TASKS_FILE.unlink(missing_ok=True)
 
     def _generate_task_id(self) -> str:
         """Génère un ID unique pour une tâche."""
-        return f"task_{datetime.now().strftime('%H%M%S')}_{os.getpid()}"
+        return f"task_{datetime.now().strftime('%H%M%S')}_{os.getpid()}_{next(self._counter)}"
+
+    @staticmethod
+    def _finished(task: dict[str, Any], code: int | None) -> dict[str, Any]:
+        """État final d'une tâche, avec le code et le rusage écrits par sa capture."""
+        task = dict(task)
+        record = read_exit_record(task["stdout_file"]) if task.get("stdout_file") else None
+        if record is not None:
+            record_code = record.pop("return_code")
+            code = record_code if code is None else code
+            task.update(record)
+        if task["status"] == "running":
+            task["status"] = "unknown" if code is None else "completed" if code == 0 else "failed"
+        task["completed_at"] = datetime.now().isoformat()
+        task["return_code"] = code
+        return task
+
+    def _on_task_exit(self, task_info: dict[str, Any], notify: bool, code: int | None) -> None:
+        """Fin d'une tâche en arrière-plan (appelé par le reaper)."""
+        # État courant (kill_task a pu le changer entre-temps)
+        with self._lock:
+            task_info = self._finished(self.running_tasks.get(task_info["id"], task_info), code)
+        self._record(task_info)
+
+        if notify:
+            try:
+                output = "\n".join(read_last_lines(Path(task_info["stdout_file"]), 3))
+            except Exception:
+                output = ""
+            agent = task_info["agent"]
+            self._queue_notification(
+                code == 0, f"{agent}: {output[:50]}..." if output else agent
+            )
+
+        self._release(task_info["id"])
+        self._finish_batches(task_info["id"])
+
+    def _finish_batches(self, task_id: str) -> None:
+        """Notifie les lots de run_parallel dont c'était la dernière tâche."""
+        with self._lock:
+            finished = []
+            for batch in self._batches:
+                batch[0].discard(task_id)
+                if not batch[0]:
+                    finished.append(batch)
+            for batch in finished:
+                self._batches.remove(batch)
+        for _, callback in finished:
+            callback()
+
+    def _queue_notification(self, success: bool, message: str) -> None:
+        """Notifications vocales sérialisées dans un seul thread (le reaper ne bloque pas)."""
+        with self._lock:
+            if self._notifications is None:
+                self._notifications = queue.Queue()
+                threading.Thread(target=self._notify_loop, name="task-notify", daemon=True).start()
+        self._notifications.put((success, message))
+
+    def _notify_loop(self) -> None:
+        while True:
+            success, message = self._notifications.get()
+            self._notify_completion("", success, message)
 
     def _notify_completion(self, task_id: str, success: bool, message: str):
         """Notifie vocalement la fin d'une tâche."""
@@ -63,13 +518,129 @@ class TaskRunner:
             except Exception:
                 pass
 
+    def _spawn(self, task_info: dict[str, Any], cmd: list[str], notify: bool) -> subprocess.Popen:
+        """Lance le processus d'une tâche et le confie au reaper."""
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "capture",
+             task_info["stdout_file"], task_info["stderr_file"], "--", *cmd],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True  # Détache du terminal (groupe: capture + agent)
+        )
+
+        task_info["pid"] = process.pid
+        task_info["status"] = "running"
+        task_info.setdefault("started_at", datetime.now().isoformat())
+        self._record(task_info)
+
+        # Le reaper partagé signale la fin (statut, notification); le rusage vient de la capture
+        get_reaper().track(
+            process,
+            lambda code, rusage: self._on_task_exit(task_info, notify, code)
+        )
+        return process
+
+    def estimate_memory_mb(self, agent: str) -> float:
+        """
+        Mémoire attendue d'un agent: plus grand RSS max de ses dernières exécutions.
+
+        Seules les mesures de la capture comptent: celles des anciennes versions
+        (wait4 du lanceur) contiennent le RSS max du lanceur.
+        """
+        if not agent.endswith('.py'):
+            agent = f"{agent}.py"
+        with self._lock:
+            samples = [
+                t["max_rss_kb"] for t in self.running_tasks.values()
+                if t.get("agent") == agent and t.get("max_rss_kb") and t.get("rusage_from") == "capture"
+            ]
+        if not samples:
+            return DEFAULT_TASK_MEMORY_MB
+        return max(samples[-MEMORY_HISTORY:]) / 1024
+
+    def _admission_check(self, estimate_mb: float) -> str | None:
+        """Raison de différer un lancement, ou None s'il peut partir."""
+        if len(self._admitted) >= self.max_concurrency:
+            return "concurrency"
+        if not self._admitted:
+            return None  # Toujours laisser passer une tâche: pas d'interblocage
+
+        free_mb = available_memory_mb()
+        if free_mb is not None:
+            # Les agents lancés récemment n'ont pas encore atteint leur RSS
+            now = time.time()
+            ramping = sum(est for started, est in self._admitted.values() if now - started < RAMP_UP_SECONDS)
+            if free_mb - ramping - estimate_mb < MIN_FREE_MEMORY_MB:
+                return "memory"
+
+        load = load_per_cpu()
+        if load is not None and load > MAX_LOAD_PER_CPU:
+            return "load"
+        return None
+
+    def _ensure_dispatcher(self) -> None:
+        """Démarre le thread de la file d'attente (appelé sous _queue_cond)."""
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="task-dispatch", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        """Lance les tâches en file dès que l'admission le permet (ordre FIFO)."""
+        while True:
+            with self._queue_cond:
+                while not self._queue:
+                    self._queue_cond.wait()
+
+                task_info, cmd, notify = self._queue[0]
+                estimate = self.estimate_memory_mb(task_info["agent"])
+                reason = self._admission_check(estimate)
+                if reason is not None:
+                    if reason != "concurrency":
+                        self.admission_delays += 1
+                    # Réveil à la fin d'une tâche, ou réévaluation périodique (mémoire/charge)
+                    self._queue_cond.wait(ADMISSION_POLL_INTERVAL)
+                    continue
+
+                self._queue.popleft()
+                self._admitted[task_info["id"]] = (time.time(), estimate)
+
+            task_info["memory_estimate_mb"] = round(estimate)
+            try:
+                self._spawn(task_info, cmd, notify)
+            except Exception as e:
+                self._record({**task_info, "status": "failed", "error": str(e),
+                              "completed_at": datetime.now().isoformat()})
+                self._release(task_info["id"])
+
+            with self._queue_cond:
+                self._queue_cond.notify_all()
+
+    def _release(self, task_id: str) -> None:
+        """Libère la place d'une tâche admise par la file."""
+        with self._queue_cond:
+            if self._admitted.pop(task_id, None) is not None:
+                self._queue_cond.notify_all()
+
+    def wait_dispatched(self, timeout: float | None = None) -> bool:
+        """Attend que la file d'attente soit vide (toutes les tâches lancées)."""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._queue_cond:
+            while self._queue:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue_cond.wait(remaining)
+        return True
+
     def run_agent(
         self,
         agent: str,
         args: list[str] = None,
         background: bool = True,
         notify: bool = True,
-        timeout: int | None = None
+        timeout: int | None = None,
+        queued: bool = False
     ) -> dict[str, Any]:
         """
         Exécute un agent Aura.
@@ -80,6 +651,7 @@ class TaskRunner:
             background: Exécuter en arrière-plan
             notify: Notifier vocalement à la fin
             timeout: Timeout en secondes (None = pas de timeout)
+            queued: En arrière-plan, passer par la file d'attente (admission control)
 
         Returns:
             Dict avec task_id, status, etc.
@@ -116,46 +688,25 @@ class TaskRunner:
             "stderr_file": str(stderr_file)
         }
 
+        if background and queued:
+            # Lancement différé par la file d'attente
+            task_info["status"] = "queued"
+            task_info["queued_at"] = task_info.pop("started_at")
+            task_info["owner_pid"] = os.getpid()  # Seul ce processus peut la lancer
+            self._record(task_info)
+            with self._queue_cond:
+                self._queue.append((task_info, cmd, notify))
+                self._ensure_dispatcher()
+                self._queue_cond.notify_all()
+            return {
+                "status": "queued",
+                "task_id": task_id,
+                "message": f"Tâche en file d'attente. ID: {task_id}"
+            }
+
         if background:
             # Exécution en arrière-plan
-            with open(stdout_file, 'w') as stdout_f, open(stderr_file, 'w') as stderr_f:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=stdout_f,
-                    stderr=stderr_f,
-                    start_new_session=True  # Détache du terminal
-                )
-
-            task_info["pid"] = process.pid
-            self.running_tasks[task_id] = task_info
-            self._save_running_tasks()
-
-            # Thread pour surveiller la fin et notifier
-            if notify:
-                def watch_and_notify():
-                    process.wait()
-                    success = process.returncode == 0
-                    # Lire le résultat
-                    try:
-                        output = stdout_file.read_text()[-200:]  # Derniers 200 chars
-                    except Exception:
-                        output = ""
-
-                    self._notify_completion(
-                        task_id,
-                        success,
-                        f"{agent}: {output[:50]}..." if output else agent
-                    )
-
-                    # Mettre à jour le statut
-                    task_info["status"] = "completed" if success else "failed"
-                    task_info["completed_at"] = datetime.now().isoformat()
-                    task_info["return_code"] = process.returncode
-                    self.running_tasks[task_id] = task_info
-                    self._save_running_tasks()
-
-                thread = threading.Thread(target=watch_and_notify, daemon=True)
-                thread.start()
+            process = self._spawn(task_info, cmd, notify)
 
             return {
                 "status": "started",
@@ -179,8 +730,10 @@ class TaskRunner:
                 task_info["completed_at"] = datetime.now().isoformat()
 
                 # Sauvegarder les sorties
-                stdout_file.write_text(result.stdout)
-                stderr_file.write_text(result.stderr)
+                for path, text in ((stdout_file, result.stdout), (stderr_file, result.stderr)):
+                    output = CappedOutput(path)
+                    output.write(text.encode())
+                    output.close()
 
                 if notify:
                     self._notify_completion(
@@ -208,98 +761,240 @@ class TaskRunner:
         self,
         tasks: list[dict[str, Any]],
         notify_each: bool = False,
-        notify_all: bool = True
+        notify_all: bool = True,
+        max_concurrency: int | None = None
     ) -> dict[str, Any]:
         """
-        Exécute plusieurs agents en parallèle.
+        Exécute plusieurs agents en parallèle, via la file d'attente.
+
+        Au plus max_concurrency agents tournent en même temps; un lancement est
+        aussi retardé si la mémoire disponible (moins l'estimation de l'agent)
+        ou la charge système dépasse les seuils.
 
         Args:
             tasks: Liste de dicts {"agent": "...", "args": [...]}
             notify_each: Notifier pour chaque tâche
             notify_all: Notifier quand toutes sont terminées
+            max_concurrency: Agents simultanés (défaut: MAX_CONCURRENT_TASKS)
 
         Returns:
             Dict avec les résultats
         """
+        if max_concurrency:
+            self.max_concurrency = max(1, max_concurrency)
+
         results = []
-        processes = []
+        queued = []
 
         for task in tasks:
             result = self.run_agent(
                 agent=task.get("agent"),
                 args=task.get("args", []),
                 background=True,
-                notify=notify_each
+                notify=notify_each,
+                queued=True
             )
             results.append(result)
-            if result.get("pid"):
-                processes.append((result["task_id"], result["pid"]))
-
-        if notify_all and processes:
-            def watch_all():
-                # Attendre que tous les processus terminent
-                for task_id, pid in processes:
-                    try:
-                        os.waitpid(pid, 0)
-                    except Exception:
-                        pass
-
-                self._notify_completion(
-                    "batch",
-                    True,
-                    f"{len(processes)} tâches terminées"
-                )
+            if result.get("task_id"):
+                queued.append(result["task_id"])
+
+        if notify_all and queued:
+            def notify_batch():
+                self._queue_notification(True, f"{len(queued)} tâches terminées")
 
-            thread = threading.Thread(target=watch_all, daemon=True)
-            thread.start()
+            with self._lock:
+                pending = set(queued) & {
+                    tid for tid, t in self.running_tasks.items()
+                    if t.get("status") in ("queued", "running")
+                }
+                if pending:
+                    self._batches.append((pending, notify_batch))
+            if not pending:
+                notify_batch()
 
         return {
-            "status": "started",
+            "status": "queued",
             "tasks_count": len(results),
+            "max_concurrency": self.max_concurrency,
             "results": results
         }
 
+    def _check_orphans(self) -> None:
+        """Tâches "running" ou "queued" d'un processus disparu: vérifier que le pid vit encore."""
+        for task in list(self.running_tasks.values()):
+            if task.get("status") == "queued":
+                self._check_queued_orphan(task)
+                continue
+            if task.get("status") != "running" or not task.get("pid"):
+                continue
+            if get_reaper().tracks(task["pid"]):
+                continue
+            try:
+                os.kill(task["pid"], 0)
+            except ProcessLookupError:
+                # Lanceur disparu, capture récupérée par init: sa fiche de fin donne
+                # le code et le rusage (statut "unknown" si elle n'a pas pu l'écrire)
+                self._record(self._finished(task, None))
+            except PermissionError:
+                pass
+
+    def _check_queued_orphan(self, task: dict[str, Any]) -> None:
+        """Expire une tâche restée en file dans un processus terminé (elle ne sera jamais lancée)."""
+        owner = task.get("owner_pid")
+        if owner == os.getpid():
+            return
+        if owner is None:
+            # Ancien format: pas de propriétaire connu, expiration après QUEUED_TTL_SECONDS
+            try:
+                queued_at = datetime.fromisoformat(task.get("queued_at", ""))
+            except ValueError:
+                return
+            if (datetime.now() - queued_at).total_seconds() < QUEUED_TTL_SECONDS:
+                return
+        else:
+            try:
+                os.kill(owner, 0)
+                return
+            except ProcessLookupError:
+                pass
+            except PermissionError:
+                return
+        self._record({**task, "status": "expired", "completed_at": datetime.now().isoformat()})
+
     def list_tasks(self, status: str | None = None) -> list[dict[str, Any]]:
-        """Liste les tâches."""
+        """Liste les tâches (avec temps CPU et RSS max pour les tâches terminées)."""
+        self._refresh()
+        self._check_orphans()
         tasks = list(self.running_tasks.values())
 
         if status:
             tasks = [t for t in tasks if t.get("status") == status]
 
-        return sorted(tasks, key=lambda t: t.get("started_at", ""), reverse=True)
+        return sorted(tasks, key=lambda t: t.get("started_at") or t.get("queued_at", ""), reverse=True)
 
     def get_task(self, task_id: str) -> dict[str, Any | None]:
-        """Récupère les infos d'une tâche."""
+        """Récupère les infos d'une tâche (dont cpu_user, cpu_system, max_rss_kb)."""
+        self._refresh()
         task = self.running_tasks.get(task_id)
         if task:
+            task = dict(task)  # Ne pas journaliser stdout/stderr avec l'état
+
             # Ajouter stdout/stderr si disponibles
             stdout_file = Path(task.get("stdout_file", ""))
             stderr_file = Path(task.get("stderr_file", ""))
 
             if stdout_file.exists():
-                task["stdout"] = stdout_file.read_text()[-1000:]  # Derniers 1000 chars
+                task["stdout"] = "\n".join(read_last_lines(stdout_file, STATUS_STDOUT_LINES))
             if stderr_file.exists():
-                task["stderr"] = stderr_file.read_text()[-500:]
+                task["stderr"] = "\n".join(read_last_lines(stderr_file, STATUS_STDERR_LINES))
 
         return task
 
+    def wait_task(self, task_id: str, timeout: float | None = None) -> dict[str, Any] | None:
+        """Attend la fin d'une tâche lancée par ce processus (reaper)."""
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            task = self.running_tasks.get(task_id)
+            if task is None or task.get("status") != "running":
+                return task
+            if deadline is not None and time.time() >= deadline:
+                return task
+            time.sleep(0.05)
+
+    def tail(self, task_id: str, lines: int = 20, stream: str = "stdout") -> list[str] | None:
+        """Les dernières lignes de la sortie d'une tâche (lecture depuis la fin)."""
+        self._refresh()
+        task = self.running_tasks.get(task_id)
+        if not task:
+            return None
+        return read_last_lines(Path(task[f"{stream}_file"]), lines)
+
+    def follow(self, task_id: str, lines: int = 10, stream: str = "stdout"):
+        """
+        Suit la sortie d'une tâche à la manière de `tail -f`.
+
+        Produit d'abord les `lines` dernières lignes, puis chaque nouvelle ligne
+        jusqu'à la fin de la tâche. Suit la bascule début -> segment de fin et les
+        rotations des segments (le fichier renommé est lu jusqu'au bout).
+        """
+        task = self.get_task(task_id)
+        if not task:
+            return
+        path = Path(task[f"{stream}_file"])
+        yield from read_last_lines(path, lines)
+
+        current = tail_path(path) if tail_path(path).exists() else path
+        f = open(current, "rb") if current.exists() else None
+        if f:
+            f.seek(0, os.SEEK_END)
+        pending = b""
+
+        try:
+            while True:
+                data = f.read() if f else b""
+                if data:
+                    pending += data
+                    *complete, pending = pending.split(b"\n")
+                    for line in complete:
+                        yield line.decode("utf-8", errors="replace")
+                    continue
+
+                # Passer au segment de fin (début plein, ou segment renommé)
+                tail = tail_path(path)
+                switch = False
+                if tail.exists():
+                    if f is None or current == path:
+                        switch = True
+                    else:
+                        try:
+                            switch = os.stat(tail).st_ino != os.fstat(f.fileno()).st_ino
+                        except FileNotFoundError:
+                            switch = False
+                elif f is None and path.exists():
+                    f, current = open(path, "rb"), path
+                    continue
+                if switch:
+                    if f:
+                        f.close()
+                    f, current = open(tail, "rb"), tail
+                    continue
+
+                self._refresh()
+                if self.running_tasks.get(task_id, {}).get("status") not in ("running", "queued"):
+                    break
+                time.sleep(FOLLOW_POLL_INTERVAL)
+        finally:
+            if f:
+                f.close()
+
+        if pending:
+            yield pending.decode("utf-8", errors="replace")
+
     def kill_task(self, task_id: str, force: bool = False) -> bool:
         """Tue une tâche en cours."""
+        self._refresh()
         task = self.running_tasks.get(task_id)
+        if task and task.get("status") == "queued":
+            # Pas encore lancée: la retirer de la file
+            with self._queue_cond:
+                before = len(self._queue)
+                self._queue = deque(item for item in self._queue if item[0]["id"] != task_id)
+                removed = len(self._queue) < before
+            if removed:
+                self._record({**task, "status": "killed", "completed_at": datetime.now().isoformat()})
+                self._finish_batches(task_id)
+            return removed
         if not task or not task.get("pid"):
             return False
 
         try:
             sig = signal.SIGKILL if force else signal.SIGTERM
-            os.kill(task["pid"], sig)
-            task["status"] = "killed"
-            task["completed_at"] = datetime.now().isoformat()
-            self._save_running_tasks()
+            os.killpg(task["pid"], sig)  # Capture + agent (+ ses enfants)
+            self._record({**task, "status": "killed", "completed_at": datetime.now().isoformat()})
             return True
         except ProcessLookupError:
             # Processus déjà terminé
-            task["status"] = "completed"
-            self._save_running_tasks()
+            self._record({**task, "status": "completed"})
             return True
         except Exception:
             return False
@@ -319,8 +1014,10 @@ class TaskRunner:
                         to_delete.append(task_id)
                         # Supprimer les fichiers
                         for f in [task.get("stdout_file"), task.get("stderr_file")]:
-                            if f and Path(f).exists():
-                                Path(f).unlink()
+                            if f:
+                                remove_output(Path(f))
+                        if task.get("stdout_file"):
+                            exit_record_path(task["stdout_file"]).unlink(missing_ok=True)
                 except Exception:
                     pass
 
@@ -365,6 +1062,8 @@ Exemples:
   %(prog)s parallel "sys_health" "network_monitor status"
   %(prog)s list --status running
   %(prog)s status task_123456
+  %(prog)s tail task_123456 -n 50
+  %(prog)s tail task_123456 -f
   %(prog)s kill task_123456
         """
     )
@@ -382,15 +1081,30 @@ Exemples:
     # parallel
     par_p = subparsers.add_parser("parallel", help="Exécuter plusieurs agents en parallèle")
     par_p.add_argument("tasks", nargs="+", help="Agents à exécuter (format: 'agent arg1 arg2')")
+    par_p.add_argument("--max-concurrency", "-j", type=int, default=MAX_CONCURRENT_TASKS,
+                       help=f"Agents simultanés (défaut: {MAX_CONCURRENT_TASKS})")
 
     # list
     list_p = subparsers.add_parser("list", help="Lister les tâches")
-    list_p.add_argument("--status", choices=["running", "completed", "failed", "killed"])
+    list_p.add_argument("--status", choices=["queued", "running", "completed", "failed", "killed", "unknown", "expired"])
 
     # status
     status_p = subparsers.add_parser("status", help="Statut d'une tâche")
     status_p.add_argument("task_id")
 
+    # tail
+    tail_p = subparsers.add_parser("tail", help="Dernières lignes de sortie d'une tâche")
+    tail_p.add_argument("task_id")
+    tail_p.add_argument("-n", "--lines", type=int, default=20)
+    tail_p.add_argument("-f", "--follow", action="store_true", help="Suivre jusqu'à la fin de la tâche")
+    tail_p.add_argument("--stderr", action="store_true", help="Lire stderr au lieu de stdout")
+
+    # capture (interne: processus qui plafonne les sorties d'un agent)
+    capture_p = subparsers.add_parser("capture", help="(interne) Exécuter avec sorties plafonnées")
+    capture_p.add_argument("stdout_file")
+    capture_p.add_argument("stderr_file")
+    capture_p.add_argument("cmd", nargs=argparse.REMAINDER)
+
     # kill
     kill_p = subparsers.add_parser("kill", help="Tuer une tâche")
     kill_p.add_argument("task_id")
@@ -406,6 +1120,10 @@ Exemples:
         parser.print_help()
         sys.exit(1)
 
+    if args.command == "capture":
+        cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        sys.exit(capture(cmd, Path(args.stdout_file), Path(args.stderr_file)))
+
     runner = TaskRunner()
 
     if args.command == "run":
@@ -430,19 +1148,29 @@ Exemples:
             parts = task_str.split()
             tasks.append({"agent": parts[0], "args": parts[1:] if len(parts) > 1 else []})
 
-        result = runner.run_parallel(tasks)
+        result = runner.run_parallel(tasks, max_concurrency=args.max_concurrency)
         print(json.dumps(result, indent=2))
+
+        # Les tâches en file sont lancées par ce processus: attendre qu'elles soient toutes parties
+        if len(tasks) > runner.max_concurrency:
+            print(f"\n⏳ {len(tasks)} tâches, {runner.max_concurrency} à la fois...")
+        runner.wait_dispatched()
         print(f"\n✓ {len(tasks)} tâches lancées en parallèle")
+        if runner.admission_delays:
+            print(f"  (lancements retardés par la mémoire ou la charge: {runner.admission_delays}×)")
 
     elif args.command == "list":
         tasks = runner.list_tasks(status=args.status)
         if not tasks:
             print("Aucune tâche.")
         else:
-            print(f"{'ID':<20} {'Agent':<20} {'Status':<12} {'Started'}")
-            print("-" * 70)
+            print(f"{'ID':<28} {'Agent':<20} {'Status':<12} {'CPU (s)':>8} {'RSS max':>9}  {'Started'}")
+            print("-" * 100)
             for t in tasks[:20]:
-                print(f"{t.get('id', 'N/A'):<20} {t.get('agent', 'N/A'):<20} {t.get('status', 'N/A'):<12} {t.get('started_at', 'N/A')[:19]}")
+                cpu = t.get("cpu_user", 0) + t.get("cpu_system", 0) if "cpu_user" in t else None
+                cpu_str = f"{cpu:.2f}" if cpu is not None else "-"
+                rss_str = f"{t['max_rss_kb'] / 1024:.1f}M" if "max_rss_kb" in t else "-"
+                print(f"{t.get('id', 'N/A'):<28} {t.get('agent', 'N/A'):<20} {t.get('status', 'N/A'):<12} {cpu_str:>8} {rss_str:>9}  {(t.get('started_at') or t.get('queued_at', 'N/A'))[:19]}")
 
     elif args.command == "status":
         task = runner.get_task(args.task_id)
@@ -451,6 +1179,21 @@ Exemples:
         else:
             print(f"Tâche non trouvée: {args.task_id}")
 
+    elif args.command == "tail":
+        stream = "stderr" if args.stderr else "stdout"
+        if not runner.get_task(args.task_id):
+            print(f"Tâche non trouvée: {args.task_id}")
+        else:
+            if args.follow:
+                lines = runner.follow(args.task_id, lines=args.lines, stream=stream)
+            else:
+                lines = runner.tail(args.task_id, lines=args.lines, stream=stream)
+            try:
+                for line in lines:
+                    print(line, flush=True)
+            except KeyboardInterrupt:
+                pass
+
     elif args.command == "kill":
         if runner.kill_task(args.task_id, force=args.force):
             print(f"Tâche {args.task_id} terminée.")
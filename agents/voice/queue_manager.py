@@ -6,7 +6,7 @@ Gestion de la file d'attente des messages vocaux
 import asyncio
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Callable, Optional, Awaitable
+from typing import Callable, Awaitable
 from datetime import datetime
 import uuid
 
@@ -43,7 +43,7 @@ class VoiceQueueManager:
         self._current_item: QueueItem | None = None
         self._is_playing = False
         self._is_running = False
-        self._speak_callback: Callable[[str, Optional[str | None], Awaitable[bool]]] = None
+        self._speak_callback: Callable[[str, str | None], Awaitable[bool]] | None = None
         self._task: asyncio.Task | None = None
         self._lock = asyncio.Lock()
 
@@ -2,7 +2,9 @@
 """
 AURA-OS Workflow Coordinator
 Orchestre les agents en workflow avec rapports MD intermédiaires
-Chaque agent lit les conclusions du précédent, le coordinateur agrège tout
+Les étapes forment un DAG ("depends_on"): chaque agent lit les conclusions de
+ses dépendances, les étapes indépendantes tournent en parallèle dans la limite
+de leur classe de ressource (cpu, io, network), le coordinateur agrège tout
 Team: core
 """
 
@@ -11,6 +13,8 @@ import json
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from typing import Dict
@@ -20,6 +24,25 @@ WORKFLOWS_DIR = Path.home() / ".aura" / "workflows"
 REPORTS_DIR = Path.home() / ".aura" / "workflow_reports"
 TEMPLATES_FILE = Path.home() / ".aura" / "workflow_templates.json"
 
+# Ordonnancement DAG: workers au total et par classe de ressource
+MAX_WORKERS = 4
+RESOURCE_LIMITS = {
+    "cpu": max(1, (os.cpu_count() or 2) // 2),  # Calcul lourd: ne pas saturer la machine
+    "io": 2,                                    # Disque: éviter de se battre pour les I/O
+    "network": 4                                # Attente réseau: peu coûteux localement
+}
+DEFAULT_RESOURCE = "cpu"
+
+# Classe de ressource par agent (si l'étape ne déclare pas "resource")
+AGENT_RESOURCES = {
+    "network_monitor": "network",
+    "tech_watcher": "network",
+    "backup_manager": "io",
+    "system_cleaner": "io",
+    "file_organizer": "io",
+    "claude_cleaner": "io",
+}
+
 # Templates de workflows prédéfinis
 DEFAULT_TEMPLATES = {
     "security_audit": {
@@ -58,9 +81,10 @@ DEFAULT_TEMPLATES = {
             {"id": "sys_health", "cmd": "python3 ~/.aura/agents/sys_health.py", "role": "Santé système"},
             {"id": "security_quick", "cmd": "python3 ~/.aura/agents/security_auditor.py quick", "role": "Audit rapide"},
             {"id": "claude_cleaner", "cmd": "python3 ~/.aura/agents/claude_cleaner.py clean", "role": "Nettoyage Claude"},
-            {"id": "backup", "cmd": "python3 ~/.aura/agents/backup_manager.py run aura --dry-run", "role": "Vérification backup"}
+            {"id": "backup", "cmd": "python3 ~/.aura/agents/backup_manager.py run aura --dry-run", "role": "Vérification backup",
+             "depends_on": ["sys_health", "claude_cleaner"]}
         ],
-        "parallel": False
+        "parallel": True
     },
     "full_backup": {
         "name": "Backup Complet",
@@ -138,10 +162,17 @@ def create_agent_report(agent_id: str, role: str, output: str, status: str, dura
     report += "\n\n---\n"
     return report
 
-def create_synthesis(results: list[Dict]) -> str:
+def create_synthesis(results: list[Dict], timing: Dict | None = None) -> str:
     """Crée la synthèse finale du workflow"""
     success_count = sum(1 for r in results if r["status"] == "success")
     total_duration = sum(r["duration"] for r in results)
+    timing_rows = ""
+    if timing:
+        timing_rows = (
+            f"| Durée murale | {timing['wall_time']:.2f}s |\n"
+            f"| Chemin critique | {' → '.join(timing['critical_path'])} "
+            f"({timing['critical_path_duration']:.2f}s) |\n"
+        )
 
     synthesis = f"""
 # 📊 Synthèse du Workflow
@@ -154,7 +185,7 @@ def create_synthesis(results: list[Dict]) -> str:
 | Succès | {success_count} |
 | Échecs | {len(results) - success_count} |
 | Durée totale | {total_duration:.2f}s |
-
+{timing_rows}
 ## Actions Recommandées
 
 """
@@ -245,8 +276,187 @@ def run_agent(agent_config: dict, context_file: Path | None = None) -> dict:
         "executed_at": datetime.now().isoformat()
     }
 
+def step_resource(step: dict) -> str:
+    """Classe de ressource d'une étape (déclarée, sinon déduite de l'agent)"""
+    if step.get("resource") in RESOURCE_LIMITS:
+        return step["resource"]
+    for agent, resource in AGENT_RESOURCES.items():
+        if agent in step["id"] or f"/{agent}.py" in step["cmd"]:
+            return resource
+    return DEFAULT_RESOURCE
+
+def build_dag(steps: list[dict], parallel: bool = False) -> dict[str, list[str]]:
+    """
+    Construit les dépendances des étapes.
+
+    Les "depends_on" déclarés forment le DAG du mode parallèle (sans eux, les
+    étapes sont indépendantes). Le mode séquentiel chaîne chaque étape à la
+    précédente dans l'ordre topologique de ce DAG: une seule étape à la fois.
+
+    Raises:
+        ValueError: id dupliqué, dépendance inconnue ou cycle
+    """
+    ids = [step["id"] for step in steps]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Ids d'étapes dupliqués")
+
+    deps = {step["id"]: list(step.get("depends_on", [])) for step in steps}
+    for step_id, upstream in deps.items():
+        unknown = [d for d in upstream if d not in deps]
+        if unknown:
+            raise ValueError(f"Dépendance inconnue pour {step_id}: {', '.join(unknown)}")
+
+    order = topological_order(deps)  # Lève si cycle
+    if not parallel:
+        deps = {step_id: order[i - 1:i] for i, step_id in enumerate(order)}
+    return deps
+
+def positive_int(value: str) -> int:
+    """Type argparse: entier >= 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"doit être >= 1: {value}")
+    return number
+
+def topological_order(deps: dict[str, list[str]]) -> list[str]:
+    """Ordre topologique stable (ordre de déclaration à égalité)"""
+    remaining = {step_id: len(upstream) for step_id, upstream in deps.items()}
+    downstream = {step_id: [] for step_id in deps}
+    for step_id, upstream in deps.items():
+        for dep in upstream:
+            downstream[dep].append(step_id)
+
+    order = []
+    ready = [step_id for step_id, count in remaining.items() if count == 0]
+    while ready:
+        step_id = ready.pop(0)
+        order.append(step_id)
+        for child in downstream[step_id]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(child)
+
+    if len(order) != len(deps):
+        cyclic = [step_id for step_id in deps if step_id not in order]
+        raise ValueError(f"Cycle de dépendances: {', '.join(cyclic)}")
+    return order
+
+def critical_path(deps: dict[str, list[str]], durations: dict[str, float]) -> tuple[list[str], float]:
+    """Plus long chemin du DAG pondéré par les durées"""
+    finish: dict[str, float] = {}
+    previous: dict[str, str | None] = {}
+    for step_id in topological_order(deps):
+        best = max(deps[step_id], key=lambda d: finish[d], default=None)
+        finish[step_id] = (finish[best] if best else 0.0) + durations.get(step_id, 0.0)
+        previous[step_id] = best
+
+    if not finish:
+        return [], 0.0
+    step_id = max(finish, key=finish.get)
+    length = finish[step_id]
+    path = []
+    while step_id:
+        path.append(step_id)
+        step_id = previous[step_id]
+    return path[::-1], length
+
+def run_dag(steps: list[dict], deps: dict[str, list[str]], output_dir: Path,
+            context_data: dict, max_workers: int = MAX_WORKERS) -> tuple[dict[str, dict], dict]:
+    """
+    Exécute les étapes dès que leurs dépendances sont terminées.
+
+    Chaque étape reçoit (via AURA_WORKFLOW_CONTEXT) les résultats de ses
+    ancêtres. Les étapes prêtes démarrent par ordre de priorité (plus longue
+    chaîne en aval d'abord) dans la limite de MAX_WORKERS et de la capacité de
+    leur classe de ressource.
+
+    Returns:
+        (résultats par id d'étape, timing: wall_time, total_time, chemin critique)
+    """
+    by_id = {step["id"]: step for step in steps}
+    order = topological_order(deps)
+    downstream = {step_id: [] for step_id in deps}
+    for step_id, upstream in deps.items():
+        for dep in upstream:
+            downstream[dep].append(step_id)
+
+    # Priorité: longueur de la chaîne la plus longue partant de l'étape
+    chain = {}
+    for step_id in reversed(order):
+        chain[step_id] = 1 + max((chain[c] for c in downstream[step_id]), default=0)
+
+    ancestors: dict[str, list[str]] = {}
+    for step_id in order:
+        seen = []
+        for dep in deps[step_id]:
+            for a in ancestors[dep] + [dep]:
+                if a not in seen:
+                    seen.append(a)
+        ancestors[step_id] = sorted(seen, key=order.index)
+
+    resources = {step_id: step_resource(by_id[step_id]) for step_id in order}
+    in_use = {resource: 0 for resource in RESOURCE_LIMITS}
+    results: dict[str, dict] = {}
+    waiting = {step_id: len(deps[step_id]) for step_id in order}
+    ready = [step_id for step_id in order if waiting[step_id] == 0]
+    running = {}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while ready or running:
+            ready.sort(key=lambda step_id: (-chain[step_id], order.index(step_id)))
+            for step_id in list(ready):
+                resource = resources[step_id]
+                if len(running) >= max_workers or in_use[resource] >= RESOURCE_LIMITS[resource]:
+                    continue
+                ready.remove(step_id)
+                in_use[resource] += 1
+
+                context_file = output_dir / f"context_{step_id}.json"
+                context_file.write_text(json.dumps({
+                    **context_data,
+                    "current_step": order.index(step_id) + 1,
+                    "total_steps": len(order),
+                    "previous_results": [
+                        {
+                            "agent_id": a,
+                            "status": results[a]["status"],
+                            "summary": results[a]["output"][:500]
+                        }
+                        for a in ancestors[step_id]
+                    ]
+                }, indent=2))
+                future = executor.submit(run_agent, by_id[step_id], context_file)
+                running[future] = (step_id, time.perf_counter() - start)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id, started = running.pop(future)
+                in_use[resources[step_id]] -= 1
+                result = future.result()
+                result["resource"] = resources[step_id]
+                result["depends_on"] = deps[step_id]
+                result["started_offset"] = round(started, 3)
+                results[step_id] = result
+                for child in downstream[step_id]:
+                    waiting[child] -= 1
+                    if waiting[child] == 0:
+                        ready.append(child)
+
+    wall_time = time.perf_counter() - start
+    path, path_duration = critical_path(
+        deps, {step_id: r["duration"] for step_id, r in results.items()}
+    )
+    timing = {
+        "wall_time": wall_time,
+        "total_time": sum(r["duration"] for r in results.values()),
+        "critical_path": path,
+        "critical_path_duration": path_duration
+    }
+    return {step_id: results[step_id] for step_id in order}, timing
+
 def run_workflow(template_name: str, parallel: bool | None = None,
-                 output_dir: Path | None = None) -> dict:
+                 output_dir: Path | None = None, max_workers: int = MAX_WORKERS) -> dict:
     """Exécute un workflow complet"""
     templates = load_templates()
 
@@ -259,10 +469,24 @@ def run_workflow(template_name: str, parallel: bool | None = None,
     workflow_id = generate_workflow_id()
     use_parallel = parallel if parallel is not None else template.get("parallel", False)
 
+    try:
+        deps = build_dag(template["agents"], use_parallel)
+    except ValueError as e:
+        print(f"[-] Workflow invalide: {e}")
+        return {"status": "error", "error": str(e)}
+
+    # Les depends_on ne forment un DAG qu'en mode parallèle (sinon: une étape à la fois)
+    if not use_parallel:
+        mode = "Séquentiel"
+    elif any("depends_on" in step for step in template["agents"]):
+        mode = "DAG"
+    else:
+        mode = "Parallèle"
+
     print(f"\n{'='*60}")
     print(f" Workflow: {template['name']}")
     print(f" ID: {workflow_id}")
-    print(f" Mode: {'Parallèle' if use_parallel else 'Séquentiel'}")
+    print(f" Mode: {mode}")
     print(f"{'='*60}\n")
 
     # Prépare le répertoire de sortie
@@ -274,76 +498,33 @@ def run_workflow(template_name: str, parallel: bool | None = None,
     report_file = output_dir / f"workflow_{template_name}_{workflow_id}.md"
     report_content = create_report_header(template["name"], workflow_id)
 
-    # Fichier de contexte pour chaînage
-    context_file = output_dir / "context.json"
+    # Contexte commun; chaque étape reçoit en plus les résultats de ses ancêtres
     context_data = {
         "workflow_id": workflow_id,
         "template": template_name,
-        "started_at": datetime.now().isoformat(),
-        "previous_results": []
+        "started_at": datetime.now().isoformat()
     }
 
-    results = []
-
-    if use_parallel:
-        # Exécution parallèle avec ThreadPoolExecutor
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {
-                executor.submit(run_agent, agent): agent
-                for agent in template["agents"]
-            }
-
-            for future in as_completed(futures):
-                result = future.result()
-                results.append(result)
-                report_content += create_agent_report(
-                    result["agent_id"],
-                    result["role"],
-                    result["output"],
-                    result["status"],
-                    result["duration"]
-                )
-    else:
-        # Exécution séquentielle avec chaînage de contexte
-        for i, agent in enumerate(template["agents"]):
-            # Sauvegarde le contexte pour cet agent
-            context_data["current_step"] = i + 1
-            context_data["total_steps"] = len(template["agents"])
-            context_file.write_text(json.dumps(context_data, indent=2))
-
-            result = run_agent(agent, context_file)
-            results.append(result)
-
-            # Ajoute au contexte pour le prochain agent
-            context_data["previous_results"].append({
-                "agent_id": result["agent_id"],
-                "status": result["status"],
-                "summary": result["output"][:500]
-            })
-
-            # Ajoute au rapport
-            report_content += create_agent_report(
-                result["agent_id"],
-                result["role"],
-                result["output"],
-                result["status"],
-                result["duration"]
-            )
-
-            # Crée un rapport intermédiaire pour cet agent
-            agent_report_file = output_dir / f"step_{i+1}_{result['agent_id']}.md"
-            agent_report_file.write_text(create_agent_report(
-                result["agent_id"],
-                result["role"],
-                result["output"],
-                result["status"],
-                result["duration"]
-            ))
+    results_by_step, timing = run_dag(
+        template["agents"], deps, output_dir, context_data, max_workers
+    )
+    results = list(results_by_step.values())
+
+    # Rapport final et rapports intermédiaires, dans l'ordre topologique
+    for i, result in enumerate(results):
+        agent_report = create_agent_report(
+            result["agent_id"],
+            result["role"],
+            result["output"],
+            result["status"],
+            result["duration"]
+        )
+        report_content += agent_report
+        agent_report_file = output_dir / f"step_{i+1}_{result['agent_id']}.md"
+        agent_report_file.write_text(agent_report)
 
     # Ajoute la synthèse
-    report_content += create_synthesis(results)
+    report_content += create_synthesis(results, timing)
 
     # Sauvegarde le rapport final
     report_file.write_text(report_content)
@@ -355,17 +536,20 @@ def run_workflow(template_name: str, parallel: bool | None = None,
         "template": template_name,
         "started_at": context_data["started_at"],
         "completed_at": datetime.now().isoformat(),
+        "timing": timing,
         "results": results
     }, indent=2, ensure_ascii=False))
 
     # Résumé final
     success_count = sum(1 for r in results if r["status"] == "success")
-    total_duration = sum(r["duration"] for r in results)
+    total_duration = timing["total_time"]
 
     print(f"\n{'='*60}")
     print(f" Workflow terminé!")
     print(f" Résultat: {success_count}/{len(results)} agents OK")
-    print(f" Durée: {total_duration:.1f}s")
+    print(f" Durée: {total_duration:.1f}s cumulée, {timing['wall_time']:.1f}s murale")
+    print(f" Chemin critique: {' → '.join(timing['critical_path'])} "
+          f"({timing['critical_path_duration']:.1f}s)")
     print(f" Rapport: {report_file}")
     print(f"{'='*60}\n")
 
@@ -375,6 +559,9 @@ def run_workflow(template_name: str, parallel: bool | None = None,
         "success_count": success_count,
         "total_agents": len(results),
         "duration": total_duration,
+        "wall_time": timing["wall_time"],
+        "critical_path": timing["critical_path"],
+        "critical_path_duration": timing["critical_path_duration"],
         "report_file": str(report_file),
         "output_dir": str(output_dir)
     }
@@ -394,7 +581,12 @@ def list_templates():
         if "agents" not in template:
             continue
         agents_count = len(template["agents"])
-        mode = "⚡ Parallèle" if template.get("parallel") else "📝 Séquentiel"
+        if not template.get("parallel"):
+            mode = "📝 Séquentiel"
+        elif any("depends_on" in step for step in template["agents"]):
+            mode = "🔀 DAG"
+        else:
+            mode = "⚡ Parallèle"
 
         print(f" 📋 {name}")
         print(f"    {template['name']}")
@@ -458,6 +650,8 @@ Exemples:
     run_parser.add_argument("--parallel", "-p", action="store_true", help="Forcer mode parallèle")
     run_parser.add_argument("--sequential", "-s", action="store_true", help="Forcer mode séquentiel")
     run_parser.add_argument("--output", "-o", help="Répertoire de sortie")
+    run_parser.add_argument("--workers", "-w", type=positive_int, default=MAX_WORKERS,
+                            help="Étapes exécutées simultanément au maximum")
 
     # list
     subparsers.add_parser("list", help="Lister les templates")
@@ -480,7 +674,10 @@ Exemples:
             parallel = False
 
         output_dir = Path(args.output) if args.output else None
-        result = run_workflow(args.template, parallel, output_dir)
+        result = run_workflow(args.template, parallel, output_dir, args.workers)
+
+        if result["status"] == "error":
+            sys.exit(1)
 
         # Notification vocale
         if result["status"] == "success":